@@ -1,173 +1,129 @@
-import sys
 import os
-from pathlib import Path
-
-# Add the docker directory to the path so we can import the patch
-docker_path = str(Path(__file__).parent.parent / "docker")
-sys.path.append(docker_path)
-
-# Import the MoviePy patch to fix ImageMagick issues
-try:
-    import moviepy_patch
-    print(f"Successfully imported MoviePy patch from {docker_path}")
-except ImportError as e:
-    print(f"Warning: MoviePy patch not found or error importing: {e}")
-
-import io
 import json
-import asyncio
-import requests
-from datetime import datetime, timedelta
-from google.cloud import storage
-from pydub import AudioSegment
-from exa_py import Exa
-from litellm import completion as chat_completion
-
-# Ensure PIL.Image.ANTIALIAS is available before importing MoviePy
-from PIL import Image, UnidentifiedImageError
-try:
-    from PIL.Image import Resampling  # Import the newer Resampling enum
-except ImportError:
-    # Fallback for older PIL versions
-    pass
-
-# Ensure PIL.Image.ANTIALIAS is available
-if not hasattr(Image, "ANTIALIAS"):
-    try:
-        # For newer PIL versions
-        Image.ANTIALIAS = Image.Resampling.LANCZOS
-        print("Set PIL.Image.ANTIALIAS to Image.Resampling.LANCZOS")
-    except AttributeError:
-        # For very old PIL versions
-        Image.ANTIALIAS = Image.LANCZOS
-        print("Set PIL.Image.ANTIALIAS to Image.LANCZOS")
-
-# Import MoviePy components
-print("Importing MoviePy components...")
-from moviepy.editor import (
-    ColorClip, TextClip, AudioFileClip,
-    CompositeVideoClip, ImageClip
-)
-print("MoviePy components imported successfully")
-
-import numpy as np
-from proglog import ProgressBarLogger
 import math
-import re
-from io import BytesIO
-from urllib.parse import urlparse
+import base64
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 import time
 
-# Patch MoviePy's ImageClip to handle PIL.Image.ANTIALIAS deprecation
-# This is a direct monkey patch approach that doesn't rely on accessing the original method
-try:
-    print("Applying patch for MoviePy's ImageClip.resize...")
-    
-    # Store the original method if we haven't already
-    if not hasattr(ImageClip, '_original_resize'):
-        # Define a completely new resize method
-        def patched_resize(self, newsize=None, height=None, width=None, apply_to_mask=True):
-            """
-            Resizes the clip to the given dimensions. Accepts float numbers.
-            
-            This is a patched version that handles PIL.Image.ANTIALIAS deprecation.
-            """
-            # Ensure PIL.Image.ANTIALIAS is available
-            if not hasattr(Image, "ANTIALIAS"):
-                try:
-                    # For newer PIL versions
-                    Image.ANTIALIAS = Image.Resampling.LANCZOS
-                except AttributeError:
-                    # For very old PIL versions
-                    Image.ANTIALIAS = Image.LANCZOS
-            
-            # Implementation based on the original resize method
-            w, h = self.size
-            
-            if newsize:
-                # Handle case where newsize might be a tuple
-                if isinstance(newsize, tuple):
-                    w2, h2 = newsize
-                else:
-                    w2 = newsize[0] if isinstance(newsize, (list, tuple)) else newsize
-                    h2 = newsize[1] if isinstance(newsize, (list, tuple)) and len(newsize) > 1 else h * w2 / w
-            else:
-                if width:
-                    w2 = width
-                    h2 = w2 * h / w
-                elif height:
-                    h2 = height
-                    w2 = w * h2 / h
-                else:
-                    raise ValueError("Either newsize, width, or height must be provided")
-            
-            # Make sure the size is integer
-            try:
-                w2 = int(w2)
-                h2 = int(h2)
-            except (ValueError, TypeError) as e:
-                print(f"Error converting size to integer: w2={w2}, h2={h2}, error={e}")
-                # Fallback to original size if conversion fails
-                w2, h2 = w, h
-            
-            # Ensure minimum size
-            w2 = max(1, w2)
-            h2 = max(1, h2)
-            
-            # Actual resizing using PIL
-            try:
-                img_resized = self.img.resize((w2, h2), Image.ANTIALIAS)
-            except Exception as e:
-                print(f"Error resizing image: {e}")
-                # Fallback to nearest neighbor if ANTIALIAS fails
-                img_resized = self.img.resize((w2, h2))
-            
-            # Create a new clip with the resized image
-            new_clip = self.copy()
-            new_clip.img = img_resized
-            new_clip.size = (w2, h2)
-            
-            if apply_to_mask and self.mask:
-                try:
-                    new_clip.mask = self.mask.resize((w2, h2))
-                except Exception as e:
-                    print(f"Error resizing mask: {e}")
-                    # If mask resize fails, create a new mask of the right size
-                    new_clip.mask = None
-            
-            return new_clip
-        
-        # Save the original method and apply our patch
-        ImageClip._original_resize = getattr(ImageClip, 'resize', None)
-        ImageClip.resize = patched_resize
-        print("Applied patch to MoviePy's ImageClip.resize method")
-    else:
-        print("MoviePy's ImageClip.resize already patched")
-except Exception as e:
-    print(f"Failed to apply patch to ImageClip.resize: {e}")
-
 from .config import (
+    AGENT_MODE,
+    AGENT_MAX_TURNS,
+    AGENT_STREAM_TOOL_CALLS,
     EXA_API_KEY,
     ELEVENLABS_API_KEY,
     ELEVENLABS_BASE_URL,
-    GCS_BUCKET_NAME,
+    TARGET_DURATION_SECONDS,
+    TTS_CHUNK_CHARS,
+    TTS_MAX_WORKERS,
+    TTS_CACHE_DIR,
+    AUDIO_RENDITIONS,
+    AUDIO_RENDITION_WORKERS,
+    RUN_DEADLINE_SECONDS,
+    LLM_TIMEOUT_SECONDS,
+    DEADLINE_ARTICLE_SECONDS,
+    DEADLINE_TTS_FACTOR,
+    DEADLINE_MIN_BRIEFING_SECONDS,
+    VIDEO_QUALITY_TIERS,
     FUNCTION_DEFINITIONS as functions_definitions
 )
 from .providers import LiteLLMProvider, Message
-from .utils.logger import Logger
+from .budget import SpeechRateModel, plan_budget, trim_script, word_count
+from .tts import (
+    split_script,
+    split_sentences,
+    stitch_audio,
+    DEFAULT_VOICE_SETTINGS,
+    DEFAULT_OUTPUT_FORMAT,
+    FIXED_PHRASES,
+    format_bitrate,
+)
+from .tts_cache import TTSCache
+from .http_client import get_http_client
+from .publisher import ArtifactPublisher
+from .pipeline import Pipeline, schedule_waves, TOOL_DEPENDENCIES
+from .checkpoint import RunCheckpoint
+from .context import RunContext
+from .deadline import Deadline, DeadlineExceeded, call_timeout, deadline_scope, remaining_seconds
+from .handles import digest
+from .tts_engines import create_tts_engine
+from . import alignment as alignment_utils
+from .audio import PCMAudio, mux_audio, compact_silences, normalize_loudness, encode_renditions
+from .moviepy_setup import apply_moviepy_patches
+from .utils.logger import Logger, get_logger, set_run_id
+from .utils.tracing import span, tracer, propagate, current_span
 
 logger = Logger()
-action_model = LiteLLMProvider("large")
+log = get_logger(__name__)
+
+# Heavy dependencies (litellm, exa_py, MoviePy, PIL) are imported on first use
+# so that importing the package stays fast on cold starts
+_action_model = None
+_action_model_lock = threading.Lock()
+
+
+def get_action_model():
+    """The planner model for the agentic loop, created on first use."""
+    global _action_model
+    if _action_model is None:
+        with _action_model_lock:
+            if _action_model is None:
+                _action_model = LiteLLMProvider("large")
+    return _action_model
+
+
+def chat_completion(**kwargs):
+    """litellm.completion, imported on first call, with a timeout bounded by the current deadline."""
+    from litellm import completion
+    kwargs.setdefault("timeout", call_timeout(LLM_TIMEOUT_SECONDS))
+    with span("llm.completion", model=kwargs.get("model")) as s:
+        response = completion(**kwargs)
+        usage = getattr(response, "usage", None)
+        if usage:
+            s.set("prompt_tokens", getattr(usage, "prompt_tokens", None))
+            s.set("completion_tokens", getattr(usage, "completion_tokens", None))
+        return response
+
 
 class NewsAgent:
+    """
+    Shared, thread-safe briefing agent: holds the API clients, caches and
+    learned speech rates. Per-run data lives in a RunContext passed to each
+    tool; tools called without one use the agent's own default context,
+    which suits scripts producing one briefing at a time.
+    """
+
     def __init__(self, save_logs=True):
-        self.messages = []  # Agent memory
-        self.state = {}
-        self.exa = Exa(EXA_API_KEY)
+        self.context = RunContext()  # default context for direct, single-run use
+        self._exa = None
+        self._exa_lock = threading.Lock()
+        self.speech_rates = SpeechRateModel()
+        self.tts_cache = TTSCache() if TTS_CACHE_DIR else None
+        self.tts_engine = create_tts_engine(self)
+        self.publisher = ArtifactPublisher()
 
         if save_logs:
             logger.log_file = "news_agent_log.html"
 
+    @property
+    def state(self):
+        """State of the default context."""
+        return self.context.state
+
+    def _context(self, context):
+        return context if context is not None else self.context
+
+    @property
+    def exa(self):
+        if self._exa is None:
+            with self._exa_lock:
+                if self._exa is None:
+                    from exa_py import Exa
+                    self._exa = Exa(EXA_API_KEY)
+        return self._exa
+
     def get_preferences(self):
         """
         Example: fetch user's categories, voice ID, etc.
@@ -177,18 +133,36 @@ class NewsAgent:
             "voice_id": '9BWtsMINqrJLrRacOk9x',
             "date": "2023-10-01",
         }
-        print("Retrieved Preferences:", preferences)
+        log.info("Retrieved preferences: %s", preferences)
         return preferences
 
-    def fetch_and_summarize(self, preferences, model="mistral/mistral-small-latest"):
+    def fetch_and_summarize(self, preferences, model="mistral/mistral-small-latest", context=None):
         """Fetch and summarize news articles in one pass using Exa and summarizer."""
+        context = self._context(context)
         try:
             if isinstance(preferences, str):
                 preferences = json.loads(preferences)
 
             search_results = []
-            
-            for category in preferences["categories"]:
+            categories = preferences["categories"]
+            num_results = preferences.get("num_results", 3)  # Use user preference with default of 3
+
+            # Short on time: summarize fewer articles per category (a query and a search cost about one more)
+            remaining = remaining_seconds()
+            affordable = num_results
+            if math.isfinite(remaining):
+                affordable = int(remaining / (DEADLINE_ARTICLE_SECONDS * max(len(categories), 1))) - 1
+            if affordable < num_results:
+                context.degrade("fetch_and_summarize", "fewer_articles",
+                                f"{max(affordable, 1)} instead of {num_results} articles per category")
+                num_results = max(affordable, 1)
+
+            for category in categories:
+                if search_results and remaining_seconds() < DEADLINE_ARTICLE_SECONDS:
+                    context.degrade("fetch_and_summarize", "fewer_articles",
+                                    f"out of time, skipped categories from {category!r} on")
+                    break
+
                 # Add retry logic for rate limit errors
                 max_retries = 3
                 retry_delay = 2  # seconds
@@ -207,11 +181,12 @@ class NewsAgent:
                             temperature=0.7
                         )
                         search_query = query_response.choices[0].message.content.strip()
-                        print(f"\nSearching for: {search_query}")
+                        log.info("Searching for: %s", search_query)
                         break  # Success, exit retry loop
                     except Exception as e:
-                        if "rate limit" in str(e).lower() and retry_count < max_retries - 1:
-                            print(f"Rate limit error, retrying in {retry_delay} seconds... ({retry_count + 1}/{max_retries})")
+                        if ("rate limit" in str(e).lower() and retry_count < max_retries - 1
+                                and retry_delay < remaining_seconds()):
+                            log.warning("Rate limit error, retrying in %s seconds... (%s/%s)", retry_delay, retry_count + 1, max_retries)
                             time.sleep(retry_delay)
                             retry_delay *= 2  # Exponential backoff
                         else:
@@ -233,23 +208,30 @@ class NewsAgent:
                 exa_retry_delay = 2  # seconds
                 
                 for exa_retry_count in range(max_exa_retries):
+                    # The Exa client takes no timeout, so the deadline is only checked before each call
+                    if remaining_seconds() <= 0:
+                        raise DeadlineExceeded("Deadline exceeded before the Exa search")
                     try:
                         # You can pass an explicit 'livecrawl' param if needed:
                         # e.g., livecrawl="always" to force Exa to re-fetch
                         # But note it's slower
-                        search_response = self.exa.search_and_contents(
-                            search_query,
-                            text=True,
-                            num_results=preferences.get("num_results", 3),  # Use user preference with default of 3
-                            start_published_date=start_date.strftime("%Y-%m-%d"),
-                            # Remove category restriction to get more diverse results
-                            # category='news',
-                            # livecrawl="auto",   # or "always", "never"
-                        )
+                        with span("exa.search", query=search_query, attempt=exa_retry_count + 1) as s:
+                            search_response = self.exa.search_and_contents(
+                                search_query,
+                                text=True,
+                                num_results=num_results,
+                                start_published_date=start_date.strftime("%Y-%m-%d"),
+                                # Remove category restriction to get more diverse results
+                                # category='news',
+                                # livecrawl="auto",   # or "always", "never"
+                            )
+                            s.set("results", len(search_response.results))
                         break  # Success, exit retry loop
                     except Exception as e:
-                        if ("rate limit" in str(e).lower() or "429" in str(e)) and exa_retry_count < max_exa_retries - 1:
-                            print(f"Exa API rate limit error, retrying in {exa_retry_delay} seconds... ({exa_retry_count + 1}/{max_exa_retries})")
+                        if (("rate limit" in str(e).lower() or "429" in str(e))
+                                and exa_retry_count < max_exa_retries - 1 and exa_retry_delay < remaining_seconds()):
+                            log.warning("Exa API rate limit error, retrying in %s seconds... (%s/%s)",
+                                        exa_retry_delay, exa_retry_count + 1, max_exa_retries)
                             time.sleep(exa_retry_delay)
                             exa_retry_delay *= 2  # Exponential backoff
                         else:
@@ -260,6 +242,10 @@ class NewsAgent:
                 for result in search_response.results:
                     if not result.text:
                         continue
+                    if (summarized_articles or search_results) and remaining_seconds() < DEADLINE_ARTICLE_SECONDS:
+                        context.degrade("fetch_and_summarize", "fewer_articles",
+                                        f"out of time after {len(summarized_articles)} articles for {category!r}")
+                        break
 
                     # Add retry logic for summarization
                     max_summary_retries = 3
@@ -318,7 +304,7 @@ class NewsAgent:
                                 content_type = "video"
                             
                             # Log the content type classification
-                            print(f"Classified {result.title[:30]}... as {content_type}")
+                            log.debug("Classified %s... as %s", result.title[:30], content_type)
                             
                             summarized_articles.append({
                                 "title": result.title,
@@ -329,8 +315,10 @@ class NewsAgent:
                             })
                             break  # Success, exit retry loop
                         except Exception as e:
-                            if "rate limit" in str(e).lower() and summary_retry_count < max_summary_retries - 1:
-                                print(f"Rate limit error during summarization, retrying in {summary_retry_delay} seconds... ({summary_retry_count + 1}/{max_summary_retries})")
+                            if ("rate limit" in str(e).lower() and summary_retry_count < max_summary_retries - 1
+                                    and summary_retry_delay < remaining_seconds()):
+                                log.warning("Rate limit error during summarization, retrying in %s seconds... (%s/%s)",
+                                            summary_retry_delay, summary_retry_count + 1, max_summary_retries)
                                 time.sleep(summary_retry_delay)
                                 summary_retry_delay *= 2  # Exponential backoff
                             else:
@@ -344,20 +332,78 @@ class NewsAgent:
                         "articles": summarized_articles
                     })
             
-            # Store the results in self.state for later use in generate_video
-            self.state['summaries'] = search_results
+            # Store the results in the run state for later use in generate_video
+            context.state['summaries'] = search_results
             
             return search_results
 
+        except DeadlineExceeded as e:
+            # Keep the categories finished before time ran out
+            log.error("Error fetching and summarizing news: %s", e)
+            if search_results:
+                context.degrade("fetch_and_summarize", "fewer_articles",
+                                f"deadline hit, kept {len(search_results)} categories")
+                context.state['summaries'] = search_results
+            return search_results
         except Exception as e:
-            print(f"Error fetching and summarizing news: {str(e)}")
+            log.error("Error fetching and summarizing news: %s", e)
             return []
 
+    def budget_briefing(self, summarized_results, preferences, context=None):
+        """
+        Fit the briefing into a target audio duration.
+        Returns the selected summaries and the word limit for the script,
+        or None when no target duration is set. When the run deadline leaves
+        too little time to voice and render the full target, the target shrinks.
+        """
+        preferences = preferences or {}
+        context = self._context(context)
+        target_seconds = preferences.get("target_duration") or TARGET_DURATION_SECONDS
+        wps = self.speech_rates.words_per_second(preferences.get("voice_id"))
+        total = sum(len(cat["articles"]) for cat in summarized_results)
+
+        fitting = self._deadline_duration(context)
+        if fitting is not None:
+            fitting = max(fitting, DEADLINE_MIN_BRIEFING_SECONDS)
+            # Without a target, only cap the briefing if every article would not fit
+            too_long = (fitting < float(target_seconds) if target_seconds
+                        else plan_budget(summarized_results, fitting, wps)["max_articles"] < total)
+            if too_long:
+                context.degrade("generate_news_script", "shorter_script",
+                                f"{fitting:.0f}s briefing instead of {target_seconds or 'unlimited'}")
+                target_seconds = round(fitting)
+        if not target_seconds:
+            return None
+
+        budget = plan_budget(summarized_results, float(target_seconds), wps)
+        kept = sum(len(cat["articles"]) for cat in budget["summaries"])
+        log.info("Budget: %ss at %.2f words/s -> max %s words, %s/%s articles",
+                 target_seconds, wps, budget['max_words'], kept, total)
+        context.state['budget'] = {k: v for k, v in budget.items() if k != "summaries"}
+        return budget
+
+    def _deadline_duration(self, context):
+        """
+        Seconds of audio that can still be voiced and rendered (at the fastest
+        video tier) before the run deadline, or None without a deadline.
+        """
+        if context.deadline is None or context.deadline.expires_at is None:
+            return None
+        # Keep some of the time for writing the script itself
+        left = context.deadline.remaining() - min(remaining_seconds(), LLM_TIMEOUT_SECONDS)
+        render_factor = min(tier["render_factor"] for tier in VIDEO_QUALITY_TIERS.values())
+        return max(left, 0.0) / (DEADLINE_TTS_FACTOR + render_factor)
+
     def generate_news_script(self, summarized_results, preferences,
-                             model="mistral/mistral-small-latest", temperature=0.7):
+                             model="mistral/mistral-small-latest", temperature=0.7, context=None):
         """Generate a final news script from summaries."""
+        context = self._context(context)
         try:
-            total_articles = sum(len(cat['articles']) for cat in summarized_results)
+            budget = self.budget_briefing(summarized_results, preferences, context=context)
+            if budget:
+                summarized_results = budget["summaries"]
+                # The video should only show the articles that made it into the script
+                context.state['summaries'] = summarized_results
 
             system_message = (
                 "You are a professional news anchor. Create a natural, conversational news brief.\n"
@@ -372,6 +418,8 @@ class NewsAgent:
                 "- Just plain, flowing text\n"
                 "- Connect stories smoothly"
             )
+            if budget:
+                system_message += f"\n- Keep the whole brief under {budget['max_words']} words"
 
             key_points = []
             for category in summarized_results:
@@ -397,26 +445,19 @@ class NewsAgent:
             )
 
             script = response.choices[0].message.content.strip()
-            print("\nGenerated News Script:")
-            print("-" * 80)
-            print(script)
-            print("-" * 80)
+            if budget:
+                script = trim_script(script, budget["max_words"])
+            log.info("Generated news script:\n%s\n%s\n%s", "-" * 80, script, "-" * 80)
 
             return script
 
         except Exception as e:
-            print(f"Error generating news script: {str(e)}")
+            log.error("Error generating news script: %s", e)
             return "Here are your news highlights. We're experiencing technical difficulties with today's update. That's your update."
 
-    def generate_speech(self, text: str, voice_id: str,
-                        model_id: str = "eleven_multilingual_v2",
-                        stability: float = 0.71,
-                        similarity_boost: float = 0.85,
-                        style: float = 0.35,
-                        speed: float = 1.0,
-                        output_format: str = "mp3_44100_128") -> bytes:
-        """Convert text to speech using ElevenLabs with advanced settings."""
-        url = f"{ELEVENLABS_BASE_URL}/text-to-speech/{voice_id}?output_format={output_format}"
+    def _speech_request(self, text, model_id, stability, similarity_boost, style, speed,
+                        previous_text=None, next_text=None):
+        """Build the headers and JSON body shared by the ElevenLabs TTS endpoints."""
         headers = {
             "xi-api-key": ELEVENLABS_API_KEY,
             "Content-Type": "application/json"
@@ -431,73 +472,501 @@ class NewsAgent:
                 "use_speaker_boost": True
             }
         }
+        # Neighbouring text keeps prosody continuous across chunk boundaries
+        if previous_text:
+            data["previous_text"] = previous_text
+        if next_text:
+            data["next_text"] = next_text
 
         if speed != 1.0:
             # Apply simple SSML for speed if desired
             text = f'<speak><prosody rate="{int((speed-1)*100)}%">{text}</prosody></speak>'
             data["text"] = text
 
-        response = requests.post(url, json=data, headers=headers)
-        if response.status_code == 200:
-            return response.content
-        else:
-            raise Exception(f"API Error {response.status_code}: {response.text}")
+        return headers, data
 
-    def text_to_speech(self, user_text: str, voice_id: str,
-                       model_id: str = "eleven_multilingual_v2") -> str:
-        """Generate an MP3 from text using TTS."""
-        try:
-            audio_data = self.generate_speech(
-                text=user_text,
-                voice_id=voice_id,
-                model_id=model_id
+    def generate_speech(self, text: str, voice_id: str,
+                        model_id: str = "eleven_multilingual_v2",
+                        stability: float = DEFAULT_VOICE_SETTINGS["stability"],
+                        similarity_boost: float = DEFAULT_VOICE_SETTINGS["similarity_boost"],
+                        style: float = DEFAULT_VOICE_SETTINGS["style"],
+                        speed: float = 1.0,
+                        output_format: str = DEFAULT_OUTPUT_FORMAT,
+                        previous_text: str = None,
+                        next_text: str = None) -> bytes:
+        """Convert text to speech using ElevenLabs with advanced settings."""
+        url = f"{ELEVENLABS_BASE_URL}/text-to-speech/{voice_id}?output_format={output_format}"
+        headers, data = self._speech_request(
+            text, model_id, stability, similarity_boost, style, speed, previous_text, next_text
+        )
+
+        with span("elevenlabs.tts", voice_id=voice_id, chars=len(text)) as s:
+            response = get_http_client().post(url, json=data, headers=headers)
+            s.set("status", response.status_code)
+            if response.status_code == 200:
+                s.set("bytes", len(response.content))
+                return response.content
+            else:
+                raise Exception(f"API Error {response.status_code}: {response.text}")
+
+    def generate_speech_with_timestamps(self, text: str, voice_id: str,
+                                        model_id: str = "eleven_multilingual_v2",
+                                        stability: float = DEFAULT_VOICE_SETTINGS["stability"],
+                                        similarity_boost: float = DEFAULT_VOICE_SETTINGS["similarity_boost"],
+                                        style: float = DEFAULT_VOICE_SETTINGS["style"],
+                                        speed: float = 1.0,
+                                        output_format: str = DEFAULT_OUTPUT_FORMAT,
+                                        previous_text: str = None,
+                                        next_text: str = None):
+        """
+        Like generate_speech, but via the with-timestamps endpoint.
+        Returns (audio bytes, character alignment) where the alignment has
+        'characters', 'start' and 'end' lists (seconds).
+        """
+        url = f"{ELEVENLABS_BASE_URL}/text-to-speech/{voice_id}/with-timestamps?output_format={output_format}"
+        headers, data = self._speech_request(
+            text, model_id, stability, similarity_boost, style, speed, previous_text, next_text
+        )
+
+        with span("elevenlabs.tts", voice_id=voice_id, chars=len(text), timestamps=True) as s:
+            response = get_http_client().post(url, json=data, headers=headers)
+            s.set("status", response.status_code)
+            if response.status_code != 200:
+                raise Exception(f"API Error {response.status_code}: {response.text}")
+
+            payload = response.json()
+            audio = base64.b64decode(payload["audio_base64"])
+            s.set("bytes", len(audio))
+        alignment = payload.get("alignment")
+        return audio, alignment_utils.from_elevenlabs(alignment) if alignment else None
+
+    def generate_speech_stream(self, text: str, voice_id: str,
+                               model_id: str = "eleven_multilingual_v2",
+                               output_path: str = None,
+                               stability: float = DEFAULT_VOICE_SETTINGS["stability"],
+                               similarity_boost: float = DEFAULT_VOICE_SETTINGS["similarity_boost"],
+                               style: float = DEFAULT_VOICE_SETTINGS["style"],
+                               speed: float = 1.0,
+                               output_format: str = DEFAULT_OUTPUT_FORMAT,
+                               chunk_size: int = 4096):
+        """
+        Stream speech from ElevenLabs' streaming endpoint.
+        Yields audio bytes as they arrive and, if output_path is given,
+        appends each chunk to that file immediately so playback can start
+        before synthesis has finished. This is for direct callers: the
+        pipeline needs timestamps for video timing, which the stream lacks.
+        """
+        url = f"{ELEVENLABS_BASE_URL}/text-to-speech/{voice_id}/stream?output_format={output_format}"
+        headers, data = self._speech_request(text, model_id, stability, similarity_boost, style, speed)
+
+        with span("elevenlabs.tts", voice_id=voice_id, chars=len(text), stream=True) as s, \
+                get_http_client().post(url, json=data, headers=headers, stream=True) as response:
+            s.set("status", response.status_code)
+            if response.status_code != 200:
+                raise Exception(f"API Error {response.status_code}: {response.text}")
+
+            out = open(output_path, "wb") if output_path else None
+            total = 0
+            try:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if not chunk:
+                        continue
+                    if out:
+                        out.write(chunk)
+                        out.flush()
+                    total += len(chunk)
+                    yield chunk
+            finally:
+                s.set("bytes", total)
+                if out:
+                    out.close()
+
+    def _cache_key(self, text, voice_id, model_id):
+        return TTSCache.key(text, voice_id, model_id, DEFAULT_VOICE_SETTINGS, DEFAULT_OUTPUT_FORMAT)
+
+    def generate_speech_chunked(self, text: str, voice_id: str,
+                                model_id: str = "eleven_multilingual_v2",
+                                max_chars: int = TTS_CHUNK_CHARS,
+                                max_workers: int = TTS_MAX_WORKERS,
+                                max_retries: int = 3,
+                                use_cache: bool = True,
+                                with_timestamps: bool = False,
+                                context=None):
+        """
+        Synthesize a long script as sentence/paragraph chunks in parallel.
+        Each chunk gets its neighbours' text for prosody continuity and is
+        retried on its own if it fails. With the TTS cache enabled the script
+        is split per sentence and only sentences not already cached are sent
+        to ElevenLabs. Every chunk is decoded once into a shared PCM buffer;
+        returns the stitched PCMAudio, or (PCMAudio, alignment) with
+        with_timestamps, where chunk alignments are placed on the stitched timeline.
+        """
+        cache = self.tts_cache if use_cache else None
+        # Sentence-sized chunks give the cache reusable keys; otherwise fewer, larger requests
+        chunks = split_sentences(text) if cache else split_script(text, max_chars=max_chars)
+        if not chunks:
+            raise ValueError("No text to synthesize")
+        log.info("Synthesizing %s chunks with up to %s workers...", len(chunks), max_workers)
+
+        def synthesize(index):
+            with span("tts.chunk", index=index, chars=len(chunks[index])) as s:
+                result = synthesize_chunk(index, s)
+                s.set("cache_hit", result[1])
+                s.set("engine", result[2])
+                return result
+
+        def synthesize_chunk(index, chunk_span):
+            key = self._cache_key(chunks[index], voice_id, model_id) if cache else None
+            if cache:
+                audio_data = cache.get(key)
+                if audio_data is not None:
+                    pcm = PCMAudio.from_bytes(audio_data, format="mp3")
+                    chunk_alignment = cache.get_alignment(key) if with_timestamps else None
+                    if with_timestamps and not chunk_alignment:
+                        # Entries cached without timestamps are still usable; spread the text over them
+                        chunk_alignment = alignment_utils.uniform_alignment(chunks[index], pcm.duration)
+                    return pcm, True, "elevenlabs", chunk_alignment
+
+            def to_chunk(result):
+                # Only provider-quality audio is worth caching
+                if cache and result.engine == "elevenlabs":
+                    cache.put(key, result.audio)
+                    if result.alignment:
+                        cache.put_alignment(key, result.alignment)
+                # Conform everything to the provider's format so chunks concatenate
+                pcm = PCMAudio.from_bytes(result.audio, format=result.format,
+                                          frame_rate=44100, channels=1)
+                chunk_alignment = result.alignment
+                if with_timestamps and not chunk_alignment:
+                    chunk_alignment = alignment_utils.uniform_alignment(chunks[index], pcm.duration)
+                return pcm, False, result.engine, chunk_alignment
+
+            neighbours = dict(
+                previous_text=chunks[index - 1] if index > 0 else None,
+                next_text=chunks[index + 1] if index + 1 < len(chunks) else None,
             )
-            audio_stream = io.BytesIO(audio_data)
-            audio = AudioSegment.from_file(audio_stream, format="mp3")
+            retry_delay = 1  # seconds
+            for retry_count in range(max_retries):
+                try:
+                    # Retries go to the primary engine; a fallback engine is only used once they are spent
+                    return to_chunk(self.tts_engine.synthesize(
+                        chunks[index], voice_id, model_id, with_timestamps=with_timestamps,
+                        allow_fallback=False, **neighbours
+                    ))
+                except Exception as e:
+                    # No point backing off past the deadline; the next attempt could not finish anyway
+                    if retry_count < max_retries - 1 and retry_delay < remaining_seconds():
+                        chunk_span.add("retries")
+                        log.warning("Chunk %s/%s failed (%s), retrying in %s seconds... (%s/%s)",
+                                    index + 1, len(chunks), e, retry_delay, retry_count + 1, max_retries)
+                        time.sleep(retry_delay)
+                        retry_delay *= 2  # Exponential backoff
+                        continue
+                    fallback = self.tts_engine.synthesize_fallback(chunks[index], voice_id, model_id, **neighbours)
+                    if fallback is None:
+                        raise
+                    log.warning("Chunk %s/%s failed (%s) after %s attempts, using %s",
+                                index + 1, len(chunks), e, retry_count + 1, fallback.engine)
+                    return to_chunk(fallback)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(propagate(synthesize), range(len(chunks))))
+
+        cached = sum(1 for _, hit, _, _ in results if hit)
+        if cache:
+            log.info("TTS cache: %s/%s chunks reused, %s synthesized", cached, len(chunks), len(chunks) - cached)
+        degraded = sum(1 for _, _, engine, _ in results if engine != "elevenlabs")
+        self._context(context).state['tts_degraded_chunks'] = degraded
+        if degraded:
+            log.warning("TTS: %s/%s chunks used the offline fallback voice", degraded, len(chunks))
+
+        segments = [segment for segment, _, _, _ in results]
+        if not with_timestamps:
+            return stitch_audio(segments)
+        pcm, offsets, trims = stitch_audio(segments, return_layout=True)
+        merged = alignment_utils.merge([a for _, _, _, a in results], offsets, trims)
+        return pcm, merged
+
+    def prerender_fixed_phrases(self, voice_ids, model_id: str = "eleven_multilingual_v2"):
+        """
+        Synthesize the fixed intro/outro phrases for each voice into the TTS cache,
+        with their alignments, so the pipeline's per-sentence synthesis reuses them.
+        """
+        if not self.tts_cache:
+            log.info("TTS cache disabled, skipping fixed phrase pre-rendering")
+            return 0
+
+        rendered = 0
+        for voice_id in voice_ids:
+            for name, phrase in FIXED_PHRASES.items():
+                key = self._cache_key(phrase, voice_id, model_id)
+                if self.tts_cache.contains(key):
+                    continue
+                try:
+                    audio_data, alignment = self.generate_speech_with_timestamps(
+                        text=phrase, voice_id=voice_id, model_id=model_id
+                    )
+                    self.tts_cache.put(key, audio_data)
+                    if alignment:
+                        self.tts_cache.put_alignment(key, alignment)
+                    rendered += 1
+                    log.info("Pre-rendered %s phrase for voice %s", name, voice_id)
+                except Exception as e:
+                    log.warning("Failed to pre-render %s phrase for voice %s: %s", name, voice_id, e)
+        return rendered
 
-            output_path = "output_speech.mp3"
-            audio.export(output_path, format="mp3")
+    def text_to_speech(self, user_text: str, voice_id: str,
+                       model_id: str = "eleven_multilingual_v2",
+                       chunked: bool = False,
+                       use_cache: bool = True,
+                       stream: bool = False,
+                       postprocess: bool = None,
+                       renditions=None,
+                       with_timestamps: bool = False,
+                       output_path: str = None,
+                       context=None) -> str:
+        """
+        Generate an MP3 from text using TTS.
+        postprocess compacts silences and normalizes loudness; by default it runs
+        only when the audio is already decoded (chunked/cached synthesis), since on
+        the direct path it would cost an extra decode and encode. With stream,
+        postprocess=True rewrites the file once the stream has finished.
+        renditions (True or a list of AUDIO_RENDITIONS names) also encodes
+        smaller delivery formats and records their manifest in state.
+        with_timestamps requests ElevenLabs character alignments and stores them
+        with the audio (state['alignment'] and <audio>.alignment.json) so
+        generate_video can time segments exactly.
+        The MP3 goes to output_path, by default the run's audio path.
+        """
+        context = self._context(context)
+        model_id = model_id or "eleven_multilingual_v2"
+        output_path = output_path or context.audio_path
+        if os.path.dirname(output_path):
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        alignment = None
+        compacted = False
+        try:
+            if stream:
+                if with_timestamps:
+                    log.info("Timestamps are not available for streamed speech; skipping alignment")
+                # Bytes go straight to disk as they arrive; no decode/re-encode round-trip
+                total_bytes = 0
+                for chunk in self.generate_speech_stream(
+                    text=user_text,
+                    voice_id=voice_id,
+                    model_id=model_id,
+                    output_path=output_path
+                ):
+                    total_bytes += len(chunk)
+                # The MP3 output is constant bitrate, so the size gives the duration
+                duration = total_bytes * 8 / format_bitrate(DEFAULT_OUTPUT_FORMAT)
+                context.state['tts_degraded_chunks'] = 0
+                if postprocess:
+                    # Only once the whole stream is on disk; listeners already had the raw audio
+                    with open(output_path, "rb") as f:
+                        pcm = self.postprocess_audio(PCMAudio.from_bytes(f.read()), context=context)
+                    pcm.export(output_path, format="mp3", bitrate="128k")
+                    duration = pcm.duration
+
+            elif chunked or (use_cache and self.tts_cache):
+                # Stitched audio: decoded once into PCM, encoded once here
+                pcm = self.generate_speech_chunked(
+                    text=user_text,
+                    voice_id=voice_id,
+                    model_id=model_id,
+                    use_cache=use_cache,
+                    with_timestamps=with_timestamps,
+                    context=context
+                )
+                if with_timestamps:
+                    pcm, alignment = pcm
+                if postprocess is not False:
+                    pcm = self.postprocess_audio(pcm, context=context)
+                    compacted = True
+                pcm.export(output_path, format="mp3", bitrate="128k")
+                duration = pcm.duration
+            else:
+                # Single request: the provider MP3 goes to disk as-is, no decode/re-encode
+                result = self.tts_engine.synthesize(user_text, voice_id, model_id,
+                                                    with_timestamps=with_timestamps)
+                audio_data = result.audio
+                alignment = result.alignment
+                if result.format != "mp3" and not postprocess:
+                    # Offline fallback engines return WAV; encode once to keep the MP3 contract
+                    pcm = PCMAudio.from_bytes(audio_data, format=result.format)
+                    pcm.export(output_path, format="mp3", bitrate="128k")
+                    duration = pcm.duration
+                elif postprocess:
+                    pcm = self.postprocess_audio(PCMAudio.from_bytes(audio_data, format=result.format),
+                                                 context=context)
+                    compacted = True
+                    pcm.export(output_path, format="mp3", bitrate="128k")
+                    duration = pcm.duration
+                else:
+                    with open(output_path, "wb") as f:
+                        f.write(audio_data)
+                    duration = len(audio_data) * 8 / format_bitrate(DEFAULT_OUTPUT_FORMAT)
+                context.state['tts_degraded_chunks'] = 0 if result.engine == "elevenlabs" else 1
+                if with_timestamps and not alignment:
+                    # Spread over the final audio, so no compaction remap is needed
+                    alignment = alignment_utils.uniform_alignment(user_text, duration)
+                    compacted = False
+
+            if alignment:
+                self.save_alignment(alignment, output_path, postprocessed=compacted, context=context)
+
+            # Learn this voice's pace so future budgets are accurate (offline audio would skew it)
+            if not context.state.get('tts_degraded_chunks'):
+                self.speech_rates.observe(voice_id, word_count(user_text), duration)
+
+            if renditions:
+                self.encode_audio_renditions(output_path, None if renditions is True else renditions,
+                                             context=context)
             return output_path
         except Exception as e:
-            print("Failed to generate speech:", str(e))
+            log.error("Failed to generate speech: %s", e)
             raise
 
-    def upload_audio(self, audio_file_path):
-        """Upload audio file to GCS and return the URL."""
-        try:
-            bucket_name = GCS_BUCKET_NAME
-            filename = os.path.basename(audio_file_path)
-            gcs_directory = f'audio/{filename}'
+    def save_alignment(self, alignment, audio_path, postprocessed=False, context=None):
+        """Store an alignment next to its audio, adjusted for any silence compaction."""
+        context = self._context(context)
+        stats = context.state.get('audio_postprocess')
+        if postprocessed and stats and stats.get("removed_intervals"):
+            alignment = alignment_utils.remap(alignment, stats["removed_intervals"])
+        alignment_path = f"{os.path.splitext(audio_path)[0]}.alignment.json"
+        alignment_utils.save(alignment, alignment_path)
+        context.state['alignment'] = alignment
+        context.state['alignment_audio_path'] = audio_path
+        log.info("Saved alignment for %s characters to %s", len(alignment['characters']), alignment_path)
+        return alignment_path
+
+    def encode_audio_renditions(self, audio_path, names=None, context=None):
+        """Encode delivery renditions of the narration (all AUDIO_RENDITIONS by default)."""
+        selected = {name: spec for name, spec in AUDIO_RENDITIONS.items() if not names or name in names}
+        if not selected:
+            log.warning("No known audio renditions in %s", names)
+            return None
 
-            client = storage.Client()
-            bucket = client.bucket(bucket_name)
-            blob = bucket.blob(gcs_directory)
+        output_dir = f"{os.path.splitext(audio_path)[0]}_renditions"
+        log.info("Encoding %s audio renditions into %s...", len(selected), output_dir)
+        try:
+            manifest = encode_renditions(audio_path, selected, output_dir, max_workers=AUDIO_RENDITION_WORKERS)
+        except Exception as e:
+            log.warning("Failed to encode audio renditions: %s", e)
+            return None
+        self._context(context).state['audio_renditions'] = manifest
+        return manifest
 
-            print(f"Uploading {audio_file_path} to GCS...")
-            blob.upload_from_filename(audio_file_path)
+    def postprocess_audio(self, pcm: PCMAudio,
+                          max_silence_ms: int = 400,
+                          target_dbfs: float = -16.0,
+                          context=None) -> PCMAudio:
+        """
+        Cap long silences and normalize loudness of narration audio.
+        Every second removed here is a second of video MoviePy does not render.
+        """
+        original_duration = pcm.duration
+        pcm, removed = compact_silences(pcm, max_silence_ms=max_silence_ms)
+        pcm, gain_db = normalize_loudness(pcm, target_dbfs=target_dbfs)
+
+        stats = {
+            "original_duration": original_duration,
+            "duration": pcm.duration,
+            "removed_seconds": original_duration - pcm.duration,
+            "silences_compacted": len(removed),
+            "removed_intervals": removed,
+            "gain_db": gain_db,
+        }
+        self._context(context).state['audio_postprocess'] = stats
+        log.info("Audio post-processing: removed %.2fs of silence across %s gaps, applied %+.1f dB gain",
+                 stats['removed_seconds'], len(removed), gain_db)
+        return pcm
 
-            gcs_url = f"gs://{bucket_name}/{gcs_directory}"
-            print("Uploaded file is available at:", gcs_url)
-            return gcs_url
+    def upload_audio(self, audio_file_path, context=None):
+        """Upload audio file to GCS and return the URL."""
+        context = self._context(context)
+        try:
+            if audio_file_path in context.uploads:
+                # Already uploading in the background: the object name is a content hash,
+                # so the URL is known now and wait_for_uploads() confirms it later
+                gcs_url = self.publisher.gcs_url(audio_file_path)
+                log.info("Upload in progress, file will be available at: %s", gcs_url)
+                return gcs_url
+
+            result = self.publisher.publish_file(audio_file_path)
+            context.state.setdefault('published', {})[audio_file_path] = result
+            log.info("Uploaded file is available at: %s", result["gcs_url"])
+            return result["gcs_url"]
 
         except Exception as e:
-            print(f"Failed to upload audio: {str(e)}")
+            log.error("Failed to upload audio: %s", e)
             return None
 
-    def call_function(self, name, arguments):
+    def upload_in_background(self, path, context=None):
+        """Start uploading a finished artifact without blocking the pipeline."""
+        context = self._context(context)
+        with context.lock:
+            if not path or not os.path.exists(path) or path in context.uploads:
+                return context.uploads.get(path)
+            log.info("Starting background upload of %s", path)
+            context.uploads[path] = self.publisher.submit(path)
+            return context.uploads[path]
+
+    def wait_for_uploads(self, timeout=None, context=None):
+        """Join point for background uploads. Returns {path: result or None on failure}."""
+        context = self._context(context)
+        results = {}
+        with context.lock:
+            pending = list(context.uploads.items())
+        for path, future in pending:
+            try:
+                results[path] = future.result(timeout=timeout)
+            except Exception as e:
+                log.warning("Background upload of %s failed: %s", path, e)
+                results[path] = None
+            with context.lock:
+                context.uploads.pop(path, None)
+        context.state.setdefault('published', {}).update(results)
+        return results
+
+    def publish_artifacts(self, paths=None, context=None):
+        """
+        Upload audio, video, thumbnail and audio renditions concurrently.
+        Defaults to every artifact produced in this run. Returns {path: result}.
+        """
+        context = self._context(context)
+        if paths is None:
+            paths = [
+                context.state.get("text_to_speech"),
+                context.state.get("generate_video"),
+                context.state.get("thumbnail"),
+            ]
+            manifest = context.state.get("audio_renditions") or {}
+            paths += [r["path"] for r in manifest.get("renditions", [])]
+        results = self.publisher.publish(paths)
+        context.state.setdefault('published', {}).update(results)
+        return results
+
+    def call_function(self, name, arguments, context=None):
         """Helper to map function calls from the system to actual methods."""
+        context = self._context(context)
         func_impl = getattr(self, name.lower(), None)
         if func_impl:
             try:
                 processed_args = {}
                 for key, value in arguments.items():
+                    if value in context.results:
+                        # A handle to an earlier result: use the object itself, no JSON round trip
+                        processed_args[key] = context.results.get(value)
+                        continue
                     if isinstance(value, str):
                         try:
-                            processed_args[key] = json.loads(value)
+                            value = json.loads(value)
                         except json.JSONDecodeError:
-                            processed_args[key] = value
-                    else:
-                        processed_args[key] = value
+                            pass
+                    processed_args[key] = context.results.resolve(value)
+                if "context" in inspect.signature(func_impl).parameters:
+                    processed_args["context"] = context
 
                 # Example direct calls
                 if name == 'summarize_article':
@@ -505,112 +974,345 @@ class NewsAgent:
                 elif name == 'generate_news_script':
                     return func_impl(
                         processed_args.get('summarized_results'),
-                        processed_args.get('preferences')
+                        processed_args.get('preferences'),
+                        context=context
                     )
                 elif name == 'text_to_speech':
                     return func_impl(
                         processed_args.get('user_text'),
                         processed_args.get('voice_id'),
-                        processed_args.get('model_id')
+                        processed_args.get('model_id'),
+                        bool(processed_args.get('chunked', False)),
+                        stream=bool(processed_args.get('stream', False)),
+                        renditions=processed_args.get('renditions'),
+                        context=context
                     )
 
                 return func_impl(**processed_args) if processed_args else func_impl()
             except Exception as e:
-                print(f"Error executing function: {str(e)}")
+                log.error("Error executing function: %s", e)
                 return None
         else:
             return "Function not implemented."
 
-    def run(self, instruction):
+    def run(self, instruction=None, mode=None, preferences=None, context=None):
+        """
+        Produce a briefing and return the audio URL.
+        mode 'pipeline' (the AGENT_MODE default) runs the tools as a fixed stage graph;
+        'agentic' lets the LLM plan each step from instruction.
+        Each call gets a fresh RunContext unless one is passed in.
+        """
+        mode = mode or AGENT_MODE
+        if mode not in ("pipeline", "agentic"):
+            raise ValueError(f"Unknown agent mode: {mode}")
+        try:
+            with span("briefing", mode=mode):
+                if mode == "agentic":
+                    return self.run_agentic(instruction, context=context)
+                return self.run_pipeline(preferences, context=context)
+        finally:
+            tracer.flush()
+
+    def run_pipeline(self, preferences=None, context=None, on_stage=None):
+        """
+        Run the deterministic pipeline for one run, checkpointing each stage
+        under RUNS_DIR/<run_id>. preferences, if given, replace get_preferences().
+        context (a new RunContext by default) receives the run's state and
+        artifacts; on_stage is passed to Pipeline.run.
+        """
+        context = context or RunContext()
+        checkpoint = RunCheckpoint(context.run_id)
+        set_run_id(context.run_id)
+        current_span().set("run_id", context.run_id)
+        log.info("Run %s: checkpoints in %s, output in %s", context.run_id, checkpoint.directory, context.output_dir)
+        initial = None
+        if preferences:
+            initial = {"get_preferences": preferences}
+            # So resume() does not fall back to asking for preferences
+            checkpoint.save_stage("get_preferences", preferences, context.state)
+        with deadline_scope(self._start_deadline(context, preferences)):
+            Pipeline().run(self, context, initial, checkpoint, on_stage=on_stage)
+        return self._finish_pipeline(context)
+
+    def _start_deadline(self, context, preferences=None):
+        """
+        Start the run's Deadline unless context already has one: the
+        preferences' deadline_seconds, else RUN_DEADLINE_SECONDS (0 = none).
+        """
+        if context.deadline is None:
+            seconds = (preferences or {}).get("deadline_seconds") or RUN_DEADLINE_SECONDS
+            context.deadline = Deadline(seconds)
+            if context.deadline.seconds:
+                log.info("Run %s: deadline in %.0fs", context.run_id, context.deadline.seconds)
+        return context.deadline
+
+    def resume(self, run_id, context=None, on_stage=None):
+        """
+        Continue a checkpointed run, skipping every stage that already completed.
+        The restored state goes into context (a new RunContext by default).
+        """
+        checkpoint = RunCheckpoint(run_id)
+        pipeline = Pipeline()
+        initial, state = checkpoint.restore(pipeline.ordered_stages())
+        log.info("Resuming run %s: %s of %s stages restored (%s)",
+                 run_id, len(initial), len(pipeline.stages), ', '.join(initial) or 'none')
+        context = context or RunContext(run_id, output_dir=state.get("output_dir"))
+        context.state.update(state)
+        context.run_id = context.state["run_id"] = checkpoint.run_id
+        context.output_dir = context.state.setdefault("output_dir", context.output_dir)
+        set_run_id(checkpoint.run_id)
+        # A resumed run gets a fresh deadline for the stages still to run
+        deadline = self._start_deadline(context, initial.get("get_preferences"))
+        try:
+            with span("briefing", mode="resume", run_id=run_id, restored=len(initial)), deadline_scope(deadline):
+                pipeline.run(self, context, initial, checkpoint, on_stage=on_stage)
+                return self._finish_pipeline(context)
+        finally:
+            tracer.flush()
+
+    def _finish_pipeline(self, context):
+        published = self.wait_for_uploads(context=context)
+        audio_path = context.state.get("text_to_speech")
+        if audio_path in published and published[audio_path]:
+            context.state["upload_audio"] = published[audio_path]["gcs_url"]
+        if context.degradations:
+            kinds = sorted({d["kind"] for d in context.degradations})
+            log.warning("Run %s was degraded to meet its deadline: %s", context.run_id, ', '.join(kinds))
+        return context.state.get("upload_audio")
+
+    def _execute_tool(self, tool_call, context):
+        logger.log(f"ACTION: {tool_call.get('name')} {str(tool_call.get('parameters', {}))}", "red")
+        with span(f"tool.{tool_call.get('name')}"):
+            return self.call_function(tool_call.get("name"), tool_call.get("parameters", {}), context=context)
+
+    def _run_tool_wave(self, tool_calls, context, started=None):
+        """
+        Execute independent tool calls concurrently. started maps id(tool_call)
+        to the Future of a call that began while the planner was streaming.
+        Returns [(name, handle, result)] in call order.
+        """
+        started = started or {}
+        fresh = [tool_call for tool_call in tool_calls if id(tool_call) not in started]
+        if len(fresh) == 1:
+            fresh_results = [self._execute_tool(fresh[0], context)]
+        elif fresh:
+            with ThreadPoolExecutor(max_workers=len(fresh), thread_name_prefix="tool") as pool:
+                fresh_results = list(pool.map(propagate(lambda call: self._execute_tool(call, context)), fresh))
+        else:
+            fresh_results = []
+        fresh_results = iter(fresh_results)
+        results = [started[id(tool_call)].result() if id(tool_call) in started else next(fresh_results)
+                   for tool_call in tool_calls]
+
+        completed = []
+        for tool_call, result in zip(tool_calls, results):
+            name = tool_call.get("name")
+            context.state[name] = result
+            if name == "text_to_speech" and result:
+                # Upload the narration while the remaining steps (and the video render) run
+                self.upload_in_background(result, context=context)
+            completed.append((name, context.results.put(result), result))
+        return completed
+
+    def run_agentic(self, instruction, context=None):
         """Example run method that orchestrates multi-step calls."""
-        self.messages.append(Message(f"OBJECTIVE: {instruction}"))
+        context = context or RunContext()
+        set_run_id(context.run_id)
+        with deadline_scope(self._start_deadline(context)):
+            return self._run_agentic(instruction, context)
+
+    def _plan(self, messages, context, pool):
+        """
+        One planner turn. With AGENT_STREAM_TOOL_CALLS the reply is streamed
+        and every call that would land in the first wave starts on pool as
+        soon as it is complete. Returns (content, tool_calls, started).
+        """
+        if not AGENT_STREAM_TOOL_CALLS:
+            content, tool_calls = get_action_model().call(messages, functions_definitions)
+            return content, tool_calls, {}
+
+        seen, started = [], {}
+
+        def on_tool_call(tool_call):
+            seen.append(tool_call)
+            # Its wave only depends on the calls before it, so this is final
+            if any(call is tool_call for call in schedule_waves(seen)[0]):
+                log.info("Starting %s while the planner is still replying", tool_call.get('name'))
+                started[id(tool_call)] = pool.submit(propagate(self._execute_tool), tool_call, context)
+
+        content, tool_calls = get_action_model().call(messages, functions_definitions, on_tool_call=on_tool_call)
+        return content, tool_calls, started
+
+    def _run_agentic(self, instruction, context):
+        with ThreadPoolExecutor(max_workers=len(TOOL_DEPENDENCIES), thread_name_prefix="tool") as pool:
+            return self._agentic_loop(instruction, context, pool)
+
+    def _agentic_loop(self, instruction, context, pool):
+        context.messages.append(Message(f"OBJECTIVE: {instruction}"))
         system_message = Message(
             "You are a news assistant that must complete steps in order:\n"
             "1. get_preferences\n2. fetch_and_summarize\n3. generate_news_script\n4. text_to_speech\n"
-            "5. upload_audio\n6. generate_video\n",
+            "5. upload_audio\n6. generate_video\n"
+            "Each completed step reports a result handle such as @r2. To use an earlier result "
+            "as an argument, pass its handle string instead of copying the data.\n",
             role="system"
         )
 
-        content, tool_calls = action_model.call(
+        content, tool_calls, started = self._plan(
             [
                 system_message,
-                *self.messages,
+                *context.messages,
                 Message("Let's complete these steps one by one.")
             ],
-            functions_definitions
+            context, pool
         )
 
         # Simplified handling of steps:
         if content:
-            print(f"\nTHOUGHT: {content}")
-            self.messages.append(Message(logger.log(f"THOUGHT: {content}", "blue")))
-
-        for tool_call in tool_calls:
-            name = tool_call.get("name")
-            parameters = tool_call.get("parameters", {})
-            logger.log(f"ACTION: {name} {str(parameters)}", "red")
-            result = self.call_function(name, parameters)
-            self.state[name] = result
-            self.messages.append(Message(
-                f"Step completed: {name}\nResult: {json.dumps(result)}",
+            context.messages.append(Message(logger.log(f"THOUGHT: {content}", "blue")))
+
+        turns = 1
+        while tool_calls:
+            # Independent calls (e.g. uploads next to the video render) run side by side
+            completed = []
+            for wave in schedule_waves(tool_calls):
+                completed.extend(self._run_tool_wave(wave, context, started))
+            # Only digests go into the history; the planner passes handles to reuse results
+            context.messages.append(Message(
+                "\n\n".join(f"Step completed: {name}\nResult {handle}: {digest(result)}"
+                             for name, handle, result in completed),
                 role="assistant"
             ))
 
-            # Next step
-            content, next_tool_calls = action_model.call(
+            if turns >= AGENT_MAX_TURNS:
+                log.warning("Stopping after %s planner turns (AGENT_MAX_TURNS)", turns)
+                break
+            if context.deadline.expired:
+                log.warning("Stopping after %s planner turns: run deadline reached", turns)
+                break
+
+            # One planner turn for the whole batch of results
+            content, tool_calls, started = self._plan(
                 [
                     system_message,
-                    *self.messages,
+                    *context.messages,
                     Message("What's the next step we should take?")
                 ],
-                functions_definitions
+                context, pool
             )
+            turns += 1
             if content:
-                print(f"\nTHOUGHT: {content}")
-                self.messages.append(Message(logger.log(f"THOUGHT: {content}", "blue")))
-
-            if next_tool_calls:
-                tool_calls.extend(next_tool_calls)
-
-        # Check if we need to generate a video
-        if "text_to_speech" in self.state and "upload_audio" in self.state:
-            if "generate_video" not in self.state:
-                print("\nGenerating video from audio and script...")
-                script = self.state.get("generate_news_script", "")
-                audio_path = self.state.get("text_to_speech", "")
+                context.messages.append(Message(logger.log(f"THOUGHT: {content}", "blue")))
+
+        # Check if we need to generate a video (the audio upload keeps running meanwhile)
+        state = context.state
+        if "text_to_speech" in state:
+            if "generate_video" not in state:
+                log.info("Generating video from audio and script...")
+                script = state.get("generate_news_script", "")
+                audio_path = state.get("text_to_speech", "")
                 if script and audio_path:
-                    video_path = self.generate_video(script, audio_path)
-                    self.state["generate_video"] = video_path
-                    print(f"Video generated: {video_path}")
+                    video_path = self.generate_video(script, audio_path, context=context)
+                    state["generate_video"] = video_path
+                    log.info("Video generated: %s", video_path)
+                    self.upload_in_background(video_path, context=context)
+                    self.upload_in_background(state.get("thumbnail"), context=context)
+
+        published = self.wait_for_uploads(context=context)
+        audio_path = state.get("text_to_speech")
+        if audio_path in published:
+            result = published[audio_path]
+            state["upload_audio"] = result["gcs_url"] if result else None
 
-        return self.state.get("upload_audio")
+        return state.get("upload_audio")
 
-    def generate_video(self, script: str, audio_path: str, output_path: str = "output/news_video.mp4") -> str:
+    def _video_tier(self, quality, duration):
+        """
+        The best VIDEO_QUALITY_TIERS entry, no better than quality, whose
+        render estimate fits in the time left; None if none does.
+        """
+        if quality not in VIDEO_QUALITY_TIERS:
+            raise ValueError(f"Unknown video quality: {quality}")
+        tiers = list(VIDEO_QUALITY_TIERS)
+        left = remaining_seconds()
+        for name in tiers[tiers.index(quality):]:
+            if VIDEO_QUALITY_TIERS[name]["render_factor"] * duration <= left:
+                return name
+        return None
+
+    def _aligned_segment_times(self, alignment, sentences, chunks):
+        """
+        Exact (start_times, durations) for each text chunk from a character alignment,
+        or None if any chunk cannot be located. Sentences are located in one forward
+        pass; each segment then runs until the next one starts.
+        """
+        spans = dict(zip(sentences, alignment_utils.sentence_times(alignment, sentences)))
+        bounds = []
+        for chunk in chunks:
+            chunk_spans = [spans.get(s) for s in split_sentences(chunk)]
+            if not chunk_spans or any(span is None for span in chunk_spans):
+                return None
+            bounds.append((min(a for a, _ in chunk_spans), max(b for _, b in chunk_spans)))
+
+        order = sorted(range(len(bounds)), key=lambda i: bounds[i][0])
+        starts = [0.0] * len(bounds)
+        durations = [0.0] * len(bounds)
+        for pos, i in enumerate(order):
+            start, end = bounds[i]
+            if pos + 1 < len(order):
+                end = bounds[order[pos + 1]][0]
+            starts[i] = start
+            durations[i] = max(end - start, 0.1)
+        return starts, durations
+
+    def generate_video(self, script: str, audio_path: str, output_path: str = None,
+                       alignment: dict = None, quality: str = "high", context=None) -> str:
         """
         Generate a news video using the script, images, and audio narration.
+        When a character alignment for the audio is available (passed in, or stored
+        by text_to_speech(with_timestamps=True)), segment start and end times come
+        straight from it instead of word-count estimates.
         Fully self-contained version:
         - Fetches images for each article inline.
         - Builds a single composite video with an intro, ticker, article segments, and outro.
         - Cleans up all temp images at the end.
+        The video goes to output_path, by default the run's video path.
+        quality names a VIDEO_QUALITY_TIERS entry; if the deadline leaves too
+        little time for it a faster tier is used, and if even the fastest would
+        not finish in time no video is made and "" is returned (audio only).
         """
         import os
         import re
-        import requests
         from io import BytesIO
-        from urllib.parse import urlparse
 
+        import numpy as np
+        apply_moviepy_patches()
         from moviepy.editor import (
             ColorClip, TextClip, AudioFileClip,
             CompositeVideoClip, ImageClip
         )
         from PIL import Image, UnidentifiedImageError
 
+        context = self._context(context)
+        output_path = output_path or context.video_path
+        image_dir = context.image_dir
         try:
             # ---------------------------------------------------------------------
             # 1) Load the narration audio
             # ---------------------------------------------------------------------
+            # Only the duration is needed here; the audio is never decoded by MoviePy
             audio = AudioFileClip(audio_path)
             total_duration = audio.duration
+            audio.close()
+
+            tier = self._video_tier(quality, total_duration)
+            if tier is None:
+                context.degrade("generate_video", "audio_only",
+                                f"{remaining_seconds():.0f}s left, too little to render {total_duration:.0f}s of video")
+                return ""
+            if tier != quality:
+                context.degrade("generate_video", "lower_video_quality", f"{tier} instead of {quality}")
+            render = VIDEO_QUALITY_TIERS[tier]
 
             # ---------------------------------------------------------------------
             # 2) Prepare background
@@ -624,9 +1326,9 @@ class NewsAgent:
             outro_duration = 3  # seconds
             
             # ---------------------------------------------------------------------
-            # 3) Gather articles from self.state["summaries"]
+            # 3) Gather articles from the run's state["summaries"]
             # ---------------------------------------------------------------------
-            summaries = self.state.get('summaries', [])
+            summaries = context.state.get('summaries', [])
             article_data = []
             for cat in summaries:
                 for art in cat["articles"]:
@@ -638,7 +1340,7 @@ class NewsAgent:
 
             # Ensure we have at least one article
             if not article_data and summaries:
-                print("WARNING: No article data found in summaries, creating placeholder")
+                log.warning("No article data found in summaries, creating placeholder")
                 article_data = [{
                     "title": "News Update",
                     "summary": script if script else "No content available",
@@ -668,24 +1370,24 @@ class NewsAgent:
                 if clean_text.lower().startswith(pattern):
                     intro_length = len(pattern)
                     clean_text = clean_text[len(pattern):].strip()
-                    print(f"Removed intro phrase: '{pattern}'")
+                    log.debug("Removed intro phrase: '%s'", pattern)
             
             for pattern in outro_patterns:
                 if clean_text.lower().endswith(pattern):
                     outro_length = len(pattern)
                     clean_text = clean_text[:-len(pattern)].strip()
-                    print(f"Removed outro phrase: '{pattern}'")
+                    log.debug("Removed outro phrase: '%s'", pattern)
             
             # Split into sentences (simple approach)
             sentences = re.split(r'(?<=[.!?])\s+', clean_text)
             sentences = [s.strip() for s in sentences if s.strip()]
             
-            print(f"Extracted {len(sentences)} sentences from script")
+            log.debug("Extracted %s sentences from script", len(sentences))
             
             # Try to match sentences to articles using title keywords
             # This helps ensure that images match the content being discussed
             if sentences and article_data:
-                print("Attempting to match sentences to articles using keyword matching...")
+                log.debug("Attempting to match sentences to articles using keyword matching...")
                 
                 # Create a mapping of articles to their sentences
                 article_to_sentences = {i: [] for i in range(len(article_data))}
@@ -715,14 +1417,14 @@ class NewsAgent:
                     # If we found a good match, add the sentence to that article
                     if best_score > 0:
                         article_to_sentences[best_match].append(sentence)
-                        print(f"  Matched sentence to article #{best_match+1} (score: {best_score}): {sentence[:50]}...")
+                        log.debug("  Matched sentence to article #%s (score: %s): %s...", best_match+1, best_score, sentence[:50])
                     else:
                         unmatched_sentences.append(sentence)
-                        print(f"  No match found for sentence: {sentence[:50]}...")
+                        log.debug("  No match found for sentence: %s...", sentence[:50])
                 
                 # Second pass: distribute unmatched sentences
                 if unmatched_sentences:
-                    print(f"Distributing {len(unmatched_sentences)} unmatched sentences...")
+                    log.debug("Distributing %s unmatched sentences...", len(unmatched_sentences))
                     
                     # Find articles with no sentences and prioritize them
                     empty_articles = [i for i, sentences in article_to_sentences.items() if not sentences]
@@ -761,14 +1463,14 @@ class NewsAgent:
                     if i in article_to_sentences and article_to_sentences[i]:
                         chunk = " ".join(article_to_sentences[i])
                         article_text_chunks.append(chunk)
-                        print(f"Article #{i+1} text chunk: {chunk[:50]}..." if len(chunk) > 50 else chunk)
+                        log.debug("Article #%s text chunk: %s...", i+1, chunk[:50])
                     else:
                         # If no sentences were matched, use the article summary as fallback
                         article_text_chunks.append(article_data[i]['summary'])
-                        print(f"Article #{i+1} using summary as fallback: {article_data[i]['summary']}")
+                        log.debug("Article #%s using summary as fallback: %s", i+1, article_data[i]['summary'])
             else:
                 # Fallback to the original approach if matching fails
-                print("Using original approach to group sentences...")
+                log.debug("Using original approach to group sentences...")
                 # Group sentences into chunks based on article count
                 if sentences and article_data:
                     # If we have more sentences than articles, try to group them
@@ -776,8 +1478,8 @@ class NewsAgent:
                         sentences_per_article = len(sentences) // len(article_data)
                         remainder = len(sentences) % len(article_data)
                         
-                        print(f"Grouping {len(sentences)} sentences into {len(article_data)} chunks")
-                        print(f"Using ~{sentences_per_article} sentences per article")
+                        log.debug("Grouping %s sentences into %s chunks", len(sentences), len(article_data))
+                        log.debug("Using ~%s sentences per article", sentences_per_article)
                         
                         article_text_chunks = []
                         start_idx = 0
@@ -793,15 +1495,15 @@ class NewsAgent:
                                 article_text_chunks.append(chunk)
                                 start_idx = end_idx
                         
-                        print(f"Created {len(article_text_chunks)} text chunks from sentences")
+                        log.debug("Created %s text chunks from sentences", len(article_text_chunks))
                     else:
                         # If we have fewer or equal sentences to articles, use each sentence as a chunk
                         article_text_chunks = sentences
-                        print(f"Using {len(article_text_chunks)} individual sentences as text chunks")
+                        log.debug("Using %s individual sentences as text chunks", len(article_text_chunks))
             
             # Fallback: if we still don't have any chunks, use the whole script
             if not article_text_chunks and script:
-                print("No article chunks extracted, using entire script as one chunk")
+                log.debug("No article chunks extracted, using entire script as one chunk")
                 article_text_chunks = [clean_text if clean_text else script]
             
             # Add word count function back
@@ -809,31 +1511,31 @@ class NewsAgent:
                 return len(s.split())
 
             total_words = sum(word_count(ch) for ch in article_text_chunks)
-            print(f"Total words across all chunks: {total_words}")
+            log.debug("Total words across all chunks: %s", total_words)
 
             # Only handle as many articles as we have matching lines
             min_count = min(len(article_data), len(article_text_chunks))
             
             # Ensure we have at least one segment to display
             if min_count == 0 and (article_data or article_text_chunks):
-                print("WARNING: min_count is 0 but we have content. Using available content.")
+                log.warning("min_count is 0 but we have content. Using available content.")
                 min_count = max(len(article_data), len(article_text_chunks))
                 
                 # If we have articles but no text chunks, use summaries as text chunks
                 if not article_text_chunks and article_data:
-                    print("Using article summaries as text chunks")
+                    log.debug("Using article summaries as text chunks")
                     article_text_chunks = [art["summary"] for art in article_data]
                 
                 # If we have text chunks but no articles, create placeholder articles
                 if not article_data and article_text_chunks:
-                    print("Creating placeholder articles from text chunks")
+                    log.debug("Creating placeholder articles from text chunks")
                     article_data = [{"title": f"News Item #{i+1}", "summary": chunk, "url": ""} 
                                    for i, chunk in enumerate(article_text_chunks)]
             
             # IMPORTANT FIX: If we have more articles than text chunks, use each article's summary as its text chunk
             if len(article_data) > len(article_text_chunks) and article_text_chunks:
-                print(f"WARNING: More articles ({len(article_data)}) than text chunks ({len(article_text_chunks)})")
-                print("Using article summaries to create additional text chunks")
+                log.warning("More articles (%s) than text chunks (%s)", len(article_data), len(article_text_chunks))
+                log.debug("Using article summaries to create additional text chunks")
                 
                 # Keep existing text chunks and add summaries for the remaining articles
                 additional_chunks = [art["summary"] for art in article_data[len(article_text_chunks):]]
@@ -841,15 +1543,25 @@ class NewsAgent:
                 
                 # Update min_count to use all available articles
                 min_count = len(article_data)
-                print(f"Updated min_count to {min_count} to include all articles")
+                log.debug("Updated min_count to %s to include all articles", min_count)
                 
+            if alignment is None and context.state.get('alignment_audio_path') == audio_path:
+                alignment = context.state.get('alignment')
+
+            segment_start_times = None
+            segment_durations = []
+            if alignment and sentences:
+                aligned = self._aligned_segment_times(alignment, sentences, article_text_chunks[:min_count])
+                if aligned:
+                    segment_start_times, segment_durations = aligned
+                    log.info("Using alignment timestamps for segment timing")
+
             # Calculate segment durations based on word count
             # This ensures that segments are proportional to their content
-            segment_durations = []
             usable_duration = total_duration - (intro_duration + outro_duration)
             
             # First pass: calculate raw durations based on word count
-            for i in range(min_count):
+            for i in range(min_count if segment_start_times is None else 0):
                 chunk = article_text_chunks[i] if i < len(article_text_chunks) else ""
                 wc = word_count(chunk)
                 fraction = wc / total_words if total_words else 1.0 / min_count
@@ -862,28 +1574,27 @@ class NewsAgent:
                 # Scale down proportionally if we exceed available time
                 scale_factor = usable_duration / total_segment_duration
                 segment_durations = [d * scale_factor for d in segment_durations]
-                print(f"Scaled segment durations by {scale_factor:.2f} to fit available time")
+                log.debug("Scaled segment durations by %.2f to fit available time", scale_factor)
             
-            print("Segment durations:")
+            log.debug("Segment durations:")
             for i, duration in enumerate(segment_durations):
-                print(f"  Segment #{i+1}: {duration:.2f}s")
+                log.debug("  Segment #%s: %.2fs", i+1, duration)
 
             # ---------------------------------------------------------------------
             # 5) Inline image fetching
             # ---------------------------------------------------------------------
-            print("\n" + "-"*50)
-            print("STEP 5: FETCHING IMAGES FOR ARTICLES")
-            print("-"*50)
+            log.info("STEP 5: FETCHING IMAGES FOR ARTICLES")
             
             def fetch_best_image_for(url):
                 """Fetch an image for a given article URL using self.exa or HTML fallbacks."""
-                print(f"  Fetching image for: {url}")
+                log.debug("  Fetching image for: %s", url)
                 best_image_url = None
 
                 # (A) Use exa.get_contents if available
                 try:
-                    print("    Attempting Exa content fetch...")
-                    content_resp = self.exa.get_contents(urls=[url])
+                    log.debug("    Attempting Exa content fetch...")
+                    with span("exa.contents", url=url):
+                        content_resp = self.exa.get_contents(urls=[url])
                     if content_resp and hasattr(content_resp, "contents") and content_resp.contents:
                         for c in content_resp.contents:
                             if hasattr(c, "images") and c.images:
@@ -895,16 +1606,16 @@ class NewsAgent:
                                     # pick the largest
                                     biggest = max(valid_imgs, key=lambda x: x.width * x.height)
                                     best_image_url = biggest.url
-                                    print(f"    ✓ Found image via Exa: {biggest.width}x{biggest.height}")
+                                    log.debug("    ✓ Found image via Exa: %sx%s", biggest.width, biggest.height)
                                     break
                 except Exception as e:
-                    print(f"    ✗ Exa content fetch failed: {e}")
+                    log.warning("    ✗ Exa content fetch failed: %s", e)
 
                 # (B) fallback: parse meta tags
                 if not best_image_url:
                     try:
-                        print("    Attempting HTML meta tag parsing...")
-                        resp = requests.get(url, timeout=10)
+                        log.debug("    Attempting HTML meta tag parsing...")
+                        resp = get_http_client().get(url, timeout=10)
                         if resp.status_code == 200:
                             patterns = [
                                 r'<meta\s+(?:property|name)="(?:og:image|og:image:secure_url|twitter:image)"\s+content="([^"]+)"',
@@ -919,64 +1630,62 @@ class NewsAgent:
                                         from urllib.parse import urlparse
                                         base = urlparse(url)
                                         best_image_url = f"{base.scheme}://{base.netloc}{best_image_url}"
-                                    print(f"    ✓ Found image via HTML meta: {best_image_url[:50]}...")
+                                    log.debug("    ✓ Found image via HTML meta: %s...", best_image_url[:50])
                                     break
                     except Exception as e:
-                        print(f"    ✗ Fallback meta parse failed: {e}")
+                        log.warning("    ✗ Fallback meta parse failed: %s", e)
 
                 # (C) Attempt to download
                 if best_image_url:
                     try:
-                        print("    Downloading image...")
-                        r = requests.get(best_image_url, timeout=15)
+                        log.debug("    Downloading image...")
+                        r = get_http_client().get(best_image_url, timeout=15)
                         if r.status_code == 200:
                             with BytesIO(r.content) as buf:
                                 try:
                                     pil_img = Image.open(buf).convert("RGB")
-                                    print(f"    ✓ Image loaded: {pil_img.width}x{pil_img.height}")
+                                    log.debug("    ✓ Image loaded: %sx%s", pil_img.width, pil_img.height)
                                     if pil_img.width < 10 or pil_img.height < 10:
-                                        print("    ✗ Image too small, skipping.")
+                                        log.warning("    ✗ Image too small, skipping.")
                                         return None
-                                    os.makedirs("temp_images", exist_ok=True)
-                                    img_path = f"temp_images/img_{abs(hash(url))}.png"
+                                    img_path = os.path.join(image_dir, f"img_{abs(hash(url))}.png")
                                     pil_img.save(img_path)
-                                    print(f"    ✓ Saved to: {img_path}")
+                                    log.debug("    ✓ Saved to: %s", img_path)
                                     return img_path
                                 except UnidentifiedImageError:
-                                    print("    ✗ Unidentified image format.")
+                                    log.warning("    ✗ Unidentified image format.")
                                 except Exception as e:
-                                    print(f"    ✗ Error processing image: {e}")
+                                    log.warning("    ✗ Error processing image: %s", e)
                     except Exception as e:
-                        print(f"    ✗ Could not download image: {e}")
+                        log.warning("    ✗ Could not download image: %s", e)
 
                 # No fallback image creation - just return None
-                print("    ✗ No suitable image found")
+                log.warning("    ✗ No suitable image found")
                 return None
 
-            images_for_articles = []
-            successful_images = 0
-            failed_images = 0
-            
+            def fetch_image_traced(url):
+                with span("image.fetch", url=url) as s:
+                    img_path = fetch_best_image_for(url)
+                    s.set("found", bool(img_path))
+                    return img_path
+
+            # Image lookups are network-bound and independent, so fetch them concurrently
             for i, art in enumerate(article_data):
-                print(f"  Article #{i+1}: {art['title']}")
-                path = fetch_best_image_for(art["url"])
-                if path:
-                    successful_images += 1
-                else:
-                    failed_images += 1
-                images_for_articles.append(path)
+                log.debug("  Article #%s: %s", i+1, art['title'])
+            with ThreadPoolExecutor(max_workers=max(1, min(8, len(article_data)))) as pool:
+                images_for_articles = list(pool.map(propagate(fetch_image_traced), [art["url"] for art in article_data]))
+            successful_images = sum(1 for path in images_for_articles if path)
+            failed_images = len(images_for_articles) - successful_images
             
-            print(f"✓ Image fetching complete:")
-            print(f"  - Total articles: {len(article_data)}")
-            print(f"  - Successfully downloaded: {successful_images}")
-            print(f"  - Failed to find images: {failed_images}")
+            log.info("✓ Image fetching complete:")
+            log.debug("  - Total articles: %s", len(article_data))
+            log.debug("  - Successfully downloaded: %s", successful_images)
+            log.debug("  - Failed to find images: %s", failed_images)
 
             # ---------------------------------------------------------------------
             # 6) Build base clips
             # ---------------------------------------------------------------------
-            print("\n" + "-"*50)
-            print("STEP 6: BUILDING BASE VIDEO ELEMENTS")
-            print("-"*50)
+            log.info("STEP 6: BUILDING BASE VIDEO ELEMENTS")
             
             all_clips = [background]
 
@@ -989,7 +1698,7 @@ class NewsAgent:
                 method="label"
             ).set_position((20, 20)).set_duration(total_duration)
             all_clips.append(logo_text)
-            print("✓ Added logo text")
+            log.debug("✓ Added logo text")
 
             # Intro (2 seconds)
             intro_text = TextClip(
@@ -1000,7 +1709,7 @@ class NewsAgent:
                 method="caption"
             ).set_position("center").set_duration(intro_duration)
             all_clips.append(intro_text)
-            print(f"✓ Added intro text ({intro_duration}s)")
+            log.debug("✓ Added intro text (%ss)", intro_duration)
 
             # Outro (last 3 seconds)
             outro_text = TextClip(
@@ -1013,7 +1722,7 @@ class NewsAgent:
             .set_start(total_duration - outro_duration) \
             .set_duration(outro_duration)
             all_clips.append(outro_text)
-            print(f"✓ Added outro text ({outro_duration}s)")
+            log.debug("✓ Added outro text (%ss)", outro_duration)
 
             # Ticker
             ticker_height = 60
@@ -1021,7 +1730,7 @@ class NewsAgent:
             ticker_y = height - ticker_height - 80
             ticker_bg = ticker_bg.set_position((0, ticker_y))
             all_clips.append(ticker_bg)
-            print("✓ Added ticker background")
+            log.debug("✓ Added ticker background")
 
             # Calculate the safe area for content (avoid ticker overlap)
             safe_bottom_y = ticker_y - 40  # 40px margin above ticker
@@ -1042,25 +1751,24 @@ class NewsAgent:
 
             scrolling_ticker = ticker_txt_clip.set_duration(total_duration).set_position(scroll_position)
             all_clips.append(scrolling_ticker)
-            print(f"✓ Added scrolling ticker with {len(ticker_titles)} headlines")
-            print(f"✓ Safe bottom area: y < {safe_bottom_y}px")
+            log.debug("✓ Added scrolling ticker with %s headlines", len(ticker_titles))
+            log.debug("✓ Safe bottom area: y < %spx", safe_bottom_y)
 
             # ---------------------------------------------------------------------
             # 7) Article segments
             # ---------------------------------------------------------------------
-            print("\n" + "-"*50)
-            print("STEP 7: BUILDING ARTICLE SEGMENTS")
-            print("-"*50)
+            log.info("STEP 7: BUILDING ARTICLE SEGMENTS")
             
             # Calculate start times for each segment based on durations
-            segment_start_times = [intro_duration]
-            for i in range(1, min_count):
-                segment_start_times.append(segment_start_times[i-1] + segment_durations[i-1])
+            if segment_start_times is None:
+                segment_start_times = [intro_duration]
+                for i in range(1, min_count):
+                    segment_start_times.append(segment_start_times[i-1] + segment_durations[i-1])
             
-            print("Segment timing:")
+            log.debug("Segment timing:")
             for i in range(min_count):
                 end_time = segment_start_times[i] + segment_durations[i]
-                print(f"  Segment #{i+1}: {segment_start_times[i]:.2f}s - {end_time:.2f}s (duration: {segment_durations[i]:.2f}s)")
+                log.debug("  Segment #%s: %.2fs - %.2fs (duration: %.2fs)", i+1, segment_start_times[i], end_time, segment_durations[i])
             
             image_clips_added = 0
             headline_clips_added = 0
@@ -1068,17 +1776,17 @@ class NewsAgent:
             
             # Ensure arrays are properly sized for iteration
             if len(article_text_chunks) < min_count:
-                print(f"WARNING: Only {len(article_text_chunks)} text chunks for {min_count} segments")
+                log.warning("Only %s text chunks for %s segments", len(article_text_chunks), min_count)
                 # Pad with empty strings if needed
                 article_text_chunks.extend([""] * (min_count - len(article_text_chunks)))
                 
             if len(article_data) < min_count:
-                print(f"WARNING: Only {len(article_data)} articles for {min_count} segments")
+                log.warning("Only %s articles for %s segments", len(article_data), min_count)
                 # Pad with placeholder data if needed
                 article_data.extend([{"title": "News Update", "summary": "No content available", "url": ""}] 
                                    * (min_count - len(article_data)))
             
-            print(f"Processing {min_count} segments with {len(article_data)} articles and {len(article_text_chunks)} text chunks")
+            log.debug("Processing %s segments with %s articles and %s text chunks", min_count, len(article_data), len(article_text_chunks))
             
             # Add debug timing indicators (small colored bars at the bottom of the screen)
             # This helps visualize segment transitions
@@ -1092,11 +1800,11 @@ class NewsAgent:
                 segment_duration = segment_durations[i]
                 start_time = segment_start_times[i]
 
-                print(f"\nSegment #{i+1}:")
-                print(f"  - Title: {article['title']}")
-                print(f"  - Text chunk: {chunk[:50]}..." if len(chunk) > 50 else chunk)
-                print(f"  - Start time: {start_time:.2f}s")
-                print(f"  - Duration: {segment_duration:.2f}s")
+                log.debug("Segment #%s:", i+1)
+                log.debug("  - Title: %s", article['title'])
+                log.debug("  - Text chunk: %s...", chunk[:50])
+                log.debug("  - Start time: %.2fs", start_time)
+                log.debug("  - Duration: %.2fs", segment_duration)
                 
                 # HEADLINE (always at top)
                 headline_clip = TextClip(
@@ -1112,7 +1820,7 @@ class NewsAgent:
                 .set_duration(segment_duration)
                 all_clips.append(headline_clip)
                 headline_clips_added += 1
-                print(f"  ✓ Added headline text")
+                log.debug("  ✓ Added headline text")
 
                 # Image (only if available)
                 img_path = images_for_articles[i] if i < len(images_for_articles) else None
@@ -1144,14 +1852,14 @@ class NewsAgent:
                                         .set_duration(segment_duration)
                         all_clips.append(img_clip)
                         image_clips_added += 1
-                        print(f"  ✓ Added image: {new_w}x{new_h} at y={image_y}")
+                        log.debug("  ✓ Added image: %sx%s at y=%s", new_w, new_h, image_y)
                         
                         # Calculate maximum available height for summary
                         available_height = safe_bottom_y - (image_y + new_h)
                         
                         # If not enough space for summary (less than 120px), reduce image size
                         if available_height < 120:
-                            print(f"  ⚠ Not enough space for summary (only {available_height}px available)")
+                            log.warning("  ⚠ Not enough space for summary (only %spx available)", available_height)
                             # Use a smaller image size
                             scale_factor = 0.8  # Reduce to 80% of original size
                             new_w, new_h = int(new_w * scale_factor), int(new_h * scale_factor)
@@ -1169,7 +1877,7 @@ class NewsAgent:
                             all_clips.append(img_clip)
                             image_clips_added += 1
                             
-                            print(f"  ✓ Resized image to {new_w}x{new_h} to make room for summary")
+                            log.debug("  ✓ Resized image to %sx%s to make room for summary", new_w, new_h)
                             # Recalculate available height
                             available_height = safe_bottom_y - (image_y + new_h)
                         
@@ -1179,19 +1887,19 @@ class NewsAgent:
                         # Ensure summary doesn't overlap with ticker
                         if summary_y > safe_bottom_y - 100:  # Allow 100px for summary text
                             summary_y = safe_bottom_y - 100
-                            print(f"  ⚠ Adjusted summary position to avoid ticker overlap")
+                            log.warning("  ⚠ Adjusted summary position to avoid ticker overlap")
                         
-                        print(f"  - Image position: center, y={image_y}")
-                        print(f"  - Image dimensions: {new_w}x{new_h}")
-                        print(f"  - Summary position: center, y={summary_y}")
-                        print(f"  - Available height for summary: {available_height}px")
-                        print(f"  - Ticker position: y={ticker_y}")
+                        log.debug("  - Image position: center, y=%s", image_y)
+                        log.debug("  - Image dimensions: %sx%s", new_w, new_h)
+                        log.debug("  - Summary position: center, y=%s", summary_y)
+                        log.debug("  - Available height for summary: %spx", available_height)
+                        log.debug("  - Ticker position: y=%s", ticker_y)
                         
                         # Adjust font size based on available height
                         summary_font_size = 26  # Default font size
                         if available_height < 150:
                             summary_font_size = 22  # Smaller font if space is limited
-                            print(f"  ⚠ Reduced summary font size to {summary_font_size} due to limited space")
+                            log.warning("  ⚠ Reduced summary font size to %s due to limited space", summary_font_size)
                         
                         summary_clip = TextClip(
                             article['summary'],
@@ -1205,7 +1913,7 @@ class NewsAgent:
                         .set_start(start_time) \
                         .set_duration(segment_duration)
                     except Exception as e:
-                        print(f"  ✗ Error with image {img_path}: {e}")
+                        log.warning("  ✗ Error with image %s: %s", img_path, e)
                         # If image fails, center the summary
                         
                         # Calculate a good position for the summary when image loading fails
@@ -1216,8 +1924,8 @@ class NewsAgent:
                         if center_y + 100 > safe_bottom_y:  # Allow 100px for summary text
                             center_y = safe_bottom_y - 150  # 150px above ticker
                         
-                        print(f"  - Summary position (image failed): center, y={center_y}")
-                        print(f"  - Ticker position: y={ticker_y}")
+                        log.debug("  - Summary position (image failed): center, y=%s", center_y)
+                        log.debug("  - Ticker position: y=%s", ticker_y)
                         
                         summary_clip = TextClip(
                             article['summary'],
@@ -1232,7 +1940,7 @@ class NewsAgent:
                         .set_duration(segment_duration)
                 else:
                     # No image - center the summary but avoid ticker
-                    print(f"  ✗ No image available")
+                    log.warning("  ✗ No image available")
                     
                     # Calculate a good position for the summary when no image is present
                     # Place it in the center of the screen, but above the ticker
@@ -1242,8 +1950,8 @@ class NewsAgent:
                     if center_y + 100 > safe_bottom_y:  # Allow 100px for summary text
                         center_y = safe_bottom_y - 150  # 150px above ticker
                     
-                    print(f"  - Summary position (no image): center, y={center_y}")
-                    print(f"  - Ticker position: y={ticker_y}")
+                    log.debug("  - Summary position (no image): center, y=%s", center_y)
+                    log.debug("  - Ticker position: y=%s", ticker_y)
                     
                     summary_clip = TextClip(
                         article['summary'],
@@ -1259,49 +1967,59 @@ class NewsAgent:
                 
                 all_clips.append(summary_clip)
                 summary_clips_added += 1
-                print(f"  ✓ Added summary text")
+                log.debug("  ✓ Added summary text")
             
-            print("\nArticle segments complete:")
-            print(f"  - Total segments: {min_count}")
-            print(f"  - Headlines added: {headline_clips_added}/{min_count}")
-            print(f"  - Images added: {image_clips_added}/{min_count}")
-            print(f"  - Summaries added: {summary_clips_added}/{min_count}")
+            log.info("Article segments complete:")
+            log.debug("  - Total segments: %s", min_count)
+            log.debug("  - Headlines added: %s/%s", headline_clips_added, min_count)
+            log.debug("  - Images added: %s/%s", image_clips_added, min_count)
+            log.debug("  - Summaries added: %s/%s", summary_clips_added, min_count)
 
             # ---------------------------------------------------------------------
             # 8) Compose final
             # ---------------------------------------------------------------------
-            print("\n" + "-"*50)
-            print("STEP 8: COMPOSITING FINAL VIDEO")
-            print("-"*50)
+            log.info("STEP 8: COMPOSITING FINAL VIDEO")
             
-            print(f"Total clips to composite: {len(all_clips)}")
-            final_clip = CompositeVideoClip(all_clips).set_audio(audio)
+            log.info("Total clips to composite: %s", len(all_clips))
+            final_clip = CompositeVideoClip(all_clips)
 
             # Make sure output folder exists
             os.makedirs(os.path.dirname(output_path), exist_ok=True)
             
-            print(f"Writing video to: {output_path}")
-            print(f"This may take a while...")
-            final_clip.write_videofile(
-                output_path,
-                fps=24,
-                codec="libx264",
-                audio_codec="aac",
-                threads=4,
-                preset="medium",
-                bitrate="3000k"
-            )
+            # Render video only, then stream-copy the narration in: this avoids
+            # MoviePy decoding the MP3 and re-encoding it to AAC
+            silent_path = f"{os.path.splitext(output_path)[0]}.video_only.mp4"
+            log.info("Writing video to: %s", output_path)
+            log.debug("This may take a while...")
+            with span("video.render", clips=len(all_clips), duration=total_duration):
+                final_clip.write_videofile(
+                    silent_path,
+                    fps=render["fps"],
+                    codec="libx264",
+                    audio=False,
+                    threads=4,
+                    preset=render["preset"],
+                    bitrate=render["bitrate"]
+                )
+
+            # One still frame from the first article makes the thumbnail
+            thumbnail_path = f"{os.path.splitext(output_path)[0]}_thumbnail.png"
+            try:
+                thumb_time = segment_start_times[0] + 0.5 if min_count else total_duration / 2
+                final_clip.save_frame(thumbnail_path, t=min(thumb_time, total_duration - 0.1))
+                context.state['thumbnail'] = thumbnail_path
+            except Exception as e:
+                log.warning("Could not save thumbnail: %s", e)
 
             final_clip.close()
-            audio.close()
-            print(f"Video rendering complete!")
+            with span("video.mux"):
+                mux_audio(silent_path, audio_path, output_path)
+            log.info("Video rendering complete!")
 
             # ---------------------------------------------------------------------
             # 9) Cleanup
             # ---------------------------------------------------------------------
-            print("\n" + "-"*50)
-            print("STEP 9: CLEANING UP TEMPORARY FILES")
-            print("-"*50)
+            log.info("STEP 9: CLEANING UP TEMPORARY FILES")
             
             removed_count = 0
             for path in images_for_articles:
@@ -1311,19 +2029,16 @@ class NewsAgent:
                         removed_count += 1
                     except:
                         pass
-            print(f"Removed {removed_count} temporary image files")
+            log.debug("Removed %s temporary image files", removed_count)
 
-            print("\n" + "="*80)
-            print("VIDEO GENERATION SUMMARY")
-            print("="*80)
-            print(f"Total duration: {total_duration:.2f} seconds")
-            print(f"Segments: {min_count}")
-            print(f"Images: {successful_images} downloaded, {failed_images} missing")
-            print(f"Output: {output_path}")
-            print("="*80 + "\n")
+            log.info("VIDEO GENERATION SUMMARY")
+            log.info("Total duration: %.2f seconds", total_duration)
+            log.info("Segments: %s", min_count)
+            log.info("Images: %s downloaded, %s missing", successful_images, failed_images)
+            log.info("Output: %s", output_path)
 
             return output_path
 
         except Exception as e:
-            print(f"Failed to generate video: {e}")
+            log.error("Failed to generate video: %s", e)
             raise
\ No newline at end of file
@@ -0,0 +1,117 @@
+import json
+
+import numpy as np
+
+
+def from_elevenlabs(alignment):
+    """Convert an ElevenLabs with-timestamps alignment block to our compact form."""
+    return {
+        "characters": list(alignment["characters"]),
+        "start": list(alignment["character_start_times_seconds"]),
+        "end": list(alignment["character_end_times_seconds"]),
+    }
+
+
+def uniform_alignment(text, duration):
+    """Spread text evenly over duration; used for audio that came without timestamps."""
+    n = max(len(text), 1)
+    step = duration / n
+    return {
+        "characters": list(text),
+        "start": [i * step for i in range(len(text))],
+        "end": [(i + 1) * step for i in range(len(text))],
+    }
+
+
+def merge(alignments, offsets, trims=None):
+    """
+    Join per-chunk alignments onto one timeline.
+    offsets are where each chunk starts in the stitched audio, trims how much
+    leading silence was cut from each chunk. Chunks are separated by a space.
+    """
+    merged = {"characters": [], "start": [], "end": []}
+    trims = trims or [0.0] * len(alignments)
+    for i, (alignment, offset, trim) in enumerate(zip(alignments, offsets, trims)):
+        shift = offset - trim
+        if i > 0 and merged["end"]:
+            merged["characters"].append(" ")
+            merged["start"].append(merged["end"][-1])
+            merged["end"].append(max(offset, merged["end"][-1]))
+        merged["characters"].extend(alignment["characters"])
+        merged["start"].extend(max(t + shift, offset) for t in alignment["start"])
+        merged["end"].extend(max(t + shift, offset) for t in alignment["end"])
+    return merged
+
+
+def remap(alignment, removed):
+    """Shift alignment times to account for removed (start, end) intervals of the original audio."""
+    if not removed:
+        return alignment
+    cut_starts = np.array([s for s, _ in removed])
+    cut_ends = np.array([e for _, e in removed])
+    cut_lengths = np.cumsum(cut_ends - cut_starts)
+
+    def shift(times):
+        times = np.asarray(times, dtype=np.float64)
+        # Number of intervals that start before each timestamp
+        idx = np.searchsorted(cut_starts, times, side="right")
+        before = np.where(idx > 0, cut_lengths[np.maximum(idx - 1, 0)], 0.0)
+        # Timestamps inside a removed interval collapse onto its start
+        inside = (idx > 0) & (times < cut_ends[np.maximum(idx - 1, 0)])
+        overshoot = np.where(inside, cut_ends[np.maximum(idx - 1, 0)] - times, 0.0)
+        return (times - before + overshoot).tolist()
+
+    return {
+        "characters": alignment["characters"],
+        "start": shift(alignment["start"]),
+        "end": shift(alignment["end"]),
+    }
+
+
+def sentence_times(alignment, sentences):
+    """
+    Locate each sentence in the aligned text and return its (start, end) seconds,
+    or None when a sentence cannot be found. Sentences must be in script order;
+    the search cursor only moves forward, so this is a single linear pass.
+    """
+    text = "".join(alignment["characters"])
+    # Compare on a whitespace-normalized, lower-cased copy while keeping index mapping
+    normalized = []
+    index_map = []
+    previous_space = False
+    for i, ch in enumerate(text):
+        if ch.isspace():
+            if previous_space:
+                continue
+            ch = " "
+            previous_space = True
+        else:
+            previous_space = False
+        normalized.append(ch.lower())
+        index_map.append(i)
+    haystack = "".join(normalized)
+
+    times = []
+    cursor = 0
+    for sentence in sentences:
+        needle = " ".join(sentence.split()).lower()
+        pos = haystack.find(needle, cursor) if needle else -1
+        if pos < 0:
+            times.append(None)
+            continue
+        first = index_map[pos]
+        last = index_map[pos + len(needle) - 1]
+        times.append((alignment["start"][first], alignment["end"][last]))
+        cursor = pos + len(needle)
+    return times
+
+
+def save(alignment, path):
+    with open(path, "w") as f:
+        json.dump(alignment, f)
+    return path
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,295 @@
+import io
+import os
+import json
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .utils.logger import get_logger
+
+log = get_logger(__name__)
+
+
+class PCMAudio:
+    """
+    Decoded audio held as a single NumPy buffer of float32 samples in [-1, 1],
+    shaped (frames, channels). Stitching and post-processing stages all work on
+    this buffer so the provider audio is decoded once and encoded once.
+    """
+
+    def __init__(self, samples, frame_rate):
+        if samples.ndim == 1:
+            samples = samples[:, np.newaxis]
+        self.samples = samples.astype(np.float32, copy=False)
+        self.frame_rate = frame_rate
+
+    @classmethod
+    def from_segment(cls, segment):
+        raw = np.frombuffer(segment.raw_data, dtype=_sample_dtype(segment.sample_width))
+        scale = float(1 << (8 * segment.sample_width - 1))
+        samples = raw.reshape(-1, segment.channels).astype(np.float32) / scale
+        return cls(samples, segment.frame_rate)
+
+    @classmethod
+    def from_bytes(cls, data, format="mp3", frame_rate=None, channels=None):
+        """Decode encoded audio, optionally conforming it to a sample rate and channel count."""
+        from pydub import AudioSegment
+        segment = AudioSegment.from_file(io.BytesIO(data), format=format)
+        if frame_rate and segment.frame_rate != frame_rate:
+            segment = segment.set_frame_rate(frame_rate)
+        if channels and segment.channels != channels:
+            segment = segment.set_channels(channels)
+        return cls.from_segment(segment)
+
+    @classmethod
+    def silent(cls, duration_ms, frame_rate=44100, channels=1):
+        frames = int(frame_rate * duration_ms / 1000)
+        return cls(np.zeros((frames, channels), dtype=np.float32), frame_rate)
+
+    @property
+    def channels(self):
+        return self.samples.shape[1]
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.frame_rate
+
+    def to_segment(self):
+        pcm16 = (np.clip(self.samples, -1.0, 1.0) * 32767).astype(np.int16)
+        from pydub import AudioSegment
+        return AudioSegment(
+            pcm16.tobytes(),
+            frame_rate=self.frame_rate,
+            sample_width=2,
+            channels=self.channels,
+        )
+
+    def export(self, path, format="mp3", bitrate="128k"):
+        """Encode the buffer to a file. This is the only encode on the stitched path."""
+        self.to_segment().export(path, format=format, bitrate=bitrate)
+        return path
+
+
+def _sample_dtype(sample_width):
+    return {1: np.int8, 2: np.int16, 4: np.int32}[sample_width]
+
+
+def window_rms_db(samples, frame_rate, window_ms=10):
+    """RMS level in dBFS of consecutive non-overlapping windows, computed in one vectorized pass."""
+    window = max(int(frame_rate * window_ms / 1000), 1)
+    count = len(samples) // window
+    if count == 0:
+        return np.array([], dtype=np.float32), window
+    mono = samples[:count * window].mean(axis=1)
+    rms = np.sqrt(np.mean(mono.reshape(count, window) ** 2, axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10)), window
+
+
+def _loud_bounds(pcm, silence_thresh=-50.0, window_ms=10):
+    """First and last frame (exclusive) of the non-silent part of the buffer."""
+    levels, window = window_rms_db(pcm.samples, pcm.frame_rate, window_ms)
+    loud = np.flatnonzero(levels > silence_thresh)
+    if len(loud) == 0:
+        return 0, len(pcm.samples)
+    return loud[0] * window, min((loud[-1] + 1) * window, len(pcm.samples))
+
+
+def trim_edges(pcm, silence_thresh=-50.0, window_ms=10):
+    """Drop leading and trailing windows quieter than silence_thresh dBFS."""
+    start, end = _loud_bounds(pcm, silence_thresh, window_ms)
+    return PCMAudio(pcm.samples[start:end], pcm.frame_rate)
+
+
+def concat(clips, crossfade_ms=30, gap_ms=150, silence_thresh=-50.0, return_layout=False):
+    """
+    Join clips into one buffer with a single np.concatenate.
+    Each clip's edge silence is replaced by a uniform gap, and clips after the
+    first fade in over crossfade_ms (the gap is silent, so this equals a
+    crossfade from the gap into the clip).
+    With return_layout, also returns each clip's start in the joined audio and
+    how much leading silence was trimmed from it (both in seconds).
+    """
+    if not clips:
+        empty = PCMAudio.silent(0)
+        return (empty, [], []) if return_layout else empty
+
+    frame_rate = clips[0].frame_rate
+    channels = clips[0].channels
+    gap_frames = int(frame_rate * gap_ms / 1000)
+    fade_frames = min(int(frame_rate * crossfade_ms / 1000), gap_frames)
+
+    pieces = []
+    offsets = []
+    trims = []
+    position = 0
+    for i, clip in enumerate(clips):
+        start, end = _loud_bounds(clip, silence_thresh)
+        samples = clip.samples[start:end]
+        if i > 0:
+            pieces.append(np.zeros((gap_frames - fade_frames, channels), dtype=np.float32))
+            position += gap_frames - fade_frames
+            n = min(fade_frames, len(samples))
+            if n:
+                samples = samples.copy()
+                samples[:n] *= np.linspace(0.0, 1.0, n, dtype=np.float32)[:, np.newaxis]
+        offsets.append(position / frame_rate)
+        trims.append(start / clip.frame_rate)
+        pieces.append(samples)
+        position += len(samples)
+
+    joined = PCMAudio(np.concatenate(pieces), frame_rate)
+    return (joined, offsets, trims) if return_layout else joined
+
+
+def ffmpeg_binary():
+    """The ffmpeg executable bundled with imageio-ffmpeg (which MoviePy uses), or the one on PATH."""
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return shutil.which("ffmpeg") or "ffmpeg"
+
+
+def mux_audio(video_path, audio_path, output_path):
+    """
+    Combine a silent video with an audio file without re-encoding either stream.
+    MP3 and AAC are both valid in MP4, so the narration is stream-copied; if the
+    container rejects it we fall back to a single AAC encode.
+    """
+    base_cmd = [ffmpeg_binary(), "-y", "-loglevel", "error", "-i", video_path, "-i", audio_path,
+                "-map", "0:v:0", "-map", "1:a:0", "-c:v", "copy"]
+    try:
+        subprocess.run(base_cmd + ["-c:a", "copy", "-shortest", output_path], check=True,
+                       capture_output=True)
+        log.info("Muxed narration into video with stream copy (no audio transcode)")
+    except subprocess.CalledProcessError as e:
+        log.warning("Audio stream copy failed (%s), encoding AAC instead", e.stderr.decode(errors='ignore').strip())
+        subprocess.run(base_cmd + ["-c:a", "aac", "-b:a", "128k", "-shortest", output_path], check=True,
+                       capture_output=True)
+
+    if video_path != output_path:
+        os.remove(video_path)
+    return output_path
+
+
+def _silent_runs(silent):
+    """Start/end window indices of each run of True values in a boolean array."""
+    padded = np.concatenate(([0], silent.astype(np.int8), [0]))
+    edges = np.diff(padded)
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def compact_silences(pcm, max_silence_ms=400, edge_silence_ms=100, silence_thresh=-45.0, window_ms=10):
+    """
+    Cap every silence at max_silence_ms (edge_silence_ms at the start and end).
+    Silences are found with a windowed RMS over the whole buffer and shortened
+    from the middle so the natural decay and attack around speech are kept.
+    Returns (compacted PCMAudio, removed intervals in seconds of the original audio).
+    """
+    levels, window = window_rms_db(pcm.samples, pcm.frame_rate, window_ms)
+    if len(levels) == 0:
+        return pcm, []
+
+    starts, ends = _silent_runs(levels <= silence_thresh)
+    keep = np.ones(len(levels), dtype=bool)
+    removed = []
+    for start, end in zip(starts, ends):
+        at_edge = start == 0 or end == len(levels)
+        allowed = max(int((edge_silence_ms if at_edge else max_silence_ms) / window_ms), 0)
+        excess = (end - start) - allowed
+        if excess <= 0:
+            continue
+        if start == 0:
+            cut_start = start
+        elif end == len(levels):
+            cut_start = end - excess
+        else:
+            cut_start = start + allowed // 2
+        keep[cut_start:cut_start + excess] = False
+        removed.append((cut_start * window / pcm.frame_rate,
+                        (cut_start + excess) * window / pcm.frame_rate))
+
+    if not removed:
+        return pcm, []
+
+    sample_mask = np.repeat(keep, window)
+    tail = len(pcm.samples) - len(sample_mask)
+    if tail:
+        sample_mask = np.concatenate((sample_mask, np.full(tail, keep[-1])))
+    return PCMAudio(pcm.samples[sample_mask], pcm.frame_rate), removed
+
+
+def normalize_loudness(pcm, target_dbfs=-16.0, peak_ceiling_dbfs=-1.0, silence_thresh=-45.0, window_ms=10):
+    """
+    Scale the buffer so the RMS of its speech (non-silent windows) hits target_dbfs,
+    limited so the peak stays under peak_ceiling_dbfs. Returns (PCMAudio, gain in dB).
+    """
+    levels, window = window_rms_db(pcm.samples, pcm.frame_rate, window_ms)
+    voiced = levels[levels > silence_thresh]
+    peak = float(np.max(np.abs(pcm.samples))) if len(pcm.samples) else 0.0
+    if len(voiced) == 0 or peak == 0.0:
+        return pcm, 0.0
+
+    # Mean power of voiced windows, back to dB
+    speech_dbfs = 10 * np.log10(np.mean(10 ** (voiced / 10)))
+    gain_db = target_dbfs - speech_dbfs
+    gain_db = min(gain_db, peak_ceiling_dbfs - 20 * np.log10(peak))
+    gain = np.float32(10 ** (gain_db / 20))
+    return PCMAudio(pcm.samples * gain, pcm.frame_rate), float(gain_db)
+
+
+def encode_rendition(source_path, output_path, codec, bitrate):
+    """Encode one delivery rendition of source_path with ffmpeg ('copy' stream-copies)."""
+    cmd = [ffmpeg_binary(), "-y", "-loglevel", "error", "-i", source_path, "-vn"]
+    if codec == "copy":
+        cmd += ["-c:a", "copy"]
+    else:
+        cmd += ["-c:a", codec, "-b:a", bitrate]
+    subprocess.run(cmd + [output_path], check=True, capture_output=True)
+    return output_path
+
+
+def encode_renditions(source_path, renditions, output_dir, max_workers=3):
+    """
+    Encode several renditions of an audio file concurrently and write a manifest.
+    Each encode runs in its own ffmpeg process, so a thread pool is enough to
+    use several cores. Returns the manifest dict (also saved as manifest.json).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(source_path))[0]
+
+    def encode(item):
+        name, spec = item
+        output_path = os.path.join(output_dir, f"{stem}_{name}.{spec['extension']}")
+        try:
+            encode_rendition(source_path, output_path, spec["codec"], spec["bitrate"])
+        except subprocess.CalledProcessError as e:
+            log.warning("Failed to encode %s rendition: %s", name, e.stderr.decode(errors='ignore').strip())
+            return None
+        return {
+            "name": name,
+            "path": output_path,
+            "codec": spec["codec"],
+            "bitrate": spec["bitrate"],
+            "mime_type": spec["mime_type"],
+            "bytes": os.path.getsize(output_path),
+        }
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        entries = [entry for entry in pool.map(encode, renditions.items()) if entry]
+
+    manifest = {
+        "source": source_path,
+        "source_bytes": os.path.getsize(source_path),
+        "renditions": entries,
+    }
+    manifest_path = os.path.join(output_dir, "manifest.json")
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    manifest["manifest_path"] = manifest_path
+
+    for entry in entries:
+        log.info("  %s: %.0f KB (%s)", entry['name'], entry['bytes'] / 1024, entry['mime_type'])
+    return manifest
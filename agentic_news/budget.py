@@ -0,0 +1,143 @@
+import os
+import re
+import json
+import math
+import threading
+
+from .config import SPEECH_RATE_PATH
+from .utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# Typical narration pace before we have observed a voice
+DEFAULT_WORDS_PER_SECOND = 2.5
+
+# Words spent on "Here are your news highlights" / "That's your update"
+FIXED_PHRASE_WORDS = 8
+
+# Summaries are 20-30 words and the script uses roughly one sentence per item
+WORDS_PER_ARTICLE = 28
+
+
+def word_count(text):
+    return len(text.split()) if text else 0
+
+
+class SpeechRateModel:
+    """Per-voice words-per-second estimates learned from past TTS outputs."""
+
+    def __init__(self, path=SPEECH_RATE_PATH, smoothing=0.3):
+        self.path = path
+        self.smoothing = smoothing
+        self.rates = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                self.rates = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            log.warning("Could not load speech rates from %s: %s", self.path, e)
+            self.rates = {}
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.rates, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            log.warning("Could not save speech rates to %s: %s", self.path, e)
+
+    def words_per_second(self, voice_id):
+        entry = self.rates.get(voice_id)
+        return entry["wps"] if entry else DEFAULT_WORDS_PER_SECOND
+
+    def observe(self, voice_id, words, duration_seconds):
+        """Fold one (words, seconds) measurement into the voice's running estimate."""
+        if not voice_id or words <= 0 or duration_seconds <= 0:
+            return
+        observed = words / duration_seconds
+        with self._lock:
+            entry = self.rates.get(voice_id)
+            if entry:
+                wps = (1 - self.smoothing) * entry["wps"] + self.smoothing * observed
+                self.rates[voice_id] = {"wps": wps, "samples": entry["samples"] + 1}
+            else:
+                self.rates[voice_id] = {"wps": observed, "samples": 1}
+            self._save()
+        log.info("Speech rate for %s: %.2f words/s (observed %.2f)", voice_id, self.rates[voice_id]['wps'], observed)
+
+    def estimate_duration(self, text, voice_id):
+        return word_count(text) / self.words_per_second(voice_id)
+
+
+def select_articles(summarized_results, max_articles):
+    """Pick up to max_articles, round-robin across categories so every topic keeps coverage."""
+    if max_articles is None:
+        return summarized_results
+
+    picked = [[] for _ in summarized_results]
+    remaining = max_articles
+    depth = 0
+    while remaining > 0:
+        added = False
+        for i, category in enumerate(summarized_results):
+            if remaining <= 0:
+                break
+            if depth < len(category["articles"]):
+                picked[i].append(category["articles"][depth])
+                remaining -= 1
+                added = True
+        if not added:
+            break
+        depth += 1
+
+    return [
+        {**category, "articles": articles}
+        for category, articles in zip(summarized_results, picked)
+        if articles
+    ]
+
+
+def plan_budget(summarized_results, target_seconds, words_per_second):
+    """Work out how many articles and script words fit into target_seconds of audio."""
+    max_words = int(target_seconds * words_per_second)
+    available = max(max_words - FIXED_PHRASE_WORDS, 0)
+    max_articles = max(1, math.floor(available / WORDS_PER_ARTICLE))
+    selected = select_articles(summarized_results, max_articles)
+    return {
+        "target_seconds": target_seconds,
+        "words_per_second": words_per_second,
+        "max_words": max_words,
+        "max_articles": max_articles,
+        "summaries": selected,
+    }
+
+
+def trim_script(script, max_words, outro="That's your update."):
+    """Drop trailing body sentences until the script fits max_words, keeping the outro."""
+    if not max_words or word_count(script) <= max_words:
+        return script
+
+    sentences = re.split(r'(?<=[.!?])\s+', script.strip())
+    has_outro = bool(sentences) and sentences[-1].lower().startswith("that's your update")
+    body = sentences[:-1] if has_outro else sentences
+    closing = sentences[-1] if has_outro else outro
+
+    budget = max_words - word_count(closing)
+    kept = []
+    used = 0
+    for sentence in body:
+        wc = word_count(sentence)
+        if kept and used + wc > budget:
+            break
+        kept.append(sentence)
+        used += wc
+
+    return " ".join(kept + [closing])
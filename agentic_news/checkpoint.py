@@ -0,0 +1,112 @@
+import os
+import json
+import time
+import uuid
+import shutil
+import threading
+from datetime import datetime
+
+from .config import RUNS_DIR
+from .publisher import file_sha256
+from .utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# Side effects of stages that later stages read from the run's state
+CHECKPOINT_STATE_KEYS = [
+    "summaries", "budget", "alignment", "alignment_audio_path",
+    "thumbnail", "audio_postprocess", "audio_renditions", "output_dir",
+    "degradations",
+]
+
+
+def new_run_id():
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+class RunCheckpoint:
+    """
+    Per-run directory (RUNS_DIR/<run_id>) holding each completed stage's output.
+    manifest.json records every stage's output, the state it left behind and
+    the sha256 of the files it produced, which are copied into artifacts/.
+    On resume, a stage counts as done only if its inputs are done and its
+    files can be restored byte-for-byte.
+    """
+
+    def __init__(self, run_id=None, root=RUNS_DIR):
+        self.run_id = run_id or new_run_id()
+        self.directory = os.path.join(root, self.run_id)
+        self.artifacts_dir = os.path.join(self.directory, "artifacts")
+        self.manifest_path = os.path.join(self.directory, "manifest.json")
+        self._lock = threading.Lock()
+        os.makedirs(self.artifacts_dir, exist_ok=True)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {"run_id": self.run_id, "created": time.time(), "stages": {}}
+
+    def _write_manifest(self):
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=2, default=str)
+        os.replace(tmp_path, self.manifest_path)
+
+    def save_stage(self, name, output, state, seconds=0.0):
+        """Record a completed stage, copying the files it produced into the run directory."""
+        snapshot = {k: state[k] for k in CHECKPOINT_STATE_KEYS if state.get(k) is not None}
+        candidates = [output] + list(snapshot.values())
+        files = {}
+        for path in candidates:
+            if not isinstance(path, str) or path in files or not os.path.isfile(path):
+                continue
+            digest = file_sha256(path)
+            copy_name = f"{digest[:16]}_{os.path.basename(path)}"
+            copy_path = os.path.join(self.artifacts_dir, copy_name)
+            if not os.path.exists(copy_path):
+                shutil.copyfile(path, copy_path)
+            files[path] = {"sha256": digest, "checkpoint": copy_name}
+
+        with self._lock:
+            self.manifest["stages"][name] = {
+                "output": output,
+                "state": snapshot,
+                "files": files,
+                "seconds": seconds,
+                "completed_at": time.time(),
+            }
+            self._write_manifest()
+        log.debug("Checkpointed %s to %s", name, self.directory)
+
+    def _restore_files(self, files):
+        for path, entry in files.items():
+            if os.path.isfile(path) and file_sha256(path) == entry["sha256"]:
+                continue
+            copy_path = os.path.join(self.artifacts_dir, entry["checkpoint"])
+            if not os.path.isfile(copy_path) or file_sha256(copy_path) != entry["sha256"]:
+                return False
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            shutil.copyfile(copy_path, path)
+        return True
+
+    def restore(self, stages):
+        """
+        Outputs and state of stages that can be skipped on resume.
+        stages maps stage names to Stage objects, in execution order.
+        Returns ({stage name: output}, state).
+        """
+        outputs, state = {}, {}
+        recorded = self.manifest.get("stages", {})
+        for name, stage in stages.items():
+            entry = recorded.get(name)
+            if not entry or any(dep not in outputs for dep in stage.requires):
+                continue
+            if not self._restore_files(entry.get("files", {})):
+                log.warning("Checkpoint for %s has missing or modified files, it will run again", name)
+                continue
+            outputs[name] = entry["output"]
+            state.update(entry.get("state", {}))
+        return outputs, state
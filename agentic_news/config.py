@@ -9,15 +9,111 @@ EXA_API_KEY = os.getenv('EXA_API_KEY')
 ELEVENLABS_API_KEY = os.getenv('ELEVENLABS_API_KEY')
 MISTRAL_API_KEY = os.getenv('MISTRAL_API_KEY')
 
-# Print loaded keys for debugging (first few characters only)
-print(f"Loaded EXA_API_KEY: {EXA_API_KEY[:5]}..." if EXA_API_KEY else "EXA_API_KEY not found")
-print(f"Loaded ELEVENLABS_API_KEY: {ELEVENLABS_API_KEY[:5]}..." if ELEVENLABS_API_KEY else "ELEVENLABS_API_KEY not found")
-print(f"Loaded MISTRAL_API_KEY: {MISTRAL_API_KEY[:5]}..." if MISTRAL_API_KEY else "MISTRAL_API_KEY not found")
+# How NewsAgent.run drives the tools: pipeline (fixed stage graph, no planner calls)
+# or agentic (the LLM picks each next step)
+AGENT_MODE = os.getenv('AGENT_MODE', 'pipeline')
+AGENT_MAX_TURNS = int(os.getenv('AGENT_MAX_TURNS', '8'))  # planner calls per agentic run
+# Stream planner replies and start each tool call as soon as it has been generated
+AGENT_STREAM_TOOL_CALLS = os.getenv('AGENT_STREAM_TOOL_CALLS', 'true').lower() == 'true'
+
+# Per-run checkpoint directories (manifest.json + stage artifacts), used by NewsAgent.resume
+RUNS_DIR = os.getenv('RUNS_DIR', 'runs')
+
+# Each run writes its audio, video and scratch images to RUN_OUTPUT_DIR/<run_id>
+RUN_OUTPUT_DIR = os.getenv('RUN_OUTPUT_DIR', 'output')
+
+# Briefing jobs: SQLite queue, worker processes (default one per core), per-job output files.
+# JOB_EMBEDDED_WORKERS=false when workers run separately (python -m agentic_news.jobs)
+JOB_DB_PATH = os.getenv('JOB_DB_PATH', 'jobs.sqlite3')
+JOB_WORKERS = int(os.getenv('JOB_WORKERS') or os.cpu_count() or 1)
+JOB_POLL_SECONDS = float(os.getenv('JOB_POLL_SECONDS', '1'))
+JOB_OUTPUT_DIR = os.getenv('JOB_OUTPUT_DIR', 'output/jobs')
+JOB_EMBEDDED_WORKERS = os.getenv('JOB_EMBEDDED_WORKERS', 'true').lower() == 'true'
+# How often the pool restarts dead workers and requeues their jobs, and how long a client waits for a job
+JOB_SUPERVISE_SECONDS = float(os.getenv('JOB_SUPERVISE_SECONDS', '5'))
+JOB_WAIT_TIMEOUT_SECONDS = float(os.getenv('JOB_WAIT_TIMEOUT_SECONDS', '1800'))
+
+# Logging: default level, per-module overrides ("agentic_news.agent=DEBUG,agentic_news.audio=WARNING"),
+# console format (text or json) and an optional .jsonl / .html log file
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_LEVELS = os.getenv('LOG_LEVELS', '')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')
+LOG_FILE = os.getenv('LOG_FILE', '')
+
+# Tracing: '' (off), jsonl (spans appended to TRACE_PATH) or otlp (OTLP/HTTP JSON to OTLP_ENDPOINT)
+TRACE_EXPORT = os.getenv('TRACE_EXPORT', '')
+TRACE_PATH = os.getenv('TRACE_PATH', 'traces.jsonl')
+OTLP_ENDPOINT = os.getenv('OTLP_ENDPOINT', 'http://localhost:4318/v1/traces')
+
+# Artifact storage: gcs, or local (a directory standing in for the bucket, for offline runs)
+STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'gcs')
+LOCAL_STORAGE_DIR = os.getenv('LOCAL_STORAGE_DIR', 'local_storage')
+LOCAL_STORAGE_BASE_URL = os.getenv('LOCAL_STORAGE_BASE_URL')  # e.g. http://localhost:8000, else file:// URLs
 
 # Cloud Storage
 GCS_BUCKET_NAME = os.getenv('GCS_BUCKET_NAME', 'aimakers-workspace')
+PUBLISH_MAX_WORKERS = int(os.getenv('PUBLISH_MAX_WORKERS', '4'))
+PARALLEL_UPLOAD_THRESHOLD = int(os.getenv('PARALLEL_UPLOAD_THRESHOLD', str(32 * 1024 * 1024)))
+SIGNED_URL_TTL_SECONDS = int(os.getenv('SIGNED_URL_TTL_SECONDS', '3600'))
 ELEVENLABS_BASE_URL = "https://api.elevenlabs.io/v1"
 
+# Shared HTTP client
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '60'))
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', '20'))
+
+# Briefing length budget (0 = no target, length is whatever the LLM produces)
+TARGET_DURATION_SECONDS = int(os.getenv('TARGET_DURATION_SECONDS', '0'))
+SPEECH_RATE_PATH = os.getenv('SPEECH_RATE_PATH', 'speech_rates.json')
+
+# Chunked TTS synthesis
+TTS_CHUNK_CHARS = int(os.getenv('TTS_CHUNK_CHARS', '800'))
+TTS_MAX_WORKERS = int(os.getenv('TTS_MAX_WORKERS', '3'))
+
+# TTS engine selection: elevenlabs, espeak (offline) or auto (ElevenLabs with espeak-ng fallback)
+TTS_ENGINE = os.getenv('TTS_ENGINE', 'auto')
+TTS_LATENCY_BUDGET = float(os.getenv('TTS_LATENCY_BUDGET', '20'))  # seconds per TTS_CHUNK_CHARS of text
+TTS_ERROR_BUDGET = int(os.getenv('TTS_ERROR_BUDGET', '2'))
+TTS_FALLBACK_COOLDOWN = float(os.getenv('TTS_FALLBACK_COOLDOWN', '120'))
+ESPEAK_VOICE = os.getenv('ESPEAK_VOICE', 'en-us')
+ESPEAK_WORDS_PER_MINUTE = int(os.getenv('ESPEAK_WORDS_PER_MINUTE', '165'))
+
+# Extra audio renditions for delivery (web, mobile, podcast feeds).
+# The narration is already a 128 kbps MP3, so that rendition is a stream copy.
+AUDIO_RENDITIONS = {
+    "opus_32k": {"codec": "libopus", "bitrate": "32k", "extension": "opus", "mime_type": "audio/ogg"},
+    "aac_64k": {"codec": "aac", "bitrate": "64k", "extension": "m4a", "mime_type": "audio/mp4"},
+    "mp3_128k": {"codec": "copy", "bitrate": "128k", "extension": "mp3", "mime_type": "audio/mpeg"},
+}
+AUDIO_RENDITION_WORKERS = int(os.getenv('AUDIO_RENDITION_WORKERS', '3'))
+
+# Deadlines: every run gets RUN_DEADLINE_SECONDS (0 = none, preferences may set deadline_seconds),
+# split into per-stage budgets; LLM calls without a deadline still time out after LLM_TIMEOUT_SECONDS
+RUN_DEADLINE_SECONDS = float(os.getenv('RUN_DEADLINE_SECONDS', '600'))
+LLM_TIMEOUT_SECONDS = float(os.getenv('LLM_TIMEOUT_SECONDS', '60'))
+# Rough costs used to decide when to degrade: seconds per summarized article, seconds of TTS per
+# second of audio, and the shortest briefing worth producing
+DEADLINE_ARTICLE_SECONDS = float(os.getenv('DEADLINE_ARTICLE_SECONDS', '4'))
+DEADLINE_TTS_FACTOR = float(os.getenv('DEADLINE_TTS_FACTOR', '0.3'))
+DEADLINE_MIN_BRIEFING_SECONDS = float(os.getenv('DEADLINE_MIN_BRIEFING_SECONDS', '30'))
+
+# Video quality tiers, best first; render_factor is the expected generate_video time (images and
+# rendering) per second of audio. Runs short on time drop to a faster tier, or to audio only
+VIDEO_QUALITY_TIERS = {
+    "high": {"fps": 24, "preset": "medium", "bitrate": "3000k", "render_factor": 1.0},
+    "fast": {"fps": 24, "preset": "veryfast", "bitrate": "2000k", "render_factor": 0.5},
+    "draft": {"fps": 15, "preset": "ultrafast", "bitrate": "1200k", "render_factor": 0.25},
+}
+
+# TTS audio cache (set TTS_CACHE_DIR to an empty string to disable). On by default: with it,
+# text_to_speech always synthesizes per sentence so sentences are reused across briefings, and the
+# single-request path that writes the provider MP3 untouched is only taken with use_cache=False.
+TTS_CACHE_DIR = os.getenv('TTS_CACHE_DIR', '.tts_cache')
+TTS_CACHE_MAX_BYTES = int(os.getenv('TTS_CACHE_MAX_BYTES', str(500 * 1024 * 1024)))
+# Pre-render the fixed intro/outro phrases for every app voice when the Streamlit app starts
+# (one paid request per voice and phrase not yet cached)
+TTS_PRERENDER_PHRASES = os.getenv('TTS_PRERENDER_PHRASES', 'true').lower() == 'true'
+
 # Function definitions for the agent
 FUNCTION_DEFINITIONS = {
     "get_preferences": {
@@ -27,15 +123,15 @@ FUNCTION_DEFINITIONS = {
     "fetch_and_summarize": {
         "description": "Fetch news articles using user preferences and generate summaries in one pass.",
         "params": {
-            "preferences": "User preferences dictionary",
+            "preferences": "User preferences dictionary, or the handle of the get_preferences result",
             "model": "Optional: LLM model to use for generation (default: mistral/mistral-small-latest)"
         }
     },
     "generate_news_script": {
         "description": "Create a natural, conversational news brief from summarized articles.",
         "params": {
-            "summarized_results": "List of categories with summarized articles",
-            "preferences": "User preferences dictionary",
+            "summarized_results": "Handle of the fetch_and_summarize result (e.g. @r2)",
+            "preferences": "User preferences dictionary (may include target_duration in seconds)",
             "model": "Optional: LLM model to use (default: mistral/mistral-small-latest)",
             "temperature": "Optional: Temperature for generation (default: 0.7)"
         }
@@ -43,14 +139,17 @@ FUNCTION_DEFINITIONS = {
     "text_to_speech": {
         "description": "Convert news script to speech and generate audio.",
         "params": {
-            "user_text": "News script to convert to audio",
-            "voice_id": "Voice ID for TTS"
+            "user_text": "News script to convert to audio, or the handle of the generate_news_script result",
+            "voice_id": "Voice ID for TTS",
+            "chunked": "Optional: synthesize sentence chunks in parallel (default: false)",
+            "stream": "Optional: stream audio to disk as it is synthesized (default: false)",
+            "renditions": "Optional: list of extra audio formats to encode, e.g. [\"opus_32k\", \"aac_64k\"]"
         }
     },
     "upload_audio": {
         "description": "Upload the audio file to Google Cloud Storage and return a GCS URL.",
         "params": {
-            "audio_file_path": "Path to the MP3 file to upload"
+            "audio_file_path": "Path to the MP3 file to upload, or the handle of the text_to_speech result"
         }
     }
 } 
\ No newline at end of file
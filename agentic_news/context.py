@@ -0,0 +1,65 @@
+import os
+import threading
+
+from .config import RUN_OUTPUT_DIR
+from .checkpoint import new_run_id
+from .handles import ResultStore
+from .utils.logger import get_logger
+
+log = get_logger(__name__)
+
+
+class RunContext:
+    """
+    Everything that belongs to one briefing run: its state (stage outputs,
+    summaries, alignment, thumbnail, ...), where its artifacts are written,
+    its pending uploads, its Deadline (set when the run starts) and, for
+    agentic runs, the planner history and result handles. One NewsAgent
+    (clients, caches, learned speech rates) can serve many runs at once;
+    each run passes its own context to the tools.
+    """
+
+    def __init__(self, run_id=None, output_dir=None, state=None, deadline=None):
+        self.run_id = run_id or new_run_id()
+        self.output_dir = output_dir or os.path.join(RUN_OUTPUT_DIR, self.run_id)
+        self.state = dict(state or {})
+        self.state["run_id"] = self.run_id
+        self.state["output_dir"] = self.output_dir
+        self.deadline = deadline
+        self.uploads = {}  # path -> Future of a background upload
+        self.messages = []  # planner history (agentic runs)
+        self.results = ResultStore()  # tool results by handle (agentic runs)
+        self.lock = threading.Lock()  # guards uploads and degradations; stages may run concurrently
+
+    def path(self, name):
+        """Path for an artifact of this run, creating the run's output directory."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        return os.path.join(self.output_dir, name)
+
+    @property
+    def audio_path(self):
+        return self.path("speech.mp3")
+
+    @property
+    def video_path(self):
+        return self.path("news_video.mp4")
+
+    @property
+    def image_dir(self):
+        """Scratch directory for the article images fetched while rendering the video."""
+        path = self.path("images")
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def degrade(self, stage, kind, detail):
+        """Record that stage cut quality to stay within the deadline (listed in state['degradations'])."""
+        log.warning("Degraded %s: %s (%s)", stage, kind, detail)
+        with self.lock:
+            self.state.setdefault("degradations", []).append({"stage": stage, "kind": kind, "detail": detail})
+
+    @property
+    def degradations(self):
+        return list(self.state.get("degradations", []))
+
+    def __repr__(self):
+        return f"RunContext({self.run_id!r}, output_dir={self.output_dir!r})"
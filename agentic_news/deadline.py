@@ -0,0 +1,82 @@
+import math
+import time
+import contextvars
+from contextlib import contextmanager
+
+_current_deadline = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """No time is left in the run (or stage) budget for another upstream call."""
+
+
+class Deadline:
+    """
+    The time by which a run, or one stage of it, has to finish.
+    Deadline(None) or Deadline(0) never expires. budget() carves a shorter
+    deadline out of this one for a stage; timeout() turns the remaining
+    time into a timeout for an upstream call.
+    """
+
+    def __init__(self, seconds=None):
+        self.seconds = seconds or None
+        self.expires_at = time.monotonic() + seconds if seconds else None
+
+    def remaining(self):
+        """Seconds left; math.inf for an unlimited deadline."""
+        if self.expires_at is None:
+            return math.inf
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    def budget(self, seconds):
+        """A deadline seconds from now, but never later than this one."""
+        child = Deadline()
+        child.seconds = seconds
+        expires_at = time.monotonic() + seconds
+        child.expires_at = expires_at if self.expires_at is None else min(expires_at, self.expires_at)
+        return child
+
+    def timeout(self, default):
+        """
+        default (seconds, or a requests-style (connect, read) tuple) capped at
+        the remaining time. Raises DeadlineExceeded if there is none left.
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded("Deadline exceeded before the call could start")
+        if isinstance(default, tuple):
+            return tuple(min(t, remaining) if t else remaining for t in default)
+        return min(default, remaining) if default else remaining
+
+    def __repr__(self):
+        return f"Deadline(remaining={self.remaining():.1f}s)"
+
+
+def current_deadline():
+    """The deadline of the stage or run executing in this context, or None."""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline):
+    """Make deadline current for calls in this block (and propagate()d thread pools)."""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def call_timeout(default):
+    """Timeout for an upstream call: default, cut short by the current deadline if there is one."""
+    deadline = _current_deadline.get()
+    return default if deadline is None else deadline.timeout(default)
+
+
+def remaining_seconds():
+    deadline = _current_deadline.get()
+    return math.inf if deadline is None else deadline.remaining()
@@ -0,0 +1,62 @@
+import threading
+
+HANDLE_PREFIX = "@"
+
+
+class ResultStore:
+    """
+    Tool results kept in memory under short handles ("@r1", "@r2", ...).
+    The planner sees a compact digest of each result and passes the handle
+    back as an argument; call_function swaps it for the stored object, so
+    large results (summaries, scripts) never round-trip through the prompt
+    or through JSON.
+    """
+
+    def __init__(self):
+        self._values = {}
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def put(self, value):
+        with self._lock:
+            self._count += 1
+            handle = f"{HANDLE_PREFIX}r{self._count}"
+            self._values[handle] = value
+        return handle
+
+    def get(self, handle):
+        return self._values[handle]
+
+    def __contains__(self, handle):
+        return isinstance(handle, str) and handle in self._values
+
+    def resolve(self, value):
+        """Replace handles in an argument value (top level, or inside a list/dict) with stored objects."""
+        if value in self:
+            return self._values[value]
+        if isinstance(value, list):
+            return [self.resolve(v) for v in value]
+        if isinstance(value, dict):
+            return {k: self.resolve(v) for k, v in value.items()}
+        return value
+
+
+def digest(value, max_chars=120):
+    """Short description of a tool result for the planner's history."""
+    if value is None:
+        return "null (the step failed)"
+    if isinstance(value, str):
+        if len(value) <= max_chars:
+            return value
+        return f"text, {len(value.split())} words: {value[:max_chars]}..."
+    if isinstance(value, list):
+        if value and all(isinstance(v, dict) and "articles" in v for v in value):
+            articles = sum(len(v["articles"]) for v in value)
+            titles = ", ".join(v.get("title", "?") for v in value)
+            return f"{articles} summarized articles in {len(value)} categories ({titles})"
+        return f"list of {len(value)} items"
+    if isinstance(value, dict):
+        if len(str(value)) <= max_chars:
+            return str(value)
+        return f"object with keys {', '.join(map(str, value))}"
+    return str(value)[:max_chars]
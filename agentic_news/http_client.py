@@ -0,0 +1,106 @@
+import time
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_POOL_MAXSIZE
+from .deadline import call_timeout
+from .utils.tracing import span
+
+
+class HTTPClient:
+    """
+    Shared, thread-safe HTTP client for every outbound call.
+    One requests.Session keeps a keep-alive connection pool per host
+    (urllib3 pools are thread-safe), every request gets default connect
+    and read timeouts, and per-host counters are kept for diagnostics.
+    """
+
+    def __init__(self,
+                 connect_timeout: float = HTTP_CONNECT_TIMEOUT,
+                 read_timeout: float = HTTP_READ_TIMEOUT,
+                 pool_maxsize: int = HTTP_POOL_MAXSIZE):
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _record(self, host, elapsed, status=None, num_bytes=0, error=False):
+        with self._lock:
+            m = self._metrics.setdefault(host, {
+                "requests": 0,
+                "errors": 0,
+                "bytes": 0,
+                "total_seconds": 0.0,
+                "max_seconds": 0.0,
+                "status_codes": {},
+            })
+            m["requests"] += 1
+            m["total_seconds"] += elapsed
+            m["max_seconds"] = max(m["max_seconds"], elapsed)
+            m["bytes"] += num_bytes
+            if error or (status is not None and status >= 400):
+                m["errors"] += 1
+            if status is not None:
+                m["status_codes"][status] = m["status_codes"].get(status, 0) + 1
+
+    def request(self, method, url, timeout=None, **kwargs):
+        """
+        Send a request through the shared session. timeout defaults to
+        (connect, read) and is cut to the time left on the current deadline.
+        """
+        host = urlparse(url).netloc
+        timeout = call_timeout(timeout or self.timeout)
+        start = time.perf_counter()
+        with span("http.request", method=method, host=host) as s:
+            try:
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except requests.RequestException:
+                self._record(host, time.perf_counter() - start, error=True)
+                raise
+
+            if kwargs.get("stream"):
+                num_bytes = int(response.headers.get("Content-Length", 0) or 0)
+            else:
+                num_bytes = len(response.content)
+            self._record(host, time.perf_counter() - start, response.status_code, num_bytes)
+            s.set("status", response.status_code)
+            s.set("bytes", num_bytes)
+            return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def host_metrics(self):
+        """Snapshot of per-host request counts, errors, bytes and latency."""
+        with self._lock:
+            snapshot = {}
+            for host, m in self._metrics.items():
+                snapshot[host] = {
+                    **m,
+                    "status_codes": dict(m["status_codes"]),
+                    "avg_seconds": m["total_seconds"] / m["requests"] if m["requests"] else 0.0,
+                }
+            return snapshot
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Return the process-wide HTTPClient, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HTTPClient()
+    return _client
@@ -0,0 +1,402 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import argparse
+import threading
+import multiprocessing
+from contextlib import contextmanager
+
+from .config import JOB_DB_PATH, JOB_WORKERS, JOB_POLL_SECONDS, JOB_OUTPUT_DIR, JOB_SUPERVISE_SECONDS
+from .checkpoint import new_run_id
+from .context import RunContext
+from .utils.logger import get_logger, set_run_id
+from .utils.tracing import span, tracer
+
+log = get_logger(__name__)
+
+MAX_ATTEMPTS = 3  # a job whose worker died is retried (resuming from checkpoints) this many times
+
+# Progress (percent) reached when each pipeline stage finishes, and what the UI shows while it runs
+STAGE_PROGRESS = {
+    "get_preferences": 5,
+    "fetch_and_summarize": 40,
+    "generate_news_script": 60,
+    "text_to_speech": 80,
+    "upload_audio": 85,
+    "generate_video": 100,
+}
+STAGE_MESSAGES = {
+    "fetch_and_summarize": "Fetching relevant articles... (Powered by Exa)",
+    "generate_news_script": "Composing your news script... (Powered by Mistral AI)",
+    "text_to_speech": "Recording voice narration... (Powered by ElevenLabs)",
+    "upload_audio": "Publishing your narration...",
+    "generate_video": "Finalizing your news video... (Powered by MoviePy)",
+}
+NO_ARTICLES = "No articles found. Try more general topics or a broader date range."
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    preferences TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    stage TEXT,
+    message TEXT,
+    result TEXT,
+    error TEXT,
+    worker TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created);
+"""
+
+
+class JobStore:
+    """
+    Briefing jobs in a SQLite database shared by the clients that submit and
+    poll them and the worker processes that run them.
+    A job goes queued -> running -> done | failed.
+    """
+
+    def __init__(self, path=JOB_DB_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")  # readers never block the writer
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _to_dict(row):
+        job = dict(row)
+        job["preferences"] = json.loads(job["preferences"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def submit(self, preferences):
+        """Queue a briefing for preferences. Returns the job ID (also the pipeline run ID)."""
+        job_id = new_run_id()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, preferences, message, created) VALUES (?, 'queued', ?, ?, ?)",
+                (job_id, json.dumps(preferences), "Waiting for a worker...", time.time()),
+            )
+        return job_id
+
+    def get(self, job_id):
+        """The job as a dict (status, progress, stage, message, result, error, ...), or None."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        finally:
+            conn.close()
+        return self._to_dict(row) if row else None
+
+    def list(self, status=None, limit=50):
+        conn = self._connect()
+        try:
+            if status:
+                rows = conn.execute("SELECT * FROM jobs WHERE status = ? ORDER BY created DESC LIMIT ?",
+                                    (status, limit)).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM jobs ORDER BY created DESC LIMIT ?", (limit,)).fetchall()
+        finally:
+            conn.close()
+        return [self._to_dict(row) for row in rows]
+
+    def claim(self, worker):
+        """Atomically take the oldest queued job for worker. Returns it, or None if the queue is empty."""
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY created LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, "
+                "started = ?, message = 'Starting your personalized news briefing...' WHERE id = ?",
+                (worker, time.time(), row["id"]),
+            )
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+        return self._to_dict(row)
+
+    def update(self, job_id, **fields):
+        """Set progress, stage, message and/or (partial) result of a running job."""
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"], default=str)
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._transaction() as conn:
+            conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    def finish(self, job_id, result):
+        self.update(job_id, status="done", progress=100, stage=None, message="Your personalized briefing is ready!",
+                    result=result, finished=time.time())
+
+    def fail(self, job_id, error, result=None):
+        fields = {"status": "failed", "error": error, "message": error, "finished": time.time()}
+        if result is not None:
+            fields["result"] = result
+        self.update(job_id, **fields)
+
+    def requeue_abandoned(self, host=None):
+        """
+        Put running jobs back in the queue if their worker process (on this
+        host) no longer exists; jobs out of attempts fail instead.
+        Returns the number of jobs requeued.
+        """
+        host = host or socket.gethostname()
+        requeued = 0
+        with self._transaction() as conn:
+            for row in conn.execute("SELECT id, worker, attempts FROM jobs WHERE status = 'running'").fetchall():
+                worker_host, _, pid = (row["worker"] or "").rpartition(":")
+                if worker_host != host or _pid_alive(pid):
+                    continue
+                if row["attempts"] >= MAX_ATTEMPTS:
+                    conn.execute("UPDATE jobs SET status = 'failed', error = ?, message = ?, finished = ? "
+                                 "WHERE id = ?", ("Worker died", "Worker died", time.time(), row["id"]))
+                else:
+                    conn.execute("UPDATE jobs SET status = 'queued', message = 'Waiting for a worker...' "
+                                 "WHERE id = ?", (row["id"],))
+                    requeued += 1
+        return requeued
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(int(pid), 0)
+    except (ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def job_result(context):
+    """What a client needs from a finished (or partly finished) run: artifacts, script, share URLs."""
+    state = context.state
+    published = state.get("published") or {}
+    audio_path, video_path = state.get("text_to_speech"), state.get("generate_video")
+    thumbnail = state.get("thumbnail")
+
+    def share_url(path):
+        return (published.get(path) or {}).get("url") if path else None
+
+    return {
+        "run_id": context.run_id,
+        "summaries": state.get("fetch_and_summarize") or state.get("summaries"),
+        "script": state.get("generate_news_script"),
+        "audio_path": audio_path,
+        "video_path": video_path,
+        "thumbnail": thumbnail,
+        "audio_url": share_url(audio_path),
+        "video_url": share_url(video_path),
+        "thumbnail_url": share_url(thumbnail),
+        "pipeline": state.get("pipeline"),
+        "degradations": state.get("degradations") or [],
+    }
+
+
+def run_job(agent, store, job):
+    """Run one claimed job on agent, reporting progress to store as stages start and finish."""
+    job_id = job["id"]
+    context = RunContext(job_id, output_dir=os.path.join(JOB_OUTPUT_DIR, job_id))
+    set_run_id(job_id)
+    progress = {"value": job.get("progress") or 0}
+
+    def on_stage(name, status):
+        if status == "running":
+            store.update(job_id, stage=name, message=STAGE_MESSAGES.get(name, f"Running {name}..."))
+        elif status == "done":
+            progress["value"] = max(progress["value"], STAGE_PROGRESS.get(name, progress["value"]))
+            # Partial results let clients show the script and narration before the video is ready
+            store.update(job_id, progress=progress["value"], result=job_result(context))
+
+    log.info("Job %s: attempt %d", job_id, job["attempts"])
+    try:
+        with span("job", job_id=job_id, attempt=job["attempts"]):
+            if job["attempts"] > 1:
+                agent.resume(job_id, context=context, on_stage=on_stage)
+            else:
+                agent.run_pipeline(job["preferences"], context=context, on_stage=on_stage)
+    except Exception as e:
+        log.exception("Job %s failed", job_id)
+        store.fail(job_id, f"Something went wrong: {e}", job_result(context))
+        return
+    finally:
+        tracer.flush()
+
+    result = job_result(context)
+    report = result["pipeline"] or {}
+    # A briefing cut down to audio only to meet its deadline still counts as done
+    audio_only = any(d["kind"] == "audio_only" for d in result["degradations"])
+    if result["audio_path"] and (result["video_path"] or audio_only):
+        store.finish(job_id, result)
+        log.info("Job %s done", job_id)
+        return
+    failed = [name for name, entry in report.items() if entry.get("status") == "failed"]
+    error = NO_ARTICLES if "fetch_and_summarize" in failed else f"Briefing failed at {', '.join(failed) or 'an unknown stage'}"
+    store.fail(job_id, error, result)
+    log.warning("Job %s failed: %s", job_id, error)
+
+
+def _worker_main(db_path, poll_seconds, stop):
+    """Worker process loop: claim a job, run it, repeat until stop.value is set."""
+    store = JobStore(db_path)
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    agent = None
+    while not stop.value:
+        job = store.claim(worker)
+        if job is None:
+            time.sleep(poll_seconds)
+            continue
+        if agent is None:
+            # One agent per process: clients, caches and learned speech rates are reused across jobs
+            from .agent import NewsAgent
+            agent = NewsAgent(save_logs=False)
+        run_job(agent, store, job)
+
+
+class WorkerPool:
+    """
+    Worker processes that run queued jobs, one job per process at a time, so
+    video encoding uses every core instead of sharing one interpreter's GIL.
+    A supervisor thread restarts workers that die (e.g. an OOM-killed render)
+    and requeues their jobs every supervise_seconds.
+    """
+
+    def __init__(self, workers=JOB_WORKERS, db_path=JOB_DB_PATH, poll_seconds=JOB_POLL_SECONDS,
+                 supervise_seconds=JOB_SUPERVISE_SECONDS):
+        self.workers = max(1, workers)
+        self.db_path = db_path
+        self.poll_seconds = poll_seconds
+        self.supervise_seconds = supervise_seconds
+        # spawn, not fork: the parent may already run threads (Streamlit, upload pools)
+        self._context = multiprocessing.get_context("spawn")
+        # A plain shared flag, not an Event: a killed worker waiting on an Event's
+        # condition would leave it broken and make stop() hang
+        self._stop = self._context.RawValue("b", 0)
+        self._stopping = threading.Event()
+        self._processes = []
+        self._lock = threading.Lock()
+        self._supervisor = None
+
+    def _spawn(self, index):
+        process = self._context.Process(
+            target=_worker_main, args=(self.db_path, self.poll_seconds, self._stop),
+            name=f"job-worker-{index}", daemon=True,
+        )
+        process.start()
+        return process
+
+    def _requeue(self):
+        requeued = JobStore(self.db_path).requeue_abandoned()
+        if requeued:
+            log.info("Requeued %d job(s) from workers that exited", requeued)
+        return requeued
+
+    def start(self):
+        self._requeue()
+        with self._lock:
+            self._processes = [self._spawn(i) for i in range(self.workers)]
+        self._supervisor = threading.Thread(target=self._supervise, name="job-supervisor", daemon=True)
+        self._supervisor.start()
+        log.info("Started %d job worker(s) on %s", self.workers, self.db_path)
+        return self
+
+    def supervise(self):
+        """Restart dead workers, then requeue the jobs they were running."""
+        with self._lock:
+            for i, process in enumerate(self._processes):
+                # is_alive() also reaps the process, so requeue_abandoned no longer sees its PID
+                if self._stopping.is_set() or process.is_alive():
+                    continue
+                log.warning("Job worker %s exited with code %s; restarting it", process.name, process.exitcode)
+                self._processes[i] = self._spawn(i)
+        self._requeue()
+
+    def _supervise(self):
+        while not self._stopping.wait(self.supervise_seconds):
+            try:
+                self.supervise()
+            except Exception:
+                log.exception("Job worker supervision failed")
+
+    def alive(self):
+        with self._lock:
+            return sum(1 for p in self._processes if p.is_alive())
+
+    def stop(self, timeout=30):
+        """Let workers finish their current job, then terminate any that are still running."""
+        self._stop.value = 1
+        self._stopping.set()
+        if self._supervisor:
+            self._supervisor.join()
+        deadline = time.time() + timeout
+        with self._lock:
+            for process in self._processes:
+                process.join(max(0, deadline - time.time()))
+                if process.is_alive():
+                    process.terminate()
+            self._processes = []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SonicPress briefing jobs")
+    commands = parser.add_subparsers(dest="command", required=True)
+    worker = commands.add_parser("worker", help="run job workers until interrupted")
+    worker.add_argument("--workers", type=int, default=JOB_WORKERS)
+    submit = commands.add_parser("submit", help="queue a briefing from a preferences JSON file")
+    submit.add_argument("preferences")
+    status = commands.add_parser("status", help="show a job, or the latest jobs")
+    status.add_argument("job_id", nargs="?")
+    args = parser.parse_args()
+
+    store = JobStore()
+    if args.command == "worker":
+        pool = WorkerPool(workers=args.workers).start()
+        try:
+            # The pool restarts workers that die, so run until interrupted
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            pool.stop()
+    elif args.command == "submit":
+        with open(args.preferences) as f:
+            print(store.submit(json.load(f)))
+    elif args.job_id:
+        print(json.dumps(store.get(args.job_id), indent=2, default=str))
+    else:
+        for job in store.list():
+            print(f"{job['id']}  {job['status']:<8} {job['progress']:5.0f}%  {job['message'] or ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import sys
+import threading
+from pathlib import Path
+
+from .utils.logger import get_logger
+
+log = get_logger(__name__)
+
+_applied = False
+_lock = threading.Lock()
+
+
+def apply_moviepy_patches():
+    """
+    Prepare MoviePy for rendering: ImageMagick policy, PIL.Image.ANTIALIAS
+    and the ImageClip.resize patch. Importing MoviePy and PIL is slow, so this
+    runs on the first render instead of when agentic_news is imported.
+    """
+    global _applied
+    if _applied:
+        return
+    with _lock:
+        if _applied:
+            return
+        _apply()
+        _applied = True
+
+
+def _apply():
+    # Add the docker directory to the path so we can import the patch
+    docker_path = str(Path(__file__).parent.parent / "docker")
+    if docker_path not in sys.path:
+        sys.path.append(docker_path)
+
+    # Import the MoviePy patch to fix ImageMagick issues
+    try:
+        import moviepy_patch
+        log.debug("Imported MoviePy patch from %s", docker_path)
+    except ImportError as e:
+        log.warning("MoviePy patch not found or error importing: %s", e)
+
+    # Ensure PIL.Image.ANTIALIAS is available before importing MoviePy
+    from PIL import Image
+
+    if not hasattr(Image, "ANTIALIAS"):
+        try:
+            # For newer PIL versions
+            Image.ANTIALIAS = Image.Resampling.LANCZOS
+            log.debug("Set PIL.Image.ANTIALIAS to Image.Resampling.LANCZOS")
+        except AttributeError:
+            # For very old PIL versions
+            Image.ANTIALIAS = Image.LANCZOS
+            log.debug("Set PIL.Image.ANTIALIAS to Image.LANCZOS")
+
+    from moviepy.editor import ImageClip
+
+    # Patch MoviePy's ImageClip to handle PIL.Image.ANTIALIAS deprecation
+    # This is a direct monkey patch approach that doesn't rely on accessing the original method
+    try:
+        log.debug("Applying patch for MoviePy's ImageClip.resize...")
+
+        # Store the original method if we haven't already
+        if not hasattr(ImageClip, '_original_resize'):
+            # Define a completely new resize method
+            def patched_resize(self, newsize=None, height=None, width=None, apply_to_mask=True):
+                """
+                Resizes the clip to the given dimensions. Accepts float numbers.
+
+                This is a patched version that handles PIL.Image.ANTIALIAS deprecation.
+                """
+                # Ensure PIL.Image.ANTIALIAS is available
+                if not hasattr(Image, "ANTIALIAS"):
+                    try:
+                        # For newer PIL versions
+                        Image.ANTIALIAS = Image.Resampling.LANCZOS
+                    except AttributeError:
+                        # For very old PIL versions
+                        Image.ANTIALIAS = Image.LANCZOS
+
+                # Implementation based on the original resize method
+                w, h = self.size
+
+                if newsize:
+                    # Handle case where newsize might be a tuple
+                    if isinstance(newsize, tuple):
+                        w2, h2 = newsize
+                    else:
+                        w2 = newsize[0] if isinstance(newsize, (list, tuple)) else newsize
+                        h2 = newsize[1] if isinstance(newsize, (list, tuple)) and len(newsize) > 1 else h * w2 / w
+                else:
+                    if width:
+                        w2 = width
+                        h2 = w2 * h / w
+                    elif height:
+                        h2 = height
+                        w2 = w * h2 / h
+                    else:
+                        raise ValueError("Either newsize, width, or height must be provided")
+
+                # Make sure the size is integer
+                try:
+                    w2 = int(w2)
+                    h2 = int(h2)
+                except (ValueError, TypeError) as e:
+                    log.warning("Error converting size to integer: w2=%s, h2=%s, error=%s", w2, h2, e)
+                    # Fallback to original size if conversion fails
+                    w2, h2 = w, h
+
+                # Ensure minimum size
+                w2 = max(1, w2)
+                h2 = max(1, h2)
+
+                # Actual resizing using PIL
+                try:
+                    img_resized = self.img.resize((w2, h2), Image.ANTIALIAS)
+                except Exception as e:
+                    log.warning("Error resizing image: %s", e)
+                    # Fallback to nearest neighbor if ANTIALIAS fails
+                    img_resized = self.img.resize((w2, h2))
+
+                # Create a new clip with the resized image
+                new_clip = self.copy()
+                new_clip.img = img_resized
+                new_clip.size = (w2, h2)
+
+                if apply_to_mask and self.mask:
+                    try:
+                        new_clip.mask = self.mask.resize((w2, h2))
+                    except Exception as e:
+                        log.warning("Error resizing mask: %s", e)
+                        # If mask resize fails, create a new mask of the right size
+                        new_clip.mask = None
+
+                return new_clip
+
+            # Save the original method and apply our patch
+            ImageClip._original_resize = getattr(ImageClip, 'resize', None)
+            ImageClip.resize = patched_resize
+            log.debug("Applied patch to MoviePy's ImageClip.resize method")
+        else:
+            log.debug("MoviePy's ImageClip.resize already patched")
+    except Exception as e:
+        log.error("Failed to apply patch to ImageClip.resize: %s", e)
@@ -0,0 +1,263 @@
+import time
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .deadline import deadline_scope
+from .utils.tracing import span, propagate
+from .utils.logger import get_logger
+
+log = get_logger(__name__)
+
+
+class Stage:
+    """
+    One step of the briefing pipeline.
+    func is called as func(agent, context, **inputs), where context is the
+    run's RunContext and inputs maps each stage named in requires to its
+    output. The result must be an instance of output_type; None (the tools'
+    error value) or a wrong type fails the stage, and every stage that
+    depends on it is skipped. budget is the stage's share of the run
+    deadline, relative to the other stages still to run.
+    """
+
+    def __init__(self, name, func, requires=(), output_type=object, budget=1.0):
+        self.name = name
+        self.func = func
+        self.requires = tuple(requires)
+        self.output_type = output_type
+        self.budget = budget
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, requires={self.requires})"
+
+
+def _fetch_and_summarize(agent, context, get_preferences):
+    summaries = agent.fetch_and_summarize(get_preferences, context=context)
+    if summaries or not get_preferences.get("broaden_search"):
+        return summaries or None
+    # Nothing recent enough: widen the date window twice before giving up
+    broader = get_preferences
+    try:
+        since = datetime.strptime(get_preferences["date"], "%Y-%m-%d")
+    except (KeyError, ValueError):
+        since = None
+    if since:
+        days = max((datetime.now() - since).days, 1)
+        for factor in (2, 4):
+            log.info("No articles found; broadening the search to %s days", days * factor)
+            broader = dict(broader, date=(datetime.now() - timedelta(days=days * factor)).strftime("%Y-%m-%d"))
+            summaries = agent.fetch_and_summarize(broader, context=context)
+            if summaries:
+                return summaries
+    # Then a more general query: e.g. a niche custom topic alongside a broad category
+    general = [c for c in get_preferences.get("fallback_categories") or () if c not in broader.get("categories", ())]
+    if general:
+        log.info("No articles found; adding the more general %s", ', '.join(general))
+        broader = dict(broader, categories=general + list(broader.get("categories", ())))
+        return agent.fetch_and_summarize(broader, context=context) or None
+    return None
+
+
+def _text_to_speech(agent, context, get_preferences, generate_news_script):
+    return agent.text_to_speech(
+        generate_news_script,
+        get_preferences["voice_id"],
+        chunked=True,
+        with_timestamps=True,
+        context=context
+    )
+
+
+def _generate_video(agent, context, generate_news_script, text_to_speech):
+    video_path = agent.generate_video(generate_news_script, text_to_speech, context=context)
+    if video_path:
+        agent.upload_in_background(video_path, context=context)
+        agent.upload_in_background(context.state.get("thumbnail"), context=context)
+    return video_path
+
+
+# The same tools NewsAgent.run exposes to the LLM, wired as a fixed graph
+NEWS_STAGES = [
+    Stage("get_preferences", lambda agent, context: agent.get_preferences(), output_type=dict, budget=0),
+    Stage("fetch_and_summarize", _fetch_and_summarize, requires=["get_preferences"], output_type=list,
+          budget=0.3),
+    Stage("generate_news_script",
+          lambda agent, context, get_preferences, fetch_and_summarize:
+              agent.generate_news_script(fetch_and_summarize, get_preferences, context=context),
+          requires=["get_preferences", "fetch_and_summarize"], output_type=str, budget=0.15),
+    Stage("text_to_speech", _text_to_speech,
+          requires=["get_preferences", "generate_news_script"], output_type=str, budget=0.2),
+    # upload_audio and generate_video only need the audio, so they run side by side
+    Stage("upload_audio", lambda agent, context, text_to_speech: agent.upload_audio(text_to_speech, context=context),
+          requires=["text_to_speech"], output_type=str, budget=0.05),
+    Stage("generate_video", _generate_video,
+          requires=["generate_news_script", "text_to_speech"], output_type=str, budget=0.3),
+]
+
+# What each tool's inputs come from; lets the agentic loop run independent calls together
+TOOL_DEPENDENCIES = {stage.name: stage.requires for stage in NEWS_STAGES}
+
+
+def schedule_waves(tool_calls, dependencies=TOOL_DEPENDENCIES):
+    """
+    Group planner tool calls into waves that can each run concurrently.
+    A call waits for any earlier call in the same batch to a tool it depends
+    on; dependencies outside the batch were satisfied by earlier turns.
+    """
+    waves = []
+    wave_of = {}  # tool name -> index of the last wave that runs it
+    for call in tool_calls:
+        name = call.get("name")
+        deps = [d for d in dependencies.get(name, ()) if d in wave_of]
+        # Repeated calls to the same tool keep their order
+        if name in wave_of:
+            deps.append(name)
+        index = max((wave_of[d] + 1 for d in deps), default=0)
+        while len(waves) <= index:
+            waves.append([])
+        waves[index].append(call)
+        wave_of[name] = max(index, wave_of.get(name, -1))
+    return waves
+
+
+class Pipeline:
+    """
+    Runs stages as a dependency graph without an LLM in the loop.
+    Stages whose inputs are ready run concurrently; outputs are stored in
+    the run's context.state under the stage name, exactly as NewsAgent.run
+    does, and per-stage status and timings go to context.state['pipeline'].
+    A Pipeline holds no per-run data, so one instance can run many contexts.
+    """
+
+    def __init__(self, stages=NEWS_STAGES, max_workers=4):
+        self.stages = {stage.name: stage for stage in stages}
+        self.max_workers = max_workers
+        self._check_graph()
+
+    def _check_graph(self):
+        for stage in self.stages.values():
+            for dep in stage.requires:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage {stage.name} requires unknown stage {dep}")
+        self.order()  # raises on cycles
+
+    def order(self):
+        """Stage names in a valid execution order."""
+        ordered, visiting, done = [], set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline has a cycle through {name}")
+            visiting.add(name)
+            for dep in self.stages[name].requires:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+            ordered.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return ordered
+
+    def ordered_stages(self):
+        return {name: self.stages[name] for name in self.order()}
+
+    def stage_deadline(self, context, stage, pending):
+        """
+        The run deadline's share for stage: the time left, split by budget
+        between stage and the stages still pending. Stages that run side by
+        side each get their own share, so fast ones leave time for the rest.
+        """
+        if context.deadline is None:
+            return None
+        total = stage.budget + sum(self.stages[name].budget for name in pending)
+        if not total or not stage.budget:
+            return context.deadline
+        return context.deadline.budget(context.deadline.remaining() * stage.budget / total)
+
+    def _run_stage(self, agent, context, stage, outputs, deadline=None):
+        inputs = {dep: outputs[dep] for dep in stage.requires}
+        start = time.perf_counter()
+        with span(f"stage.{stage.name}"), deadline_scope(deadline or context.deadline):
+            result = stage.func(agent, context, **inputs)
+        return result, time.perf_counter() - start
+
+    def run(self, agent, context, initial=None, checkpoint=None, on_stage=None):
+        """
+        Execute every stage. initial maps stage names to precomputed outputs
+        (e.g. {"get_preferences": {...}}); those stages are not run.
+        With a RunCheckpoint, every stage that succeeds is checkpointed.
+        on_stage(name, status) is called as stages start ("running") and end
+        ("done", "failed" or "skipped"), e.g. to report job progress.
+        With context.deadline set, each stage runs under its budget's share
+        of the time left (see stage_deadline).
+        Returns {stage name: output} for the stages that succeeded.
+        """
+        def notify(name, status):
+            if on_stage:
+                try:
+                    on_stage(name, status)
+                except Exception as e:
+                    log.warning("Pipeline: progress callback failed: %s", e)
+
+        outputs = dict(initial or {})
+        report = {name: {"status": "provided", "seconds": 0.0} for name in outputs}
+        context.state.update(outputs)
+        pending = [name for name in self.order() if name not in outputs]
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pipeline") as pool:
+            while pending or running:
+                for name in list(pending):
+                    stage = self.stages[name]
+                    if any(report.get(dep, {}).get("status") in ("failed", "skipped") for dep in stage.requires):
+                        pending.remove(name)
+                        report[name] = {"status": "skipped", "seconds": 0.0}
+                        log.warning("Pipeline: skipping %s, an input stage did not succeed", name)
+                        notify(name, "skipped")
+                    elif all(dep in outputs for dep in stage.requires):
+                        pending.remove(name)
+                        deadline = self.stage_deadline(context, stage, pending)
+                        budget = f" ({deadline.remaining():.0f}s budget)" if deadline and deadline.expires_at else ""
+                        log.info("Pipeline: running %s%s", name, budget)
+                        notify(name, "running")
+                        running[pool.submit(propagate(self._run_stage), agent, context, stage, outputs,
+                                            deadline)] = stage
+
+                if not running:
+                    if pending:
+                        raise RuntimeError(f"Pipeline stalled with stages pending: {pending}")
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage = running.pop(future)
+                    try:
+                        result, seconds = future.result()
+                    except Exception as e:
+                        log.error("Pipeline: %s raised %s", stage.name, e)
+                        report[stage.name] = {"status": "failed", "seconds": 0.0, "error": str(e)}
+                        notify(stage.name, "failed")
+                        continue
+
+                    context.state[stage.name] = result
+                    if result is None or not isinstance(result, stage.output_type):
+                        log.error("Pipeline: %s returned %s, expected %s",
+                                  stage.name, type(result).__name__, stage.output_type.__name__)
+                        report[stage.name] = {"status": "failed", "seconds": seconds}
+                        notify(stage.name, "failed")
+                        continue
+                    outputs[stage.name] = result
+                    report[stage.name] = {"status": "done", "seconds": seconds}
+                    log.info("Pipeline: %s finished in %.1fs", stage.name, seconds)
+                    if checkpoint:
+                        try:
+                            checkpoint.save_stage(stage.name, result, context.state, seconds)
+                        except Exception as e:
+                            log.warning("Could not checkpoint %s: %s", stage.name, e)
+                    notify(stage.name, "done")
+
+        context.state["pipeline"] = report
+        return outputs
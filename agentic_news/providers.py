@@ -1,9 +1,12 @@
 import os
+import re
 import json
-from openai import OpenAI
-import litellm
-from litellm import completion
-from .config import MISTRAL_API_KEY
+from .config import LLM_TIMEOUT_SECONDS
+from .deadline import call_timeout
+from .utils.tracing import span
+from .utils.logger import get_logger
+
+log = get_logger(__name__)
 
 def Message(content, role="assistant"):
     return {"role": role, "content": content}
@@ -12,30 +15,170 @@ def parse_json(s):
     try:
         return json.loads(s)
     except json.JSONDecodeError:
-        print(f"Error decoding JSON for tool call arguments: {s}")
+        log.warning("Error decoding JSON for tool call arguments: %s", s)
         return None
 
+class JSONObjectScanner:
+    """
+    Finds complete top-level JSON objects in text that arrives piece by piece.
+    The scanner jumps between braces and quotes with a regex, ignores braces
+    inside strings and stray closing braces in prose, and only decodes a span
+    once its outermost brace closes. Text before a pending object is dropped,
+    so memory stays bounded by the object being read.
+    """
+
+    _STRUCTURE = re.compile(r'[{}"]')
+    _STRING = re.compile(r'["\\]')
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+
+    def feed(self, text):
+        """Add text; returns the objects completed by it, in order."""
+        buffer = self.buffer + text
+        pos, found = self.pos, []
+        while True:
+            if self.in_string:
+                match = self._STRING.search(buffer, pos)
+                if not match:
+                    pos = len(buffer)
+                    break
+                if match.group() == "\\":
+                    if match.end() >= len(buffer):
+                        pos = match.start()  # the escaped character has not arrived yet
+                        break
+                    pos = match.end() + 1
+                    continue
+                self.in_string = False
+                pos = match.end()
+                continue
+
+            match = self._STRUCTURE.search(buffer, pos)
+            if not match:
+                pos = len(buffer)
+                break
+            char, pos = match.group(), match.end()
+            if char == '"':
+                self.in_string = self.depth > 0  # quotes in prose are not JSON strings
+            elif char == "{":
+                if self.depth == 0:
+                    # Nothing before an object is needed any more
+                    buffer, pos = buffer[match.start():], 1
+                self.depth += 1
+            elif self.depth:
+                self.depth -= 1
+                if self.depth == 0:
+                    try:
+                        found.append(json.loads(buffer[:pos]))
+                    except json.JSONDecodeError:
+                        pass
+                    buffer, pos = buffer[pos:], 0
+
+        if self.depth == 0:
+            buffer, pos = "", 0
+        self.buffer, self.pos = buffer, pos
+        return found
+
+
 def extract_json_objects(s):
     """Extract all balanced JSON objects from a string."""
-    objects = []
-    brace_level = 0
-    start_index = None
-    for i, char in enumerate(s):
-        if char == "{":
-            if brace_level == 0:
-                start_index = i
-            brace_level += 1
-        elif char == "}":
-            brace_level -= 1
-            if brace_level == 0 and start_index is not None:
-                candidate = s[start_index : i + 1]
-                try:
-                    obj = json.loads(candidate)
-                    objects.append(obj)
-                except json.JSONDecodeError:
-                    pass
-                start_index = None
-    return objects
+    return JSONObjectScanner().feed(s)
+
+
+def tool_call_from_object(obj):
+    """(name, parameters) for a JSON object that describes a tool call in plain text, else None."""
+    if not isinstance(obj, dict):
+        return None
+    parameters = obj.get("parameters", obj.get("arguments"))
+    if obj.get("name") and parameters is not None:
+        return obj["name"], parameters
+    return None
+
+
+class ToolCallStream:
+    """
+    Assembles tool calls from a streamed completion as they complete, so a
+    caller can start running one while the model is still generating the
+    next. Native tool calls are complete once their arguments form a whole
+    JSON object, or once the next call starts. JSON tool calls written in
+    the content only count if the stream carries no native calls (as in
+    OpenAIBaseProvider.call), which is known once it ends, so finish()
+    returns those. feed() each chunk and then finish(); both return the
+    calls they completed.
+    """
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.content = []
+        self.tool_calls = []
+        self._native = {}  # delta index -> {"name", "arguments", "scanner", "done"}
+        self._text = JSONObjectScanner()
+        self._text_calls = []
+
+    def _complete(self, name, parameters):
+        call = self.provider.create_tool_call(name, parameters)
+        self.tool_calls.append(call)
+        return call
+
+    def feed(self, chunk):
+        completed = []
+        choices = getattr(chunk, "choices", None)
+        delta = getattr(choices[0], "delta", None) if choices else None
+        if delta is None:
+            return completed
+
+        for fragment in getattr(delta, "tool_calls", None) or []:
+            index = getattr(fragment, "index", None)
+            index = len(self._native) if index is None else index
+            if index not in self._native:
+                # Calls stream one after another: a new one means the earlier ones are whole
+                for earlier in sorted(self._native):
+                    completed.extend(self._close(self._native[earlier]))
+                self._native[index] = {"name": "", "arguments": [], "scanner": JSONObjectScanner(), "done": False}
+            entry = self._native[index]
+            function = getattr(fragment, "function", None)
+            if function is None or entry["done"]:
+                continue
+            entry["name"] += getattr(function, "name", None) or ""
+            arguments = getattr(function, "arguments", None) or ""
+            entry["arguments"].append(arguments)
+            objects = entry["scanner"].feed(arguments)
+            if objects and entry["name"]:
+                entry["done"] = True
+                completed.append(self._complete(entry["name"], objects[0]))
+
+        if getattr(delta, "content", None):
+            self.content.append(delta.content)
+            if not self._native:
+                self._text_calls.extend(filter(None, map(tool_call_from_object, self._text.feed(delta.content))))
+        return completed
+
+    def _close(self, entry):
+        """Complete a native call from whatever arguments it has (none means no parameters)."""
+        if entry["done"] or not entry["name"]:
+            return []
+        entry["done"] = True
+        parameters = parse_json("".join(entry["arguments"]) or "{}")
+        return [] if parameters is None else [self._complete(entry["name"], parameters)]
+
+    def finish(self):
+        """Calls still open when the stream ended, or the content's calls if there were no native ones."""
+        if not self._native:
+            return [self._complete(*call) for call in self._text_calls]
+        completed = []
+        for index in sorted(self._native):
+            completed.extend(self._close(self._native[index]))
+        return completed
+
+    @property
+    def text(self):
+        """The streamed content; None when it only carried tool calls."""
+        if self._text_calls and not self._native:
+            return None
+        return "".join(self.content) or None
 
 class LLMProvider:
     base_url = None
@@ -44,7 +187,7 @@ class LLMProvider:
 
     def __init__(self, model):
         self.model = self.aliases.get(model, model)
-        print(f"Using {self.__class__.__name__} with {self.model}")
+        log.info("Using %s with %s", self.__class__.__name__, self.model)
         self.client = self.create_client()
 
     def create_function_schema(self, definitions):
@@ -78,8 +221,22 @@ class LLMProvider:
             raise Exception("Error calling model: {}".format(completion.error))
         return completion
 
+    def supports_tools(self):
+        """Whether the model takes native tool definitions."""
+        return True
+
+    def response_format(self, schema=None, name="response"):
+        """
+        The response_format for a JSON answer (a structured-output schema if
+        given, else plain JSON mode), or None if the backend has neither.
+        """
+        if schema:
+            return {"type": "json_schema", "json_schema": {"name": name, "schema": schema}}
+        return {"type": "json_object"}
+
 class OpenAIBaseProvider(LLMProvider):
     def create_client(self):
+        from openai import OpenAI
         return OpenAI(base_url=self.base_url, api_key=self.api_key).chat.completions
 
     def create_function_def(self, name, details, properties, required):
@@ -96,29 +253,34 @@ class OpenAIBaseProvider(LLMProvider):
             },
         }
 
-    def call(self, messages, functions=None):
+    def call(self, messages, functions=None, on_tool_call=None):
+        """
+        Returns the reply text, or (text, tool_calls) when functions are given.
+        With on_tool_call the completion is streamed and on_tool_call(tool_call)
+        runs as soon as each call is complete, before the model has finished.
+        """
+        if functions and not self.supports_tools():
+            return self._json_tool_call(messages, functions, on_tool_call)
         tools = self.create_function_schema(functions) if functions else None
-        completion = self.completion(messages, tools=tools)
+        if functions and on_tool_call:
+            return self._stream_call(messages, tools, on_tool_call)
+        with span("llm.call", model=self.model, messages=len(messages), tools=len(tools or [])):
+            completion = self.completion(messages, tools=tools, timeout=call_timeout(LLM_TIMEOUT_SECONDS))
         message = completion.choices[0].message
 
         if functions:
             tool_calls = message.tool_calls or []
-            combined_tool_calls = [
-                self.create_tool_call(
-                    tool_call.function.name, parse_json(tool_call.function.arguments)
-                )
-                for tool_call in tool_calls
-                if parse_json(tool_call.function.arguments) is not None
-            ]
+            combined_tool_calls = []
+            for tool_call in tool_calls:
+                parameters = parse_json(tool_call.function.arguments)
+                if parameters is not None:
+                    combined_tool_calls.append(self.create_tool_call(tool_call.function.name, parameters))
 
             if message.content and not tool_calls:
-                json_objs = extract_json_objects(message.content)
-                for obj in json_objs:
-                    parameters = obj.get("parameters", obj.get("arguments"))
-                    if obj.get("name") and parameters is not None:
-                        combined_tool_calls.append(
-                            self.create_tool_call(obj.get("name"), parameters)
-                        )
+                for obj in extract_json_objects(message.content):
+                    call = tool_call_from_object(obj)
+                    if call:
+                        combined_tool_calls.append(self.create_tool_call(*call))
                 if combined_tool_calls:
                     return None, combined_tool_calls
 
@@ -126,11 +288,82 @@ class OpenAIBaseProvider(LLMProvider):
         else:
             return message.content
 
+    def _json_tool_call(self, messages, functions, on_tool_call=None):
+        """
+        Tool calling for models without native tools: the tools are described
+        in the prompt and the reply is requested as JSON, through the backend's
+        structured-output or JSON mode where it has one. Without either, the
+        tool call objects are picked out of the reply text. on_tool_call runs
+        for each call once the whole reply has been parsed.
+        """
+        schema = {
+            "type": "object",
+            "properties": {
+                "content": {"type": "string"},
+                "tool_calls": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {"name": {"type": "string", "enum": list(functions)},
+                                       "parameters": {"type": "object"}},
+                        "required": ["name", "parameters"],
+                    },
+                },
+            },
+            "required": ["tool_calls"],
+        }
+        instruction = Message(
+            "You can call these tools:\n"
+            f"{json.dumps(self.create_function_schema(functions))}\n"
+            'Reply with a JSON object only: {"content": "<your reasoning>", '
+            '"tool_calls": [{"name": "<tool>", "parameters": {...}}]}',
+            role="system"
+        )
+        response_format = self.response_format(schema, "tool_calls")
+        with span("llm.call", model=self.model, messages=len(messages) + 1, tools=len(functions),
+                  json_mode=response_format is not None):
+            completion = self.completion([instruction, *messages], response_format=response_format,
+                                         timeout=call_timeout(LLM_TIMEOUT_SECONDS))
+        content = (completion.choices[0].message.content or "").strip()
+        try:
+            objects = [json.loads(content)]
+        except json.JSONDecodeError:
+            objects = extract_json_objects(content)
+
+        text, tool_calls = None, []
+        for obj in objects:
+            if not isinstance(obj, dict):
+                continue
+            text = text or obj.get("content")
+            calls = obj.get("tool_calls") if isinstance(obj.get("tool_calls"), list) else [obj]
+            for call in filter(None, map(tool_call_from_object, calls)):
+                tool_calls.append(self.create_tool_call(*call))
+        if not objects:
+            return content or None, []
+        if on_tool_call:
+            for tool_call in tool_calls:
+                on_tool_call(tool_call)
+        return text, tool_calls
+
+    def _stream_call(self, messages, tools, on_tool_call):
+        stream = ToolCallStream(self)
+        with span("llm.call", model=self.model, messages=len(messages), tools=len(tools), stream=True) as s:
+            chunks = self.completion(messages, tools=tools, stream=True, timeout=call_timeout(LLM_TIMEOUT_SECONDS))
+            for chunk in chunks:
+                for tool_call in stream.feed(chunk):
+                    s.add("early_tool_calls")
+                    on_tool_call(tool_call)
+            for tool_call in stream.finish():
+                on_tool_call(tool_call)
+        return stream.text, stream.tool_calls
+
 class LiteLLMBaseProvider(OpenAIBaseProvider):
     def create_client(self):
+        # Imported here: litellm takes seconds to import and is only needed once a model is called
+        import litellm
         litellm.drop_params = True
         litellm.modify_params = True
-        return completion
+        return litellm.completion
 
     def completion(self, messages, **kwargs):
         filtered_kwargs = {k: v for k, v in kwargs.items() if v is not None}
@@ -142,7 +375,33 @@ class LiteLLMBaseProvider(OpenAIBaseProvider):
         )
         return completion_response
 
-    def call(self, messages, functions=None):
+    def supports_tools(self):
+        """
+        litellm answers False, not an error, for models it does not know, so
+        its answer only counts for provider-prefixed models. A bare name such
+        as the proxy alias "mistral-large" is unknown, and gets native tools.
+        """
+        if "/" not in self.model:
+            return True
+        import litellm
+        try:
+            return litellm.supports_function_calling(model=self.model)
+        except Exception:
+            return True
+
+    def response_format(self, schema=None, name="response"):
+        """Only ask litellm for JSON or structured output if it knows the model supports it."""
+        import litellm
+        try:
+            if schema and litellm.supports_response_schema(model=self.model):
+                return super().response_format(schema, name)
+            if "response_format" in (litellm.get_supported_openai_params(model=self.model) or []):
+                return super().response_format(None, name)
+        except Exception:
+            pass  # Unknown model (e.g. a proxy alias): fall back to asking in the prompt
+        return None
+
+    def call(self, messages, functions=None, on_tool_call=None):
         if (
             "mistral" in self.model.lower()
             and messages
@@ -153,7 +412,7 @@ class LiteLLMBaseProvider(OpenAIBaseProvider):
                 messages[-1]["content"] = prefix + "\n" + messages[-1].get("content", "")
             else:
                 messages.append({"role": "user", "content": prefix})
-        return super().call(messages, functions)
+        return super().call(messages, functions, on_tool_call=on_tool_call)
 
 class LiteLLMProvider(LiteLLMBaseProvider):
     """Universal provider for all LLM models using LiteLLM"""
@@ -204,7 +463,7 @@ class LiteLLMProvider(LiteLLMBaseProvider):
                 self.model = model_info or model
             
             # Print proxy information
-            print(f"Using LiteLLMProvider with {self.model} via proxy at {self.PROXY_URL}")
+            log.info("Using LiteLLMProvider with %s via proxy at %s", self.model, self.PROXY_URL)
             
             # Set API key to None as it will be handled by the proxy
             self.api_key = None
@@ -261,7 +520,7 @@ class LiteLLMProvider(LiteLLMBaseProvider):
                 )
                 return completion_response
             except Exception as e:
-                print(f"Error with LiteLLM Proxy: {e}")
+                log.warning("Error with LiteLLM Proxy: %s", e)
                 # Fall back to direct API if proxy fails
                 if "api_base" in filtered_kwargs:
                     del filtered_kwargs["api_base"]
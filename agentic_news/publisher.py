@@ -0,0 +1,112 @@
+import os
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .config import PUBLISH_MAX_WORKERS, SIGNED_URL_TTL_SECONDS
+from .storage import create_storage_backend
+from .utils.tracing import span, propagate
+from .utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# Objects are grouped by kind under these prefixes
+PREFIXES = {
+    ".mp3": "audio", ".m4a": "audio", ".opus": "audio", ".ogg": "audio",
+    ".mp4": "video",
+    ".png": "thumbnails", ".jpg": "thumbnails", ".jpeg": "thumbnails",
+}
+
+
+def file_sha256(path, block_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ArtifactPublisher:
+    """
+    Uploads briefing artifacts (audio, video, thumbnails) to the configured
+    storage backend (GCS, or a local directory for offline runs). Object names
+    are content hashes, so bytes that already exist are never re-uploaded, and
+    share URLs are cached until shortly before they expire.
+    """
+
+    def __init__(self, backend=None, max_workers=PUBLISH_MAX_WORKERS):
+        self.backend = backend or create_storage_backend()
+        self.max_workers = max_workers
+        self._urls = {}
+        self._lock = threading.Lock()
+        self._background = None
+
+    @staticmethod
+    def object_name(path):
+        ext = os.path.splitext(path)[1].lower()
+        prefix = PREFIXES.get(ext, "artifacts")
+        return f"{prefix}/{file_sha256(path)[:32]}{ext}"
+
+    def gcs_url(self, path):
+        """The storage URI path will have once published (names are content hashes)."""
+        return self.backend.uri(self.object_name(path))
+
+    def share_url(self, name):
+        """Fetchable URL for an object, cached until 5 minutes before expiry. None if unavailable."""
+        now = time.time()
+        with self._lock:
+            cached = self._urls.get(name)
+            if cached and cached[1] - 300 > now:
+                return cached[0]
+        url = self.backend.url(name, expires_in=SIGNED_URL_TTL_SECONDS)
+        if url:
+            with self._lock:
+                self._urls[name] = (url, now + SIGNED_URL_TTL_SECONDS)
+        return url
+
+    def publish_file(self, path):
+        """Upload one file unless identical bytes are already stored. Returns a result dict."""
+        with span("storage.publish", backend=self.backend.name, bytes=os.path.getsize(path)) as s:
+            name = self.object_name(path)
+            uri = self.backend.uri(name)
+            if self.backend.exists(name):
+                mode = "skipped"
+                log.info("%s already published as %s, skipping upload", path, name)
+            else:
+                log.info("Uploading %s to %s...", path, uri)
+                mode = self.backend.upload_file(path, name)
+            s.set("object", name)
+            s.set("upload", mode)
+        return {
+            "path": path,
+            "object": name,
+            "gcs_url": uri,
+            "url": self.share_url(name),
+            "upload": mode,
+            "backend": self.backend.name,
+        }
+
+    def submit(self, path):
+        """Start publishing path in the background and return a Future of its result."""
+        if self._background is None:
+            with self._lock:
+                if self._background is None:
+                    self._background = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="publisher"
+                    )
+        return self._background.submit(propagate(self.publish_file), path)
+
+    def publish(self, paths):
+        """Publish several files concurrently. Returns {path: result or None on failure}."""
+        paths = [p for p in paths if p and os.path.exists(p)]
+
+        def publish_one(path):
+            try:
+                return self.publish_file(path)
+            except Exception as e:
+                log.error("Failed to publish %s: %s", path, e)
+                return None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(paths)))) as pool:
+            return dict(zip(paths, pool.map(propagate(publish_one), paths)))
@@ -0,0 +1,182 @@
+import os
+import shutil
+import threading
+from datetime import timedelta
+from urllib.parse import quote
+
+from .config import (
+    STORAGE_BACKEND,
+    GCS_BUCKET_NAME,
+    LOCAL_STORAGE_DIR,
+    LOCAL_STORAGE_BASE_URL,
+    PARALLEL_UPLOAD_THRESHOLD,
+    PUBLISH_MAX_WORKERS,
+)
+from .utils.logger import get_logger
+
+log = get_logger(__name__)
+
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+class StorageBackend:
+    """
+    Where published artifacts live. Implementations provide existence checks,
+    file uploads, streaming writes, range reads and URL generation.
+    """
+    name = None
+
+    def exists(self, name):
+        raise NotImplementedError
+
+    def upload_file(self, path, name):
+        """Store a local file under name. Returns how it was uploaded."""
+        raise NotImplementedError
+
+    def write_stream(self, name, chunks, content_type=None):
+        """Store an iterable of byte chunks under name without buffering it all in memory."""
+        raise NotImplementedError
+
+    def read_range(self, name, start=0, end=None):
+        """Bytes [start, end) of an object (end=None reads to the end)."""
+        raise NotImplementedError
+
+    def uri(self, name):
+        """Canonical location of the object (gs://... or file://...)."""
+        raise NotImplementedError
+
+    def url(self, name, expires_in=3600):
+        """A URL clients can fetch, or None if one cannot be generated."""
+        raise NotImplementedError
+
+
+class GCSStorageBackend(StorageBackend):
+    """Google Cloud Storage, with one lazily created client shared by all calls."""
+    name = "gcs"
+
+    def __init__(self, bucket_name=GCS_BUCKET_NAME, max_workers=PUBLISH_MAX_WORKERS):
+        self.bucket_name = bucket_name
+        self.max_workers = max_workers
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def bucket(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    from google.cloud import storage
+                    self._client = storage.Client()
+        return self._client.bucket(self.bucket_name)
+
+    def exists(self, name):
+        return self.bucket.blob(name).exists()
+
+    def upload_file(self, path, name):
+        blob = self.bucket.blob(name)
+        if os.path.getsize(path) >= PARALLEL_UPLOAD_THRESHOLD:
+            try:
+                from google.cloud.storage import transfer_manager
+                transfer_manager.upload_chunks_concurrently(
+                    path, blob, chunk_size=UPLOAD_CHUNK_SIZE, max_workers=self.max_workers
+                )
+                return "parallel"
+            except Exception as e:
+                log.warning("Parallel upload failed for %s (%s), using resumable upload", path, e)
+            blob.chunk_size = UPLOAD_CHUNK_SIZE  # setting a chunk size makes the upload resumable
+            blob.upload_from_filename(path)
+            return "resumable"
+        blob.upload_from_filename(path)
+        return "simple"
+
+    def write_stream(self, name, chunks, content_type=None):
+        blob = self.bucket.blob(name)
+        blob.chunk_size = UPLOAD_CHUNK_SIZE
+        with blob.open("wb", content_type=content_type) as f:
+            for chunk in chunks:
+                f.write(chunk)
+
+    def read_range(self, name, start=0, end=None):
+        # download_as_bytes takes an inclusive end
+        return self.bucket.blob(name).download_as_bytes(start=start, end=None if end is None else end - 1)
+
+    def uri(self, name):
+        return f"gs://{self.bucket_name}/{name}"
+
+    def url(self, name, expires_in=3600):
+        try:
+            return self.bucket.blob(name).generate_signed_url(
+                version="v4",
+                expiration=timedelta(seconds=expires_in),
+                method="GET",
+            )
+        except Exception as e:
+            log.warning("Could not sign URL for %s: %s", name, e)
+            return None
+
+
+class LocalStorageBackend(StorageBackend):
+    """
+    A directory on local disk standing in for a bucket. Lets tests, load tests
+    and benchmarks run the full pipeline offline with real disk I/O.
+    """
+    name = "local"
+
+    def __init__(self, root=LOCAL_STORAGE_DIR, base_url=LOCAL_STORAGE_BASE_URL):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip("/") if base_url else None
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, name):
+        path = os.path.abspath(os.path.join(self.root, name))
+        if not path.startswith(self.root + os.sep):
+            raise ValueError(f"Object name escapes storage root: {name}")
+        return path
+
+    def exists(self, name):
+        return os.path.exists(self._path(name))
+
+    def upload_file(self, path, name):
+        self.write_stream(name, _read_chunks(path))
+        return "copy"
+
+    def write_stream(self, name, chunks, content_type=None):
+        target = self._path(name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp_path = f"{target}.{threading.get_ident()}.part"
+        with open(tmp_path, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(tmp_path, target)
+
+    def read_range(self, name, start=0, end=None):
+        with open(self._path(name), "rb") as f:
+            f.seek(start)
+            return f.read() if end is None else f.read(max(end - start, 0))
+
+    def uri(self, name):
+        return f"file://{self._path(name)}"
+
+    def url(self, name, expires_in=3600):
+        if self.base_url:
+            return f"{self.base_url}/{quote(name)}"
+        return self.uri(name)
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+        os.makedirs(self.root, exist_ok=True)
+
+
+def _read_chunks(path, chunk_size=UPLOAD_CHUNK_SIZE):
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            yield chunk
+
+
+def create_storage_backend(backend=STORAGE_BACKEND):
+    """Build the configured backend: 'gcs' (default) or 'local'."""
+    if backend == "local":
+        return LocalStorageBackend()
+    if backend == "gcs":
+        return GCSStorageBackend()
+    raise ValueError(f"Unknown storage backend: {backend}")
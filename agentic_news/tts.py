@@ -0,0 +1,65 @@
+import re
+
+from .audio import concat
+
+# Defaults shared by generate_speech and the TTS cache key
+DEFAULT_VOICE_SETTINGS = {
+    "stability": 0.71,
+    "similarity_boost": 0.85,
+    "style": 0.35,
+    "use_speaker_boost": True,
+}
+DEFAULT_OUTPUT_FORMAT = "mp3_44100_128"
+
+# Phrases every briefing opens and closes with; pre-rendered once per voice
+FIXED_PHRASES = {
+    "intro": "Here are your news highlights.",
+    "outro": "That's your update.",
+}
+
+
+def format_bitrate(output_format):
+    """Bits per second of an ElevenLabs output format such as 'mp3_44100_128'."""
+    return int(output_format.rsplit("_", 1)[-1]) * 1000
+
+
+def split_sentences(text):
+    """Split a script into individual sentences."""
+    sentences = re.split(r'(?<=[.!?])\s+', " ".join(text.split()))
+    return [s for s in sentences if s]
+
+
+def split_script(text, max_chars=800):
+    """
+    Split a script into chunks at paragraph, then sentence boundaries.
+    Each chunk stays under max_chars unless a single sentence is longer.
+    """
+    chunks = []
+    for paragraph in re.split(r'\n\s*\n', text.strip()):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            chunks.append(paragraph)
+            continue
+
+        current = ""
+        for sentence in re.split(r'(?<=[.!?])\s+', paragraph):
+            if current and len(current) + 1 + len(sentence) > max_chars:
+                chunks.append(current)
+                current = sentence
+            else:
+                current = f"{current} {sentence}" if current else sentence
+        if current:
+            chunks.append(current)
+    return chunks
+
+
+def stitch_audio(clips, crossfade_ms=30, gap_ms=150, silence_thresh=-50.0, return_layout=False):
+    """
+    Join synthesized chunks (PCMAudio) into one track.
+    Each chunk's edge silence is trimmed and replaced by a uniform gap,
+    and chunks are joined with a short crossfade to hide the seams.
+    """
+    return concat(clips, crossfade_ms=crossfade_ms, gap_ms=gap_ms,
+                  silence_thresh=silence_thresh, return_layout=return_layout)
@@ -0,0 +1,135 @@
+import os
+import json
+import hashlib
+import threading
+import unicodedata
+
+from .config import TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES
+from .utils.logger import get_logger
+
+log = get_logger(__name__)
+
+
+def normalize_text(text):
+    """Canonical form of a TTS input so trivially different strings share a cache entry."""
+    text = unicodedata.normalize("NFC", text)
+    text = text.replace("’", "'").replace("‘", "'")
+    text = text.replace("“", '"').replace("”", '"')
+    return " ".join(text.split())
+
+
+class TTSCache:
+    """
+    Content-addressed disk cache of synthesized audio.
+    Entries are keyed by normalized text, voice, model, voice settings and
+    output format. When the cache grows past max_bytes the least recently
+    used entries (by file mtime, refreshed on every hit) are evicted.
+    """
+
+    def __init__(self, directory=TTS_CACHE_DIR, max_bytes=TTS_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(text, voice_id, model_id, voice_settings, output_format):
+        payload = json.dumps({
+            "text": normalize_text(text),
+            "voice_id": voice_id,
+            "model_id": model_id,
+            "voice_settings": voice_settings,
+            "output_format": output_format,
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.audio")
+
+    def _alignment_path(self, key):
+        return os.path.join(self.directory, f"{key}.alignment.json")
+
+    def contains(self, key):
+        """Whether an audio entry exists for key (without counting a hit or refreshing it)."""
+        return os.path.exists(self._path(key))
+
+    __contains__ = contains
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # mark as recently used
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key, data):
+        path = self._path(key)
+        # Unique per process and thread: job workers in several processes share the cache
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            log.warning("Could not write TTS cache entry %s: %s", key[:12], e)
+            return
+        self.evict()
+
+    def get_alignment(self, key):
+        """Character alignment stored next to an entry, or None."""
+        try:
+            with open(self._alignment_path(key)) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def put_alignment(self, key, alignment):
+        try:
+            with open(self._alignment_path(key), "w") as f:
+                json.dump(alignment, f)
+        except OSError as e:
+            log.warning("Could not write TTS cache alignment %s: %s", key[:12], e)
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits max_bytes."""
+        with self._lock:
+            entries = []
+            total = 0
+            for name in os.listdir(self.directory):
+                if not name.endswith(".audio"):
+                    continue
+                path = os.path.join(self.directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+
+            if total <= self.max_bytes:
+                return
+
+            entries.sort()
+            removed = 0
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                    removed += 1
+                except OSError:
+                    continue
+                sidecar = path[:-len(".audio")] + ".alignment.json"
+                if os.path.exists(sidecar):
+                    os.remove(sidecar)
+            log.info("Evicted %s TTS cache entries (%.1f MB remaining)", removed, total / 1e6)
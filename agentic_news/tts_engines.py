@@ -0,0 +1,199 @@
+import time
+import shutil
+import threading
+import subprocess
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from .config import (
+    TTS_ENGINE,
+    TTS_LATENCY_BUDGET,
+    TTS_ERROR_BUDGET,
+    TTS_FALLBACK_COOLDOWN,
+    TTS_CHUNK_CHARS,
+    ESPEAK_VOICE,
+    ESPEAK_WORDS_PER_MINUTE,
+)
+from .deadline import Deadline, current_deadline, deadline_scope
+from .utils.tracing import propagate
+from .utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# Audio bytes, their container format ("mp3", "wav"), the engine that produced them
+# and, when requested and supported, a character alignment (see alignment.py)
+SpeechResult = namedtuple("SpeechResult", ["audio", "format", "engine", "alignment"], defaults=(None,))
+
+
+class TTSEngine:
+    """Common interface for text-to-speech backends."""
+    name = None
+
+    def synthesize(self, text, voice_id, model_id=None, previous_text=None, next_text=None,
+                   with_timestamps=False, allow_fallback=True):
+        """
+        Return a SpeechResult for text. allow_fallback=False asks engines that
+        can degrade to another backend to raise instead, so the caller can retry.
+        """
+        raise NotImplementedError
+
+    def synthesize_fallback(self, text, voice_id, model_id=None, previous_text=None, next_text=None):
+        """Degraded synthesis for a caller that has given up on retrying; None if the engine has none."""
+        return None
+
+
+class ElevenLabsEngine(TTSEngine):
+    """ElevenLabs over HTTP, via NewsAgent.generate_speech."""
+    name = "elevenlabs"
+
+    def __init__(self, agent):
+        self.agent = agent
+
+    def synthesize(self, text, voice_id, model_id=None, previous_text=None, next_text=None,
+                   with_timestamps=False, allow_fallback=True):
+        kwargs = dict(
+            text=text,
+            voice_id=voice_id,
+            model_id=model_id or "eleven_multilingual_v2",
+            previous_text=previous_text,
+            next_text=next_text
+        )
+        if with_timestamps:
+            audio, alignment = self.agent.generate_speech_with_timestamps(**kwargs)
+            return SpeechResult(audio, "mp3", self.name, alignment)
+        return SpeechResult(self.agent.generate_speech(**kwargs), "mp3", self.name)
+
+
+class EspeakEngine(TTSEngine):
+    """
+    Local offline synthesis with espeak-ng. Lower quality, but needs no
+    network, so it works as a fallback and as a backend for benchmarks.
+    ElevenLabs voice IDs are ignored; every voice maps to ESPEAK_VOICE.
+    """
+    name = "espeak-ng"
+
+    def __init__(self, voice=ESPEAK_VOICE, words_per_minute=ESPEAK_WORDS_PER_MINUTE):
+        self.binary = self.find_binary()
+        self.voice = voice
+        self.words_per_minute = words_per_minute
+
+    @staticmethod
+    def find_binary():
+        return shutil.which("espeak-ng") or shutil.which("espeak")
+
+    @classmethod
+    def available(cls):
+        return cls.find_binary() is not None
+
+    def synthesize(self, text, voice_id, model_id=None, previous_text=None, next_text=None,
+                   with_timestamps=False, allow_fallback=True):
+        if not self.binary:
+            raise RuntimeError("espeak-ng is not installed")
+        result = subprocess.run(
+            [self.binary, "-v", self.voice, "-s", str(self.words_per_minute), "--stdout", text],
+            capture_output=True,
+            check=True,
+            timeout=60
+        )
+        return SpeechResult(result.stdout, "wav", self.name)
+
+
+class FallbackTTSEngine(TTSEngine):
+    """
+    Try the primary engine per chunk and degrade to the fallback engine when
+    the chunk exceeds its latency budget or fails. The budget is
+    latency_budget seconds per reference_chars of text, so a whole script
+    sent in one request gets proportionally longer. After error_budget
+    consecutive misses the primary is skipped for cooldown seconds so a slow
+    or rate-limited provider stops stalling every remaining chunk.
+    Callers that retry pass allow_fallback=False and only fall back (via
+    synthesize_fallback) once their retries are used up.
+    """
+    name = "fallback"
+
+    def __init__(self, primary, fallback,
+                 latency_budget=TTS_LATENCY_BUDGET,
+                 error_budget=TTS_ERROR_BUDGET,
+                 cooldown=TTS_FALLBACK_COOLDOWN,
+                 reference_chars=TTS_CHUNK_CHARS):
+        self.primary = primary
+        self.fallback = fallback
+        self.latency_budget = latency_budget
+        self.error_budget = error_budget
+        self.cooldown = cooldown
+        self.reference_chars = reference_chars
+        self.consecutive_errors = 0
+        self.tripped_until = 0.0
+        self.fallback_count = 0
+        self._lock = threading.Lock()
+        # Primary calls run here so the latency budget can be enforced per chunk
+        self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tts-primary")
+
+    def _primary_available(self):
+        with self._lock:
+            return time.monotonic() >= self.tripped_until
+
+    def _record(self, success):
+        with self._lock:
+            if success:
+                self.consecutive_errors = 0
+                return
+            self.consecutive_errors += 1
+            if self.consecutive_errors >= self.error_budget:
+                self.tripped_until = time.monotonic() + self.cooldown
+                self.consecutive_errors = 0
+                log.warning("TTS: %s exceeded its error budget, using %s for %.0fs",
+                            self.primary.name, self.fallback.name, self.cooldown)
+
+    def latency_budget_for(self, text):
+        return self.latency_budget * max(1.0, len(text) / self.reference_chars)
+
+    def _call_primary(self, budget, *args):
+        # The primary's own HTTP timeouts end at the budget, so an abandoned call does not linger
+        with deadline_scope((current_deadline() or Deadline()).budget(budget)):
+            return self.primary.synthesize(*args)
+
+    def synthesize(self, text, voice_id, model_id=None, previous_text=None, next_text=None,
+                   with_timestamps=False, allow_fallback=True):
+        if self._primary_available():
+            budget = self.latency_budget_for(text)
+            # propagate() keeps the run deadline and the caller's span for the primary call
+            future = self._pool.submit(
+                propagate(self._call_primary), budget, text, voice_id, model_id, previous_text, next_text,
+                with_timestamps
+            )
+            try:
+                result = future.result(timeout=budget)
+                self._record(True)
+                return result
+            except FutureTimeoutError:
+                self._record(False)
+                error = TimeoutError(f"{self.primary.name} exceeded its {budget:.0f}s latency budget")
+            except Exception as e:
+                self._record(False)
+                error = e
+            if not allow_fallback:
+                raise error
+            log.warning("TTS: %s failed (%s), falling back to %s", self.primary.name, error, self.fallback.name)
+
+        return self.synthesize_fallback(text, voice_id, model_id, previous_text, next_text)
+
+    def synthesize_fallback(self, text, voice_id, model_id=None, previous_text=None, next_text=None):
+        with self._lock:
+            self.fallback_count += 1
+        return self.fallback.synthesize(text, voice_id, model_id, previous_text, next_text)
+
+
+def create_tts_engine(agent, engine=TTS_ENGINE):
+    """
+    Build the configured engine:
+    'elevenlabs' - ElevenLabs only
+    'espeak'     - offline espeak-ng only
+    'auto'       - ElevenLabs with espeak-ng fallback when it is installed
+    """
+    if engine == "espeak":
+        return EspeakEngine()
+    primary = ElevenLabsEngine(agent)
+    if engine == "auto" and EspeakEngine.available():
+        return FallbackTTSEngine(primary, EspeakEngine())
+    return primary
@@ -1,7 +1,168 @@
+import os
+import sys
+import json
+import html
+import queue
+import atexit
+import logging
+import threading
+import contextvars
+import logging.handlers
+from datetime import datetime
+
+from ..config import LOG_LEVEL, LOG_LEVELS, LOG_FORMAT, LOG_FILE
+
+ROOT_LOGGER = "agentic_news"
+
+_run_id = contextvars.ContextVar("run_id", default=None)
+_listener = None
+_file_handlers = {}
+_setup_lock = threading.Lock()
+
+
+def set_run_id(run_id):
+    """Tag every record logged from this context (and propagate()d thread pools) with run_id."""
+    _run_id.set(run_id)
+
+
+class RunIdFilter(logging.Filter):
+    # Runs on the logging thread's caller, before the record is queued
+    def filter(self, record):
+        record.run_id = _run_id.get() or "-"
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "run_id": getattr(record, "run_id", "-"),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class HTMLFormatter(logging.Formatter):
+    LEVEL_COLORS = {"DEBUG": "gray", "WARNING": "orange", "ERROR": "red", "CRITICAL": "red"}
+
+    def format(self, record):
+        color = getattr(record, "color", None) or self.LEVEL_COLORS.get(record.levelname, "black")
+        time_str = datetime.fromtimestamp(record.created).strftime("%H:%M:%S.%f")[:-3]
+        message = html.escape(record.getMessage()).replace("\n", "<br>")
+        return (f'<div class="{record.levelname.lower()}" style="color:{color}">'
+                f'<span class="meta">{time_str} {record.run_id} {record.name}</span> {message}</div>')
+
+
+class HTMLFileHandler(logging.FileHandler):
+    """Appends records as HTML lines; writes a minimal page header when the file is new."""
+
+    def __init__(self, path):
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        super().__init__(path, mode="a", encoding="utf-8")
+        self.setFormatter(HTMLFormatter())
+        if is_new:
+            self.stream.write("<html><head><meta charset='utf-8'><style>"
+                              "body{font-family:monospace}.meta{color:#999}</style></head><body>\n")
+            self.flush()
+
+
+def _parse_levels(spec):
+    levels = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, level = item.partition("=")
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging():
+    """
+    Configure the agentic_news logger tree once: records are queued by a
+    QueueHandler and written by a background QueueListener, so logging never
+    blocks rendering on stdout or file I/O. LOG_LEVEL sets the default
+    level, LOG_LEVELS overrides it per module
+    ("agentic_news.agent=DEBUG,agentic_news.audio=WARNING"), LOG_FORMAT
+    picks text or json console output and LOG_FILE adds a .jsonl or .html file.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    with _setup_lock:
+        if _listener is not None:
+            return
+        root = logging.getLogger(ROOT_LOGGER)
+        root.setLevel(LOG_LEVEL.upper())
+        root.propagate = False
+        for name, level in _parse_levels(LOG_LEVELS).items():
+            logging.getLogger(name).setLevel(level)
+
+        console = logging.StreamHandler(sys.stdout)
+        console.setFormatter(JSONFormatter() if LOG_FORMAT == "json" else logging.Formatter("%(message)s"))
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.addFilter(RunIdFilter())
+        root.addHandler(queue_handler)
+
+        _listener = logging.handlers.QueueListener(log_queue, console, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+    if LOG_FILE:
+        add_file_handler(LOG_FILE)
+
+
+def add_file_handler(path, name=None):
+    """
+    Also write records to path: HTML for .html files, JSON lines otherwise.
+    With name, only records of that logger and its children go to the file.
+    """
+    setup_logging()
+    with _setup_lock:
+        if path in _file_handlers:
+            return _file_handlers[path]
+        if path.endswith(".html"):
+            handler = HTMLFileHandler(path)
+        else:
+            handler = logging.FileHandler(path, mode="a", encoding="utf-8")
+            handler.setFormatter(JSONFormatter())
+        if name:
+            handler.addFilter(logging.Filter(name))
+        _file_handlers[path] = handler
+        _listener.handlers = _listener.handlers + (handler,)
+    return handler
+
+
+def get_logger(name=ROOT_LOGGER):
+    """A logger under the agentic_news tree, e.g. get_logger(__name__)."""
+    setup_logging()
+    return logging.getLogger(name)
+
+
 class Logger:
-    def __init__(self):
-        self.log_file = None
+    """
+    Agent transcript logger (thoughts and actions). Messages go through the
+    structured logging pipeline; setting log_file writes them, and only them,
+    to that file too.
+    """
+
+    def __init__(self, name=f"{ROOT_LOGGER}.agent.transcript"):
+        self._logger = get_logger(name)
+        self._log_file = None
+
+    @property
+    def log_file(self):
+        return self._log_file
+
+    @log_file.setter
+    def log_file(self, path):
+        self._log_file = path
+        if path:
+            add_file_handler(path, self._logger.name)
 
-    def log(self, message, color=None):
-        print(message)
-        return message 
\ No newline at end of file
+    def log(self, message, color=None, level=logging.INFO):
+        self._logger.log(level, message, extra={"color": color})
+        return message
@@ -0,0 +1,267 @@
+import json
+import time
+import uuid
+import atexit
+import threading
+import contextvars
+
+from ..config import TRACE_EXPORT, TRACE_PATH, OTLP_ENDPOINT
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """
+    A timed operation. Use as a context manager; attributes describe it
+    (model, host, bytes, retries, cache hits, ...). Spans opened inside
+    another span, in the same thread or in a function wrapped with
+    propagate(), become its children and share its trace_id.
+    """
+
+    def __init__(self, tracer, name, attributes=None):
+        parent = _current_span.get()
+        self.tracer = tracer
+        self.name = name
+        self.attributes = dict(attributes or {})
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.status = "ok"
+        self.error = None
+        self.start_time = None
+        self.end_time = None
+        self._start = None
+        self._token = None
+
+    def set(self, key, value):
+        self.attributes[key] = value
+        return self
+
+    def add(self, key, amount=1):
+        """Increment a counter attribute such as bytes or retries."""
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+        return self
+
+    @property
+    def duration(self):
+        if self.end_time is None:
+            return None
+        return self.end_time - self.start_time
+
+    def __enter__(self):
+        self.start_time = time.time()
+        self._start = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end_time = self.start_time + (time.perf_counter() - self._start)
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.status = "error"
+            self.error = f"{exc_type.__name__}: {exc}"
+        self.tracer._finish(self)
+        return False
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start_time,
+            "duration": self.duration,
+            "status": self.status,
+            "error": self.error,
+            "thread": threading.current_thread().name,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Returned when tracing is off, so instrumented code pays almost nothing."""
+    trace_id = span_id = parent_id = None
+    attributes = {}
+
+    def set(self, key, value):
+        return self
+
+    def add(self, key, amount=1):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class JSONLExporter:
+    """Appends each finished span to a JSON lines file."""
+
+    def __init__(self, path=TRACE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans):
+        with self._lock, open(self.path, "a") as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+    def shutdown(self):
+        pass
+
+
+def _otlp_value(value):
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OTLPExporter:
+    """
+    Batches spans and posts them as OTLP/HTTP JSON to a collector
+    (e.g. http://localhost:4318/v1/traces), for Jaeger/Tempo waterfalls.
+    """
+
+    def __init__(self, endpoint=OTLP_ENDPOINT, service_name="sonicpress", batch_size=64):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def _encode(self, spans):
+        return {"resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": self.service_name}}
+            ]},
+            "scopeSpans": [{
+                "scope": {"name": "agentic_news"},
+                "spans": [{
+                    "traceId": span.trace_id,
+                    "spanId": span.span_id,
+                    "parentSpanId": span.parent_id or "",
+                    "name": span.name,
+                    "kind": 1,
+                    "startTimeUnixNano": str(int(span.start_time * 1e9)),
+                    "endTimeUnixNano": str(int(span.end_time * 1e9)),
+                    "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+                    "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+                } for span in spans],
+            }],
+        }]}
+
+    def export(self, spans):
+        with self._lock:
+            self._pending.extend(spans)
+            if len(self._pending) < self.batch_size:
+                return
+            batch, self._pending = self._pending, []
+        self._send(batch)
+
+    def _send(self, batch):
+        from ..http_client import get_http_client
+        try:
+            response = get_http_client().post(self.endpoint, json=self._encode(batch), timeout=(2, 5))
+            if response.status_code >= 400:
+                print(f"Trace export failed: HTTP {response.status_code}")
+        except Exception as e:
+            print(f"Trace export failed: {e}")
+
+    def shutdown(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            self._send(batch)
+
+
+class Tracer:
+    """Creates spans and hands finished ones to the exporter. Disabled when exporter is None."""
+
+    def __init__(self, exporter=None):
+        self.exporter = exporter
+        self.enabled = exporter is not None
+
+    def span(self, name, **attributes):
+        if not self.enabled:
+            return _NOOP
+        return Span(self, name, attributes)
+
+    def _finish(self, span):
+        try:
+            self.exporter.export([span])
+        except Exception as e:
+            print(f"Trace export failed: {e}")
+
+    def flush(self):
+        if self.enabled:
+            self.exporter.shutdown()
+
+
+def _create_tracer():
+    if TRACE_EXPORT == "jsonl":
+        return Tracer(JSONLExporter())
+    if TRACE_EXPORT == "otlp":
+        return Tracer(OTLPExporter())
+    return Tracer()
+
+
+tracer = _create_tracer()
+atexit.register(tracer.flush)
+
+
+def span(name, **attributes):
+    """Open a span on the process tracer: `with span("exa.search", query=q) as s: ...`"""
+    return tracer.span(name, **attributes)
+
+
+def current_span():
+    return _current_span.get() or _NOOP
+
+
+def propagate(func):
+    """Wrap func so it runs in the caller's context (keeps span parents across thread pools)."""
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(func, *args, **kwargs)
+    return run
+
+
+def print_waterfall(path=TRACE_PATH, trace_id=None, width=50):
+    """Print one trace from a JSON lines file as an indented text waterfall (latest trace by default)."""
+    with open(path) as f:
+        spans = [json.loads(line) for line in f if line.strip()]
+    if not spans:
+        print(f"No spans in {path}")
+        return
+    trace_id = trace_id or spans[-1]["trace_id"]
+    spans = sorted((s for s in spans if s["trace_id"] == trace_id), key=lambda s: s["start"])
+    t0 = min(s["start"] for s in spans)
+    total = max(s["start"] + s["duration"] for s in spans) - t0 or 1.0
+    children = {}
+    for s in spans:
+        children.setdefault(s["parent_id"], []).append(s)
+    known = {s["span_id"] for s in spans}
+
+    def show(s, depth):
+        offset = int((s["start"] - t0) / total * width)
+        length = max(1, int(s["duration"] / total * width))
+        bar = " " * offset + "#" * length
+        label = ("  " * depth + s["name"])[:40]
+        flag = " !" if s["status"] == "error" else ""
+        print(f"{label:<40} {s['duration'] * 1000:9.1f} ms |{bar:<{width}}|{flag}")
+        for child in children.get(s["span_id"], []):
+            show(child, depth + 1)
+
+    print(f"Trace {trace_id}: {total:.2f}s, {len(spans)} spans")
+    for root in [s for s in spans if s["parent_id"] not in known]:
+        show(root, 0)
@@ -0,0 +1,294 @@
+"""
+Record and replay upstream interactions (LLM completions, Exa, HTTP) for
+offline, repeatable pipeline benchmarks.
+
+A cassette is a directory with interactions.jsonl (one request/response per
+line) and blobs/ holding response bodies by sha256. In record mode calls go
+to the real services and are written to the cassette; in replay mode the
+same requests are answered from it, after a synthetic delay.
+"""
+import os
+import json
+import time
+import random
+import hashlib
+import threading
+from types import SimpleNamespace
+from contextlib import contextmanager
+
+
+class CassetteMiss(Exception):
+    """A replayed run made a request that was never recorded."""
+
+
+def request_key(kind, payload):
+    canonical = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(f"{kind}:{canonical}".encode("utf-8")).hexdigest()
+
+
+def to_plain(obj):
+    """Convert SDK response objects (Exa results, ...) to JSON-able data."""
+    if isinstance(obj, (str, int, float, bool)) or obj is None:
+        return obj
+    if isinstance(obj, (list, tuple)):
+        return [to_plain(v) for v in obj]
+    if isinstance(obj, dict):
+        return {str(k): to_plain(v) for k, v in obj.items()}
+    if hasattr(obj, "__dict__"):
+        return {k: to_plain(v) for k, v in vars(obj).items() if not k.startswith("_")}
+    return str(obj)
+
+
+def from_plain(data):
+    """Inverse of to_plain: dicts become attribute objects."""
+    if isinstance(data, dict):
+        return SimpleNamespace(**{k: from_plain(v) for k, v in data.items()})
+    if isinstance(data, list):
+        return [from_plain(v) for v in data]
+    return data
+
+
+class Latency:
+    """
+    Synthetic latency for replayed calls.
+    scale multiplies the recorded duration; fixed maps a kind ("llm", "exa",
+    "http") to a constant delay in seconds that replaces it; jitter adds
+    +/- that fraction, from a seeded RNG so runs stay comparable.
+    """
+
+    def __init__(self, scale=1.0, fixed=None, jitter=0.0, seed=0):
+        self.scale = scale
+        self.fixed = fixed or {}
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self, kind, recorded_seconds):
+        seconds = self.fixed.get(kind, recorded_seconds * self.scale)
+        if self.jitter:
+            with self._lock:
+                seconds *= 1 + self._random.uniform(-self.jitter, self.jitter)
+        return max(seconds, 0.0)
+
+    @classmethod
+    def parse(cls, spec, scale=1.0, jitter=0.0, seed=0):
+        """Build from "llm=1.5,exa=0.8,http=0.2" style overrides."""
+        fixed = {}
+        for item in filter(None, (part.strip() for part in (spec or "").split(","))):
+            kind, _, seconds = item.partition("=")
+            fixed[kind.strip()] = float(seconds)
+        return cls(scale=scale, fixed=fixed, jitter=jitter, seed=seed)
+
+
+class Cassette:
+    def __init__(self, directory, mode="replay", latency=None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.directory = directory
+        self.mode = mode
+        self.latency = latency or Latency()
+        self.blob_dir = os.path.join(directory, "blobs")
+        self.path = os.path.join(directory, "interactions.jsonl")
+        self.calls = {}  # "kind" or "http:<host>" -> count
+        self._lock = threading.Lock()
+        self._recorded = {}  # key -> [interaction, ...] in recording order
+        self._cursor = {}
+        if mode == "record":
+            os.makedirs(self.blob_dir, exist_ok=True)
+            open(self.path, "w").close()
+        else:
+            self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"No cassette at {self.path}; record one first")
+        with open(self.path) as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._recorded.setdefault(entry["key"], []).append(entry)
+
+    def count(self, label):
+        with self._lock:
+            self.calls[label] = self.calls.get(label, 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.calls)
+
+    def put_blob(self, data):
+        digest = hashlib.sha256(data).hexdigest()
+        path = os.path.join(self.blob_dir, digest)
+        if not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(data)
+        return digest
+
+    def get_blob(self, digest):
+        with open(os.path.join(self.blob_dir, digest), "rb") as f:
+            return f.read()
+
+    def record(self, kind, key, response, seconds):
+        entry = {"kind": kind, "key": key, "seconds": seconds, "response": response}
+        with self._lock, open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def replay(self, kind, key):
+        """Recorded response for key (identical requests replay in recorded order), after the synthetic delay."""
+        with self._lock:
+            entries = self._recorded.get(key)
+            if not entries:
+                raise CassetteMiss(f"No recorded {kind} interaction for request {key[:12]}")
+            index = self._cursor.get(key, 0)
+            entry = entries[min(index, len(entries) - 1)]
+            self._cursor[key] = index + 1
+        time.sleep(self.latency.delay(kind, entry["seconds"]))
+        return entry["response"]
+
+    def call(self, kind, payload, live, encode, decode):
+        """
+        Route one upstream call. live() performs it for real, encode turns the
+        live result into JSON-able data for the cassette, decode rebuilds a
+        result from that data.
+        """
+        key = request_key(kind, payload)
+        if self.mode == "replay":
+            return decode(self.replay(kind, key))
+        start = time.perf_counter()
+        result = live()
+        seconds = time.perf_counter() - start
+        data = encode(result)
+        self.record(kind, key, data, seconds)
+        return decode(data)
+
+
+# ---------------------------------------------------------------------------
+# Upstream adapters
+# ---------------------------------------------------------------------------
+
+def _encode_completion(response):
+    usage = getattr(response, "usage", None)
+    return {
+        "content": response.choices[0].message.content,
+        "usage": {
+            "prompt_tokens": getattr(usage, "prompt_tokens", None),
+            "completion_tokens": getattr(usage, "completion_tokens", None),
+        } if usage else None,
+    }
+
+
+def _decode_completion(data):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=data["content"]))],
+        usage=SimpleNamespace(**data["usage"]) if data.get("usage") else None,
+    )
+
+
+class ReplayResponse:
+    """Just enough of requests.Response for the agent's HTTP call sites."""
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def iter_content(self, chunk_size=4096):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class ExaProxy:
+    """Stands in for the Exa client, recording or replaying its calls."""
+
+    def __init__(self, cassette, client_factory):
+        self.cassette = cassette
+        self._client_factory = client_factory
+        self._client = None
+
+    def _live(self, method, *args, **kwargs):
+        if self._client is None:
+            self._client = self._client_factory()
+        return getattr(self._client, method)(*args, **kwargs)
+
+    def _call(self, method, *args, **kwargs):
+        self.cassette.count("exa")
+        return self.cassette.call(
+            "exa", {"method": method, "args": args, "kwargs": kwargs},
+            live=lambda: self._live(method, *args, **kwargs),
+            encode=to_plain, decode=from_plain,
+        )
+
+    def search_and_contents(self, *args, **kwargs):
+        return self._call("search_and_contents", *args, **kwargs)
+
+    def get_contents(self, *args, **kwargs):
+        return self._call("get_contents", *args, **kwargs)
+
+
+@contextmanager
+def install(agent, cassette):
+    """Route the agent's LLM, Exa and HTTP traffic through cassette for the duration of the block."""
+    from urllib.parse import urlparse
+    from agentic_news import agent as agent_module
+    from agentic_news.http_client import get_http_client
+
+    original_completion = agent_module.chat_completion
+    http = get_http_client()
+    original_request = http.request  # bound method of the live client
+    original_exa = agent._exa
+
+    def chat_completion(**kwargs):
+        cassette.count("llm")
+        return cassette.call(
+            "llm", {"model": kwargs.get("model"), "messages": kwargs.get("messages"),
+                    "temperature": kwargs.get("temperature")},
+            live=lambda: original_completion(**kwargs),
+            encode=_encode_completion, decode=_decode_completion,
+        )
+
+    def request(method, url, timeout=None, **kwargs):
+        cassette.count(f"http:{urlparse(url).netloc}")
+        payload = {"method": method, "url": url, "json": kwargs.get("json"), "data": kwargs.get("data")}
+
+        def live():
+            response = original_request(method, url, timeout=timeout, **kwargs)
+            return response.status_code, dict(response.headers), response.content
+
+        def encode(result):
+            status, headers, content = result
+            keep = {k: v for k, v in headers.items() if k.lower() in ("content-type", "content-length")}
+            return {"status": status, "headers": keep, "blob": cassette.put_blob(content)}
+
+        def decode(data):
+            return ReplayResponse(data["status"], data["headers"], cassette.get_blob(data["blob"]))
+
+        return cassette.call("http", payload, live, encode, decode)
+
+    agent_module.chat_completion = chat_completion
+    http.request = request
+    agent._exa = ExaProxy(cassette, lambda: original_exa or _real_exa())
+    try:
+        yield cassette
+    finally:
+        agent_module.chat_completion = original_completion
+        del http.request  # back to the class method
+        agent._exa = original_exa
+
+
+def _real_exa():
+    from exa_py import Exa
+    from agentic_news.config import EXA_API_KEY
+    return Exa(EXA_API_KEY)
@@ -0,0 +1,79 @@
+"""
+Import-time benchmark for agentic_news.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters and
+reports the median total import time plus the slowest modules. Heavy
+dependencies (MoviePy, PIL, pydub, litellm, exa_py, google-cloud-storage)
+are meant to load on first use, so the check also fails if any of them
+shows up in a plain package import.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --max-ms 400 --runs 5
+"""
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must not be imported until the feature that needs them runs
+DEFERRED_MODULES = ["moviepy", "PIL", "pydub", "litellm", "openai", "exa_py", "google.cloud.storage"]
+
+
+def measure(module):
+    """One cold import. Returns (total_us, {module: cumulative_us})."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|", 2)
+        cumulative[name.strip()] = int(cumulative_us)
+    return cumulative.get(module, 0), cumulative
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="agentic_news")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, default=None, help="fail if the median import exceeds this")
+    args = parser.parse_args()
+
+    totals = []
+    modules = {}
+    for _ in range(args.runs):
+        total, modules = measure(args.module)
+        totals.append(total)
+
+    median_ms = statistics.median(totals) / 1000
+    print(f"import {args.module}: median {median_ms:.1f} ms over {args.runs} runs "
+          f"(min {min(totals) / 1000:.1f}, max {max(totals) / 1000:.1f})")
+    print("\nSlowest modules (cumulative, last run):")
+    top_level = {name: us for name, us in modules.items() if name != args.module}
+    for name, us in sorted(top_level.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    eager = [m for m in DEFERRED_MODULES if m in modules]
+    if eager:
+        print(f"\nFAIL: deferred modules imported eagerly: {', '.join(eager)}")
+        failed = True
+    if args.max_ms is not None and median_ms > args.max_ms:
+        print(f"\nFAIL: median import time {median_ms:.1f} ms exceeds {args.max_ms:.1f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
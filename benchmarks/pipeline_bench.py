@@ -0,0 +1,256 @@
+"""
+Full-pipeline benchmark on recorded upstream traffic.
+
+Record a cassette once against the live services (needs API keys):
+
+    python benchmarks/pipeline_bench.py record
+
+Then replay it as often as needed, offline, with synthetic latency:
+
+    python benchmarks/pipeline_bench.py replay
+    python benchmarks/pipeline_bench.py replay --latency-scale 0 --repeat 3
+    python benchmarks/pipeline_bench.py replay --latency "llm=2,exa=1,http=0.3" --jitter 0.2
+    python benchmarks/pipeline_bench.py replay --save-baseline
+    python benchmarks/pipeline_bench.py replay --baseline benchmarks/baseline.json --tolerance 0.15
+
+For fetch_and_summarize, generate_news_script, text_to_speech and
+generate_video it reports wall time, CPU time, peak RSS and upstream call
+counts. Every run is written to benchmarks/results/; with a baseline the
+run is compared against it and the exit code is 1 on regressions.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import resource
+import argparse
+import tempfile
+import threading
+import statistics
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from cassette import Cassette, Latency, install  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CASSETTE = os.path.join(BENCH_DIR, "cassettes", "default")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+STAGES = ["fetch_and_summarize", "generate_news_script", "text_to_speech", "generate_video"]
+
+PREFERENCES = {
+    "categories": ["Tech and Innovation"],
+    "voice_id": "9BWtsMINqrJLrRacOk9x",
+    "date": "2025-02-20",
+}
+
+
+class RSSSampler:
+    """Samples this process's resident set size so each stage gets its own peak."""
+
+    def __init__(self, interval=0.02):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def current(self):
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * self._page_size
+        except OSError:
+            # No /proc (macOS): fall back to the lifetime peak
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.current())
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def reset(self):
+        self.peak = self.current()
+
+    def stop(self):
+        self._stop.set()
+
+
+def measure(name, func, cassette, rss, results):
+    """Run one stage and append its metrics to results."""
+    calls_before = cassette.snapshot()
+    rss.reset()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    error = None
+    try:
+        output = func()
+    except Exception as e:
+        output, error = None, f"{type(e).__name__}: {e}"
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    rss.peak = max(rss.peak, rss.current())
+
+    calls_after = cassette.snapshot()
+    calls = {k: v - calls_before.get(k, 0) for k, v in calls_after.items() if v - calls_before.get(k, 0)}
+    results[name] = {
+        "wall_seconds": round(wall, 4),
+        "cpu_seconds": round(cpu, 4),
+        "peak_rss_mb": round(rss.peak / 1e6, 1),
+        "calls": calls,
+        "error": error,
+    }
+    status = f"ERROR {error}" if error else "ok"
+    print(f"  {name:<22} wall {wall:7.2f}s  cpu {cpu:7.2f}s  rss {rss.peak / 1e6:7.1f} MB  "
+          f"calls {sum(calls.values()):3d}  {status}")
+    return output
+
+
+def run_once(cassette, work_dir):
+    from agentic_news import NewsAgent
+    from agentic_news.context import RunContext
+    from agentic_news.publisher import ArtifactPublisher
+    from agentic_news.storage import LocalStorageBackend
+    from agentic_news.tts_engines import ElevenLabsEngine
+
+    agent = NewsAgent(save_logs=False)
+    # Deterministic, offline-friendly setup: no TTS cache, no espeak fallback, local storage
+    agent.tts_cache = None
+    agent.tts_engine = ElevenLabsEngine(agent)
+    agent.publisher = ArtifactPublisher(backend=LocalStorageBackend(os.path.join(work_dir, "storage")))
+
+    context = RunContext(output_dir=work_dir)
+    rss = RSSSampler().start()
+    results = {}
+    try:
+        with install(agent, cassette):
+            summaries = measure("fetch_and_summarize",
+                                lambda: agent.fetch_and_summarize(dict(PREFERENCES), context=context),
+                                cassette, rss, results)
+            script = measure("generate_news_script",
+                             lambda: agent.generate_news_script(summaries or [], dict(PREFERENCES),
+                                                               context=context),
+                             cassette, rss, results)
+            audio_path = measure("text_to_speech",
+                                 lambda: agent.text_to_speech(script, PREFERENCES["voice_id"],
+                                                              chunked=True, use_cache=False,
+                                                              with_timestamps=True, context=context),
+                                 cassette, rss, results)
+            measure("generate_video",
+                    lambda: agent.generate_video(script, audio_path, context=context),
+                    cassette, rss, results)
+    finally:
+        rss.stop()
+    return results
+
+
+def summarize(runs):
+    """Median of each metric across repeated runs."""
+    summary = {}
+    for stage in STAGES:
+        stage_runs = [r[stage] for r in runs if stage in r]
+        if not stage_runs:
+            continue
+        summary[stage] = {
+            metric: round(statistics.median(r[metric] for r in stage_runs), 4)
+            for metric in ("wall_seconds", "cpu_seconds", "peak_rss_mb")
+        }
+        summary[stage]["calls"] = stage_runs[-1]["calls"]
+        summary[stage]["errors"] = sum(1 for r in stage_runs if r["error"])
+    return summary
+
+
+def compare(summary, baseline, tolerance):
+    """Print the change against baseline per stage and metric. Returns the regressions."""
+    regressions = []
+    print(f"\nCompared with baseline ({baseline.get('created', '?')}), tolerance {tolerance:.0%}:")
+    for stage, metrics in summary.items():
+        base = baseline.get("summary", {}).get(stage)
+        if not base:
+            print(f"  {stage:<22} (not in baseline)")
+            continue
+        parts = []
+        for metric in ("wall_seconds", "cpu_seconds", "peak_rss_mb"):
+            old, new = base.get(metric), metrics.get(metric)
+            if not old:
+                continue
+            change = (new - old) / old
+            flag = ""
+            if change > tolerance:
+                flag = " !"
+                regressions.append((stage, metric, old, new))
+            parts.append(f"{metric.split('_')[0]} {change:+.1%}{flag}")
+        if metrics.get("calls") != base.get("calls"):
+            parts.append(f"calls {base.get('calls')} -> {metrics.get('calls')}")
+        print(f"  {stage:<22} " + ", ".join(parts))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--cassette", default=DEFAULT_CASSETTE)
+    parser.add_argument("--repeat", type=int, default=1, help="replay runs to take the median of")
+    parser.add_argument("--latency-scale", type=float, default=1.0,
+                        help="multiply recorded upstream latencies (0 = no waiting)")
+    parser.add_argument("--latency", default="", help='fixed delays per kind, e.g. "llm=1.5,exa=0.8,http=0.2"')
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- fraction of random latency noise")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=None, help="baseline JSON to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help=f"write this run to {DEFAULT_BASELINE}")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown before flagging")
+    args = parser.parse_args()
+
+    if args.mode == "record" and args.repeat != 1:
+        parser.error("record runs once")
+
+    latency = Latency.parse(args.latency, scale=args.latency_scale, jitter=args.jitter, seed=args.seed)
+    runs = []
+    for i in range(args.repeat):
+        print(f"\n{args.mode.capitalize()} run {i + 1}/{args.repeat} ({args.cassette})")
+        cassette = Cassette(args.cassette, mode=args.mode, latency=latency)
+        work_dir = tempfile.mkdtemp(prefix="sonicpress-bench-")
+        try:
+            runs.append(run_once(cassette, work_dir))
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    result = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "mode": args.mode,
+        "cassette": os.path.relpath(args.cassette, ROOT),
+        "latency": {"scale": args.latency_scale, "fixed": latency.fixed, "jitter": args.jitter, "seed": args.seed},
+        "python": sys.version.split()[0],
+        "runs": runs,
+        "summary": summarize(runs),
+    }
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    result_path = os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{args.mode}.json")
+    with open(result_path, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"\nResults written to {result_path}")
+
+    if args.save_baseline:
+        with open(DEFAULT_BASELINE, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Baseline saved to {DEFAULT_BASELINE}")
+
+    baseline_path = args.baseline or (DEFAULT_BASELINE if os.path.exists(DEFAULT_BASELINE) and not args.save_baseline else None)
+    if baseline_path:
+        with open(baseline_path) as f:
+            regressions = compare(result["summary"], json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
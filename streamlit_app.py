@@ -10,13 +10,17 @@ import google_auth_oauthlib.flow
 import googleapiclient.discovery
 import googleapiclient.errors
 from googleapiclient.http import MediaFileUpload
-import requests
 
 # Load .env variables (for agent credentials)
 load_dotenv(override=True)
 
 # Import your NewsAgent (ensure agentic_news is installed or adjust as needed)
 from agentic_news.agent import NewsAgent
+from agentic_news.http_client import get_http_client
+from agentic_news.jobs import JobStore, WorkerPool
+from agentic_news.config import (
+    JOB_EMBEDDED_WORKERS, JOB_POLL_SECONDS, JOB_WAIT_TIMEOUT_SECONDS, TTS_PRERENDER_PHRASES,
+)
 
 # Add API connectivity testing functions
 def test_mistral_connectivity():
@@ -31,7 +35,7 @@ def test_mistral_connectivity():
     }
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = get_http_client().get(url, headers=headers, timeout=10)
         if response.status_code == 200:
             return True, "Connected successfully"
         else:
@@ -57,7 +61,7 @@ def test_exa_connectivity():
     }
     
     try:
-        response = requests.post(url, headers=headers, json=data, timeout=10)
+        response = get_http_client().post(url, headers=headers, json=data, timeout=10)
         if response.status_code == 200:
             return True, "Connected successfully"
         else:
@@ -407,6 +411,21 @@ def get_agent():
 
 agent = get_agent()
 
+@st.cache_resource
+def get_job_store():
+    """Briefings run as jobs in worker processes; this app only submits and polls them."""
+    return JobStore()
+
+@st.cache_resource
+def start_job_workers():
+    """Start the worker pool with the app, unless workers run as a separate service."""
+    if not JOB_EMBEDDED_WORKERS:
+        return None
+    return WorkerPool().start()
+
+job_store = get_job_store()
+start_job_workers()
+
 ################################################################################
 # GLOBALS
 ################################################################################
@@ -436,6 +455,18 @@ VOICE_OPTIONS = {
     },
 }
 
+@st.cache_resource
+def prerender_voice_phrases():
+    """Pre-render the fixed intro/outro phrases for every voice into the TTS cache once."""
+    try:
+        return agent.prerender_fixed_phrases([v["id"] for v in VOICE_OPTIONS.values()])
+    except Exception as e:
+        print(f"Failed to pre-render voice phrases: {e}")
+        return 0
+
+if TTS_PRERENDER_PHRASES:
+    prerender_voice_phrases()
+
 FUN_FACTS = [
     "MoviePy can combine images, text, and audio to produce dynamic videos.",
     "Voice technology keeps you informed even when you're on the move.",
@@ -454,6 +485,10 @@ if "audio_path" not in st.session_state:
     st.session_state.audio_path = None
 if "video_path" not in st.session_state:
     st.session_state.video_path = None
+if "share_links" not in st.session_state:
+    st.session_state.share_links = {}
+if "degradations" not in st.session_state:
+    st.session_state.degradations = []
 
 ################################################################################
 # SIDEBAR: USER PREFERENCES + CALL TO ACTION
@@ -499,6 +534,10 @@ st.sidebar.markdown("---")
 st.sidebar.subheader("Content Settings")
 num_results = st.sidebar.slider("Articles per Topic", 1, 5, 3)
 days_ago = st.sidebar.slider("News age (days)", 1, 30, 7)
+# No length limit unless asked for, as before budgeting existed
+target_duration = None
+if st.sidebar.checkbox("Limit briefing length", value=False):
+    target_duration = st.sidebar.slider("Briefing length (seconds)", 30, 300, 90, step=15)
 
 ################################################################################
 # MAIN CONTENT
@@ -528,6 +567,15 @@ st.markdown('<h1 class="nyt-heading" style="font-size: 2.2rem; margin-top: 0; ma
 if "show_video" in st.session_state and st.session_state.show_video:
     # Display success message right after masthead
     st.success("Your personalized briefing is ready!")
+    if st.session_state.degradations:
+        notes = {
+            "fewer_articles": "fewer articles",
+            "shorter_script": "a shorter script",
+            "lower_video_quality": "a lower video quality",
+            "audio_only": "no video",
+        }
+        kinds = dict.fromkeys(notes.get(d["kind"], d["kind"]) for d in st.session_state.degradations)
+        st.caption(f"To be ready in time, this briefing was made with {', '.join(kinds)}.")
     
     video_path = st.session_state.video_path
     audio_path = st.session_state.audio_path
@@ -616,6 +664,12 @@ if "show_video" in st.session_state and st.session_state.show_video:
         
         st.markdown('</div>', unsafe_allow_html=True)
 
+    # Share links for the artifacts the worker published
+    links = [f'<a href="{url}" target="_blank" class="source-link">{name}</a>'
+             for name, url in st.session_state.share_links.items() if url]
+    if links:
+        st.markdown(f'<div style="text-align: center;">Share: {" · ".join(links)}</div>', unsafe_allow_html=True)
+
 # Create placeholders for progress and results
 progress_container = st.container()
 headlines_container = st.container()  # Container for headlines and highlights
@@ -641,69 +695,65 @@ if compile_button:
                 "voice_id": VOICE_OPTIONS[voice_choice]["id"],
                 "num_results": num_results,
                 "date": (datetime.now() - timedelta(days=days_ago)).strftime("%Y-%m-%d"),
+                "target_duration": target_duration,
                 "min_image_width": 400,
                 "min_image_height": 250,
-                "use_placeholder": True
+                "use_placeholder": True,
+                "broaden_search": True,  # widen the date range if nothing recent is found
+                # ...and then pair a lone custom topic with a general category
+                "fallback_categories": (["Tech and Innovation"]
+                                        if len(categories) == 1 and categories[0] not in DEFAULT_CATEGORIES
+                                        else []),
             }
-            time.sleep(0.4)
-            progress_bar.progress(15)
-            
-            # 2) Fetch & Summarize
-            status_placeholder.info("Fetching relevant articles... (Powered by Exa)")
-            summaries = agent.fetch_and_summarize(prefs)
-            
-            # If no articles found, try with a broader date range
-            if not summaries:
-                status_placeholder.info("No articles found. Trying with a broader date range...")
-                broader_prefs = prefs.copy()
-                broader_prefs["date"] = (datetime.now() - timedelta(days=days_ago * 2)).strftime("%Y-%m-%d")
-                summaries = agent.fetch_and_summarize(broader_prefs)
-                
-                # If still no articles, try with an even broader date range
-                if not summaries:
-                    status_placeholder.info("Still no articles found. Trying with an even broader date range...")
-                    broader_prefs["date"] = (datetime.now() - timedelta(days=days_ago * 4)).strftime("%Y-%m-%d")
-                    summaries = agent.fetch_and_summarize(broader_prefs)
-                    
-                    # If still no articles, try with a more general query
-                    if not summaries and len(categories) == 1:
-                        status_placeholder.info("Still no articles found. Trying with a more general query...")
-                        more_general_prefs = broader_prefs.copy()
-                        # Add a more general category if the user provided a specific one
-                        if categories[0] not in DEFAULT_CATEGORIES:
-                            more_general_prefs["categories"] = ["Tech and Innovation"] + categories
-                            summaries = agent.fetch_and_summarize(more_general_prefs)
-                    
-                    if not summaries:
-                        status_placeholder.warning("No articles found. Try more general topics or a broader date range.")
-                        st.stop()
-            
-            st.session_state.fetched_summaries = summaries
-            time.sleep(0.4)
-            progress_bar.progress(40)
-            
-            # 3) Generate Script
-            status_placeholder.info("Composing your news script... (Powered by Mistral AI)")
-            news_script = agent.generate_news_script(summaries, {})
-            st.session_state.news_script = news_script
-            time.sleep(0.4)
-            progress_bar.progress(60)
-            
-            # 4) Convert to Speech
-            status_placeholder.info("Recording voice narration... (Powered by ElevenLabs)")
-            audio_path = agent.text_to_speech(news_script, voice_id=VOICE_OPTIONS[voice_choice]["id"])
-            st.session_state.audio_path = audio_path
-            time.sleep(0.4)
-            progress_bar.progress(80)
-            
-            # 5) Generate Video
-            status_placeholder.info("Finalizing your news video... (Powered by MoviePy)")
-            os.makedirs("output", exist_ok=True)
-            video_path = agent.generate_video(news_script, audio_path)
-            st.session_state.video_path = video_path
-            time.sleep(0.4)
-            progress_bar.progress(100)
-            
+
+            # 2) Submit the briefing job; a worker process runs the pipeline
+            job_id = job_store.submit(prefs)
+            st.session_state.job_id = job_id
+
+            # 3) Poll until it is done, showing progress and the narration as soon as it exists
+            narration_shown = False
+            give_up_at = time.time() + JOB_WAIT_TIMEOUT_SECONDS
+            while True:
+                job = job_store.get(job_id)
+                if job is None:
+                    status_placeholder.warning("Your briefing job could not be found. Please try again.")
+                    st.stop()
+                if time.time() > give_up_at:
+                    status_placeholder.warning(
+                        f"Your briefing is taking longer than expected (job {job_id}, {job['message'] or job['status']}). "
+                        "Please check back later or try again."
+                    )
+                    st.stop()
+                progress_bar.progress(max(5, min(int(job["progress"]), 100)))
+                result = job["result"] or {}
+                if job["status"] == "failed":
+                    status_placeholder.warning(job["error"])
+                    if result.get("summaries"):
+                        st.session_state.fetched_summaries = result["summaries"]
+                    st.stop()
+                if job["status"] == "done":
+                    break
+                status_placeholder.info(job["message"] or "Working on your briefing...")
+                audio_path = result.get("audio_path")
+                if audio_path and not narration_shown and os.path.exists(audio_path):
+                    # Let the user start listening while the video renders
+                    with progress_container:
+                        st.caption("Your narration is ready - listen while the video renders.")
+                        st.audio(audio_path)
+                    narration_shown = True
+                time.sleep(JOB_POLL_SECONDS)
+
+            st.session_state.fetched_summaries = result.get("summaries")
+            st.session_state.news_script = result.get("script")
+            st.session_state.audio_path = result.get("audio_path")
+            st.session_state.video_path = result.get("video_path")
+            st.session_state.degradations = result.get("degradations") or []
+            st.session_state.share_links = {
+                os.path.basename(result[path_key]): result.get(url_key)
+                for path_key, url_key in (("audio_path", "audio_url"), ("video_path", "video_url"))
+                if result.get(path_key)
+            }
+
             # Clear the progress container and show success message
             progress_container.empty()
             
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from agentic_news import agent as agent_module
+from agentic_news.agent import NewsAgent
+from agentic_news.audio import PCMAudio
+from agentic_news.tts import FIXED_PHRASES
+from agentic_news.tts_cache import TTSCache
+
+
+class OfflineEngine:
+    """A TTS engine that must not be reached: every chunk should come from the cache."""
+
+    def synthesize(self, *args, **kwargs):
+        raise AssertionError("synthesized a cached chunk")
+
+    synthesize_fallback = synthesize
+
+
+def tone(data, format="mp3", **kwargs):
+    """Stand-in decoder: one second of tone per cache entry, whatever its bytes."""
+    return PCMAudio(np.full(44100, 0.5, dtype=np.float32), 44100)
+
+
+@pytest.fixture
+def news_agent(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(agent_module.PCMAudio, "from_bytes", staticmethod(tone))
+    news_agent = NewsAgent(save_logs=False)
+    news_agent.tts_cache = TTSCache(str(tmp_path / "tts_cache"))
+    news_agent.tts_engine = OfflineEngine()
+    return news_agent
+
+
+def test_cached_phrases_without_alignment_serve_timestamped_synthesis(news_agent):
+    for phrase in FIXED_PHRASES.values():
+        news_agent.tts_cache.put(news_agent._cache_key(phrase, "voice", "eleven_multilingual_v2"), b"mp3")
+    text = " ".join(FIXED_PHRASES.values())
+
+    pcm, alignment = news_agent.generate_speech_chunked(text, "voice", with_timestamps=True)
+
+    assert news_agent.tts_cache.hits == 2
+    assert "".join(alignment["characters"]) == text
+    assert alignment["end"][-1] <= pcm.duration
+    assert alignment["start"] == sorted(alignment["start"])
+
+
+def test_prerendered_phrases_are_stored_with_their_alignment(news_agent, monkeypatch):
+    requests = []
+
+    def with_timestamps(text, voice_id, model_id):
+        requests.append(text)
+        return b"mp3", {"characters": list(text), "start": [0.0] * len(text), "end": [0.1] * len(text)}
+
+    monkeypatch.setattr(news_agent, "generate_speech_with_timestamps", with_timestamps)
+    assert news_agent.prerender_fixed_phrases(["voice"]) == len(FIXED_PHRASES)
+    assert news_agent.prerender_fixed_phrases(["voice"]) == 0  # already cached
+    assert requests == list(FIXED_PHRASES.values())
+    for phrase in FIXED_PHRASES.values():
+        key = news_agent._cache_key(phrase, "voice", "eleven_multilingual_v2")
+        assert news_agent.tts_cache.get_alignment(key)["characters"] == list(phrase)
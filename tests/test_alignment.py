@@ -0,0 +1,49 @@
+import pytest
+
+from agentic_news.alignment import merge, remap, sentence_times, uniform_alignment
+
+
+def aligned(text, start, end):
+    return {"characters": list(text), "start": start, "end": end}
+
+
+def test_merge_places_chunks_on_the_stitched_timeline():
+    chunk = aligned("ab", [0.1, 0.2], [0.2, 0.3])
+    merged = merge([chunk, chunk], offsets=[0.0, 1.0], trims=[0.1, 0.1])
+
+    assert "".join(merged["characters"]) == "ab ab"
+    assert merged["start"] == pytest.approx([0.0, 0.1, 0.2, 1.0, 1.1])
+    assert merged["end"] == pytest.approx([0.1, 0.2, 1.0, 1.1, 1.2])
+
+
+def test_merge_never_places_characters_before_their_chunk():
+    merged = merge([aligned("a", [0.0], [0.1]), aligned("b", [0.0], [0.3])], offsets=[0.0, 1.0], trims=[0.0, 0.2])
+    assert merged["start"][-1] == 1.0
+    assert merged["end"][-1] == pytest.approx(1.1)
+
+
+def test_remap_shifts_times_after_removed_intervals():
+    alignment = aligned("abcd", [0.5, 1.5, 2.5, 4.5], [0.6, 1.6, 2.6, 4.6])
+    remapped = remap(alignment, [(1.0, 2.0), (3.0, 4.0)])
+
+    # Inside a removed interval a time collapses onto where the cut was made
+    assert remapped["start"] == pytest.approx([0.5, 1.0, 1.5, 2.5])
+    assert remapped["end"] == pytest.approx([0.6, 1.0, 1.6, 2.6])
+    assert remapped["characters"] == alignment["characters"]
+
+
+def test_remap_without_removed_intervals_is_a_no_op():
+    alignment = aligned("a", [0.0], [0.1])
+    assert remap(alignment, []) is alignment
+
+
+def test_sentence_times_finds_sentences_in_order_ignoring_case_and_spacing():
+    text = "Hello   world. Bye now. Hello world."
+    alignment = uniform_alignment(text, len(text))  # one second per character
+
+    times = sentence_times(alignment, ["Hello world.", "bye NOW.", "Missing.", "Hello world."])
+
+    assert times[0] == pytest.approx((0, 14))
+    assert times[1] == pytest.approx((15, 23))
+    assert times[2] is None
+    assert times[3] == pytest.approx((24, 36))  # the second occurrence, after the cursor
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from agentic_news.audio import PCMAudio, compact_silences, concat, normalize_loudness
+
+RATE = 8000
+
+
+def tone(seconds, level=0.5):
+    return np.full(int(RATE * seconds), level, dtype=np.float32)
+
+
+def silence(seconds):
+    return np.zeros(int(RATE * seconds), dtype=np.float32)
+
+
+def pcm(*parts):
+    return PCMAudio(np.concatenate(parts), RATE)
+
+
+def test_concat_replaces_edge_silence_with_a_uniform_gap():
+    clip = pcm(silence(0.1), tone(0.5), silence(0.2))
+    joined, offsets, trims = concat([clip, clip], crossfade_ms=30, gap_ms=150, return_layout=True)
+
+    assert joined.duration == pytest.approx(0.5 + 0.12 + 0.5)
+    assert offsets == pytest.approx([0.0, 0.62])
+    assert trims == pytest.approx([0.1, 0.1])
+    # The second clip fades in from the gap instead of starting at full level
+    start = int(0.62 * RATE)
+    assert joined.samples[start, 0] == 0.0
+    assert joined.samples[start + int(0.03 * RATE), 0] == pytest.approx(0.5)
+
+
+def test_concat_of_nothing_is_empty():
+    joined, offsets, trims = concat([], return_layout=True)
+    assert joined.duration == 0 and offsets == [] and trims == []
+
+
+def test_compact_silences_shortens_long_pauses_from_the_middle():
+    compacted, removed = compact_silences(pcm(tone(0.5), silence(1.0), tone(0.5)), max_silence_ms=400)
+    assert removed == pytest.approx([(0.7, 1.3)])
+    assert compacted.duration == pytest.approx(1.4)
+    assert np.count_nonzero(compacted.samples == 0) == int(0.4 * RATE)
+
+
+def test_compact_silences_trims_edges_to_edge_silence_ms():
+    compacted, removed = compact_silences(pcm(silence(0.5), tone(0.5), silence(0.5)), edge_silence_ms=100)
+    assert removed == pytest.approx([(0.0, 0.4), (1.1, 1.5)])  # in seconds of the original audio
+    assert compacted.duration == pytest.approx(0.7)
+
+
+def test_compact_silences_leaves_short_pauses_alone():
+    audio = pcm(tone(0.5), silence(0.3), tone(0.5))
+    compacted, removed = compact_silences(audio)
+    assert compacted is audio and removed == []
+
+
+def test_normalize_loudness_brings_speech_to_the_target_level():
+    normalized, gain_db = normalize_loudness(pcm(tone(1.0, level=0.1), silence(1.0)), target_dbfs=-16.0)
+    assert gain_db == pytest.approx(4.0, abs=0.01)
+    assert normalized.samples.max() == pytest.approx(0.1 * 10 ** (4 / 20), rel=1e-3)
+
+
+def test_normalize_loudness_keeps_the_peak_under_the_ceiling():
+    normalized, gain_db = normalize_loudness(pcm(tone(1.0, level=0.5)), target_dbfs=0.0, peak_ceiling_dbfs=-1.0)
+    assert gain_db < 6.0
+    assert normalized.samples.max() == pytest.approx(10 ** (-1 / 20), rel=1e-3)
+
+
+def test_normalize_loudness_leaves_silence_alone():
+    audio = pcm(silence(1.0))
+    assert normalize_loudness(audio) == (audio, 0.0)
@@ -0,0 +1,74 @@
+from agentic_news.budget import (
+    SpeechRateModel,
+    plan_budget,
+    select_articles,
+    trim_script,
+    word_count,
+)
+
+
+def categories(**counts):
+    return [{"category": name, "articles": [f"{name}{i}" for i in range(n)]} for name, n in counts.items()]
+
+
+def titles(summaries):
+    return {category["category"]: category["articles"] for category in summaries}
+
+
+def test_select_articles_round_robins_across_categories():
+    picked = select_articles(categories(a=3, b=3, c=1), 5)
+    assert titles(picked) == {"a": ["a0", "a1"], "b": ["b0", "b1"], "c": ["c0"]}
+
+
+def test_select_articles_drops_empty_categories_and_keeps_everything_without_a_limit():
+    summaries = categories(a=2, b=0)
+    assert titles(select_articles(summaries, 10)) == {"a": ["a0", "a1"]}
+    assert select_articles(summaries, None) is summaries
+
+
+def test_plan_budget_sizes_the_script_from_target_and_pace():
+    budget = plan_budget(categories(a=3, b=3, c=1), 60, 2.5)
+    assert budget["max_words"] == 150
+    assert budget["max_articles"] == 5  # (150 - 8 fixed-phrase words) // 28 words per article
+    assert sum(len(c["articles"]) for c in budget["summaries"]) == 5
+
+
+def test_plan_budget_keeps_at_least_one_article():
+    budget = plan_budget(categories(a=2), 1, 2.5)
+    assert budget["max_articles"] == 1
+    assert titles(budget["summaries"]) == {"a": ["a0"]}
+
+
+SCRIPT = ("Here are your news highlights. Markets rose sharply today on strong earnings. "
+          "A new telescope found water on a distant planet. Local elections are next week. "
+          "That's your update.")
+
+
+def test_trim_script_drops_trailing_sentences_and_keeps_the_outro():
+    trimmed = trim_script(SCRIPT, 20)
+    assert word_count(trimmed) <= 20
+    assert trimmed.startswith("Here are your news highlights. Markets rose")
+    assert trimmed.endswith("That's your update.")
+    assert "elections" not in trimmed
+
+
+def test_trim_script_adds_the_outro_when_the_script_has_none():
+    script = "Here are your news highlights. " + "Something happened somewhere today. " * 5
+    trimmed = trim_script(script, 12)
+    assert trimmed.endswith("That's your update.")
+    assert word_count(trimmed) <= 12
+
+
+def test_trim_script_leaves_short_scripts_alone():
+    assert trim_script(SCRIPT, 500) == SCRIPT
+    assert trim_script(SCRIPT, 0) == SCRIPT
+
+
+def test_speech_rate_model_smooths_and_persists(tmp_path):
+    path = str(tmp_path / "rates.json")
+    model = SpeechRateModel(path, smoothing=0.5)
+    assert model.words_per_second("v") == 2.5
+    model.observe("v", 30, 10)
+    model.observe("v", 20, 10)
+    assert model.words_per_second("v") == 2.5  # 3.0 then halfway to 2.0
+    assert SpeechRateModel(path).rates["v"]["samples"] == 2
@@ -0,0 +1,53 @@
+import os
+
+from agentic_news.checkpoint import RunCheckpoint
+from agentic_news.pipeline import Stage
+
+STAGES = {
+    "prefs": Stage("prefs", None),
+    "audio": Stage("audio", None, requires=["prefs"]),
+    "video": Stage("video", None, requires=["audio"]),
+}
+
+
+def checkpoint_run(tmp_path, stages=("prefs", "audio", "video")):
+    audio = tmp_path / "speech.mp3"
+    audio.write_bytes(b"narration")
+    checkpoint = RunCheckpoint("run1", root=str(tmp_path / "runs"))
+    outputs = {"prefs": {"voice_id": "v"}, "audio": str(audio), "video": "video.mp4"}
+    for name in stages:
+        checkpoint.save_stage(name, outputs[name], {"budget": {"max_words": 100}, "unrelated": 1})
+    return RunCheckpoint("run1", root=str(tmp_path / "runs")), audio  # reloaded from the manifest
+
+
+def test_restore_returns_completed_stages_and_their_state(tmp_path):
+    checkpoint, audio = checkpoint_run(tmp_path)
+    outputs, state = checkpoint.restore(STAGES)
+    assert outputs == {"prefs": {"voice_id": "v"}, "audio": str(audio), "video": "video.mp4"}
+    assert state == {"budget": {"max_words": 100}}
+
+
+def test_restore_puts_back_deleted_or_modified_files(tmp_path):
+    checkpoint, audio = checkpoint_run(tmp_path)
+    audio.write_bytes(b"something else")
+    outputs, _ = checkpoint.restore(STAGES)
+    assert "video" in outputs
+    assert audio.read_bytes() == b"narration"
+
+    os.remove(audio)
+    assert "video" in checkpoint.restore(STAGES)[0]
+    assert audio.read_bytes() == b"narration"
+
+
+def test_stages_rerun_when_their_files_cannot_be_restored(tmp_path):
+    checkpoint, audio = checkpoint_run(tmp_path)
+    os.remove(audio)
+    for name in os.listdir(checkpoint.artifacts_dir):
+        os.remove(os.path.join(checkpoint.artifacts_dir, name))
+    outputs, _ = checkpoint.restore(STAGES)
+    assert list(outputs) == ["prefs"]  # audio is gone, so video reruns too
+
+
+def test_stages_after_an_unfinished_stage_rerun(tmp_path):
+    checkpoint, _ = checkpoint_run(tmp_path, stages=("prefs", "video"))
+    assert list(checkpoint.restore(STAGES)[0]) == ["prefs"]
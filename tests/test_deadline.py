@@ -0,0 +1,85 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from agentic_news import deadline as deadline_module
+from agentic_news.context import RunContext
+from agentic_news.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    call_timeout,
+    deadline_scope,
+    remaining_seconds,
+)
+from agentic_news.pipeline import Pipeline, Stage
+from agentic_news.utils.tracing import propagate
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A monotonic clock the test advances by hand."""
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(deadline_module, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def test_an_unset_deadline_never_expires(clock):
+    for deadline in (Deadline(), Deadline(0)):
+        assert deadline.remaining() == math.inf
+        assert not deadline.expired
+        assert deadline.timeout(30) == 30
+
+
+def test_remaining_time_counts_down_and_stops_at_zero(clock):
+    deadline = Deadline(10)
+    clock.value += 4
+    assert deadline.remaining() == 6
+    clock.value += 10
+    assert deadline.remaining() == 0 and deadline.expired
+
+
+def test_budget_never_outlives_its_parent(clock):
+    parent = Deadline(10)
+    assert parent.budget(5).remaining() == 5
+    assert parent.budget(60).remaining() == 10
+    assert Deadline().budget(60).remaining() == 60
+
+
+def test_timeout_caps_defaults_at_the_remaining_time(clock):
+    deadline = Deadline(10)
+    assert deadline.timeout(30) == 10
+    assert deadline.timeout(3) == 3
+    assert deadline.timeout(None) == 10
+    assert deadline.timeout((3.05, 30)) == (3.05, 10)
+    assert deadline.timeout((None, 30)) == (10, 10)
+    clock.value += 10
+    with pytest.raises(DeadlineExceeded):
+        deadline.timeout(30)
+
+
+def test_call_timeout_uses_the_scoped_deadline(clock):
+    assert call_timeout(30) == 30
+    assert remaining_seconds() == math.inf
+    with deadline_scope(Deadline(10)):
+        assert call_timeout(30) == 10
+        assert remaining_seconds() == 10
+        with deadline_scope(None):
+            assert call_timeout(30) == 30
+    assert call_timeout(30) == 30
+
+
+def test_propagate_carries_the_deadline_into_thread_pools(clock):
+    with deadline_scope(Deadline(10)), ThreadPoolExecutor(1) as pool:
+        assert pool.submit(propagate(call_timeout), 30).result() == 10
+        assert pool.submit(call_timeout, 30).result() == 30
+
+
+def test_stage_deadlines_split_the_time_left_by_budget(clock):
+    pipeline = Pipeline([Stage("a", None, budget=1), Stage("b", None, budget=3), Stage("c", None, budget=0)])
+    context = RunContext(deadline=Deadline(100))
+    assert pipeline.stage_deadline(context, pipeline.stages["a"], ["b"]).remaining() == 25
+    assert pipeline.stage_deadline(context, pipeline.stages["b"], []).remaining() == 100
+    assert pipeline.stage_deadline(context, pipeline.stages["c"], ["b"]) is context.deadline
+    assert pipeline.stage_deadline(RunContext(), pipeline.stages["a"], ["b"]) is None
@@ -0,0 +1,27 @@
+from agentic_news.handles import ResultStore, digest
+
+
+def test_resolve_swaps_handles_for_stored_objects():
+    store = ResultStore()
+    summaries = [{"title": "Tech", "articles": [{}, {}]}]
+    first, second = store.put(summaries), store.put("script")
+
+    assert (first, second) == ("@r1", "@r2")
+    assert store.resolve(first) is summaries
+    assert store.resolve([first, "plain"]) == [summaries, "plain"]
+    assert store.resolve({"a": second, "b": {"c": first}}) == {"a": "script", "b": {"c": summaries}}
+
+
+def test_resolve_leaves_unknown_handles_and_other_values_alone():
+    store = ResultStore()
+    store.put("x")
+    assert store.resolve("@r9") == "@r9"
+    assert store.resolve(3) == 3
+    assert store.resolve(None) is None
+
+
+def test_digest_summarizes_large_results():
+    assert digest(None) == "null (the step failed)"
+    assert digest("short") == "short"
+    assert digest("word " * 100, max_chars=10).startswith("text, 100 words: ")
+    assert digest([{"title": "Tech", "articles": [{}, {}]}]) == "2 summarized articles in 1 categories (Tech)"
@@ -0,0 +1,74 @@
+import os
+import socket
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from agentic_news.jobs import MAX_ATTEMPTS, JobStore
+
+HOST = socket.gethostname()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.sqlite3"))
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def test_claim_takes_the_oldest_queued_job(store):
+    newer, older = store.submit({"n": 1}), store.submit({"n": 2})
+    store.update(newer, created=2.0)
+    store.update(older, created=1.0)
+
+    job = store.claim("w1")
+    assert job["id"] == older
+    assert (job["status"], job["worker"], job["attempts"]) == ("running", "w1", 1)
+    assert job["preferences"] == {"n": 2}
+    assert store.claim("w2")["id"] == newer
+    assert store.claim("w3") is None
+
+
+def test_concurrent_claims_never_share_a_job(store):
+    submitted = {store.submit({}) for _ in range(20)}
+    claimed, lock = [], threading.Lock()
+
+    def worker(name):
+        while (job := store.claim(name)) is not None:
+            with lock:
+                claimed.append(job["id"])
+
+    threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(claimed) == sorted(submitted)
+
+
+def test_requeue_abandoned_only_touches_dead_workers_on_this_host(store):
+    dead, alive, elsewhere = (store.submit({}) for _ in range(3))
+    for job_id, worker in ((dead, f"{HOST}:{dead_pid()}"), (alive, f"{HOST}:{os.getpid()}"),
+                           (elsewhere, "other-host:1")):
+        store.update(job_id, status="running", worker=worker, attempts=1)
+
+    assert store.requeue_abandoned() == 1
+    assert store.get(dead)["status"] == "queued"
+    assert store.get(alive)["status"] == "running"
+    assert store.get(elsewhere)["status"] == "running"
+    assert store.claim("w")["id"] == dead
+
+
+def test_requeue_abandoned_fails_jobs_out_of_attempts(store):
+    job_id = store.submit({})
+    store.update(job_id, status="running", worker=f"{HOST}:{dead_pid()}", attempts=MAX_ATTEMPTS)
+
+    assert store.requeue_abandoned() == 0
+    job = store.get(job_id)
+    assert (job["status"], job["error"]) == ("failed", "Worker died")
@@ -0,0 +1,22 @@
+import logging
+
+from agentic_news.utils.logger import Logger, add_file_handler
+
+
+def record(name):
+    return logging.LogRecord(name, logging.INFO, __file__, 1, "message", None, None)
+
+
+def test_transcript_log_file_only_takes_transcript_records(tmp_path):
+    transcript = Logger()
+    transcript.log_file = str(tmp_path / "transcript.html")
+    handler = add_file_handler(transcript.log_file)  # the handler Logger registered
+
+    assert handler.filter(record("agentic_news.agent.transcript"))
+    assert not handler.filter(record("agentic_news.agent"))
+    assert not handler.filter(record("agentic_news.pipeline"))
+
+
+def test_log_file_without_a_name_takes_every_record(tmp_path):
+    handler = add_file_handler(str(tmp_path / "all.jsonl"))
+    assert handler.filter(record("agentic_news.pipeline"))
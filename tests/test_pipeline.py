@@ -0,0 +1,140 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from agentic_news.context import RunContext
+from agentic_news.pipeline import Pipeline, Stage, _fetch_and_summarize, schedule_waves
+
+
+class FetchingAgent:
+    """Finds articles only for requests that satisfy found_for."""
+
+    def __init__(self, found_for):
+        self.found_for = found_for
+        self.requests = []
+
+    def fetch_and_summarize(self, preferences, context=None):
+        self.requests.append(preferences)
+        return [{"category": "x", "articles": [{}]}] if self.found_for(preferences) else []
+
+
+def days_ago(days):
+    return (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def test_fetch_widens_the_date_range_then_adds_fallback_categories():
+    agent = FetchingAgent(lambda prefs: "Tech and Innovation" in prefs["categories"])
+    preferences = {"categories": ["Quantum dots"], "date": days_ago(3), "broaden_search": True,
+                   "fallback_categories": ["Tech and Innovation"]}
+
+    assert _fetch_and_summarize(agent, RunContext(), preferences)
+    assert [r["date"] for r in agent.requests] == [days_ago(3), days_ago(6), days_ago(12), days_ago(12)]
+    assert agent.requests[-1]["categories"] == ["Tech and Innovation", "Quantum dots"]
+    assert preferences["categories"] == ["Quantum dots"]
+
+
+def test_fetch_only_broadens_when_asked():
+    agent = FetchingAgent(lambda prefs: False)
+    assert _fetch_and_summarize(agent, RunContext(), {"categories": ["a"], "date": days_ago(3)}) is None
+    assert len(agent.requests) == 1
+
+
+def stage(name, requires=(), result="out", output_type=str):
+    def func(agent, context, **inputs):
+        agent.calls.append((name, inputs))
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return Stage(name, func, requires=requires, output_type=output_type)
+
+
+class Agent:
+    def __init__(self):
+        self.calls = []
+
+
+def run(stages, **kwargs):
+    agent, context, events = Agent(), RunContext(), []
+    outputs = Pipeline(stages).run(agent, context, on_stage=lambda *event: events.append(event), **kwargs)
+    return outputs, context.state["pipeline"], agent.calls, events
+
+
+def test_failures_skip_dependants_but_not_independent_stages():
+    outputs, report, calls, events = run([
+        stage("a"),
+        stage("b", ["a"], result=RuntimeError("boom")),
+        stage("c", ["b"]),
+        stage("d", ["c"]),
+        stage("e", ["a"]),
+    ])
+    assert {name: r["status"] for name, r in report.items()} == {
+        "a": "done", "b": "failed", "c": "skipped", "d": "skipped", "e": "done",
+    }
+    assert report["b"]["error"] == "boom"
+    assert set(outputs) == {"a", "e"}
+    assert ("c", "skipped") in events and ("d", "skipped") in events
+    assert "c" not in [name for name, _ in calls]
+
+
+def test_an_output_of_the_wrong_type_counts_as_a_failure():
+    outputs, report, _, _ = run([stage("a", result=None), stage("b", ["a"])])
+    assert report["a"]["status"] == "failed"
+    assert report["b"]["status"] == "skipped"
+    assert outputs == {}
+
+
+def test_initial_outputs_are_not_recomputed_and_feed_later_stages():
+    outputs, report, calls, _ = run([stage("a"), stage("b", ["a"])], initial={"a": "given"})
+    assert report["a"]["status"] == "provided"
+    assert calls == [("b", {"a": "given"})]
+    assert outputs == {"a": "given", "b": "out"}
+
+
+def test_independent_stages_run_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+
+    def meet(agent, context):
+        barrier.wait()  # only returns once both stages are running
+        return "met"
+
+    outputs = Pipeline([Stage("a", meet), Stage("b", meet)]).run(Agent(), RunContext())
+    assert outputs == {"a": "met", "b": "met"}
+
+
+def test_graphs_with_unknown_inputs_or_cycles_are_rejected():
+    with pytest.raises(ValueError, match="unknown"):
+        Pipeline([stage("a", ["missing"])])
+    with pytest.raises(ValueError, match="cycle"):
+        Pipeline([stage("a", ["b"]), stage("b", ["a"])])
+
+
+def call(name):
+    return {"name": name, "parameters": {}}
+
+
+def names(waves):
+    return [[c["name"] for c in wave] for wave in waves]
+
+
+def test_schedule_waves_runs_independent_calls_together():
+    calls = [call("get_preferences"), call("fetch_and_summarize"), call("generate_news_script"),
+             call("text_to_speech"), call("upload_audio"), call("generate_video")]
+    assert names(schedule_waves(calls)) == [
+        ["get_preferences"], ["fetch_and_summarize"], ["generate_news_script"],
+        ["text_to_speech"], ["upload_audio", "generate_video"],
+    ]
+
+
+def test_schedule_waves_ignores_dependencies_satisfied_by_earlier_turns():
+    calls = [call("upload_audio"), call("generate_video"), call("get_preferences")]
+    assert names(schedule_waves(calls)) == [["upload_audio", "generate_video", "get_preferences"]]
+
+
+def test_schedule_waves_keeps_repeated_calls_in_order():
+    calls = [call("upload_audio"), call("get_preferences"), call("upload_audio")]
+    assert names(schedule_waves(calls)) == [["upload_audio", "get_preferences"], ["upload_audio"]]
+
+
+def test_schedule_waves_of_nothing_is_empty():
+    assert schedule_waves([]) == []
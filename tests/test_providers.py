@@ -0,0 +1,201 @@
+import json
+import sys
+import types
+from types import SimpleNamespace as NS
+
+import pytest
+
+from agentic_news.providers import (
+    JSONObjectScanner,
+    LiteLLMProvider,
+    OpenAIBaseProvider,
+    ToolCallStream,
+    extract_json_objects,
+)
+
+
+class FakeProvider(OpenAIBaseProvider):
+    """OpenAIBaseProvider with canned completions instead of a client."""
+
+    def __init__(self, responses=(), tools=True):
+        self.model = "fake"
+        self.responses = list(responses)
+        self.requests = []
+        self.tools = tools
+
+    def supports_tools(self):
+        return self.tools
+
+    def completion(self, messages, **kwargs):
+        self.requests.append({"messages": messages, **kwargs})
+        return self.responses.pop(0)
+
+
+FUNCTIONS = {"get_preferences": {"description": "Get preferences", "params": {}}}
+
+
+def content_chunk(text):
+    return NS(choices=[NS(delta=NS(content=text, tool_calls=None))])
+
+
+def tool_chunk(index, name=None, arguments=None):
+    fragment = NS(index=index, function=NS(name=name, arguments=arguments))
+    return NS(choices=[NS(delta=NS(content=None, tool_calls=[fragment]))])
+
+
+def message(content=None, tool_calls=None):
+    return NS(choices=[NS(message=NS(content=content, tool_calls=tool_calls))])
+
+
+def feed_in_pieces(text, size):
+    scanner = JSONObjectScanner()
+    found = []
+    for i in range(0, len(text), size):
+        found += scanner.feed(text[i:i + size])
+    return found
+
+
+TRICKY = (
+    'Sure } I will call it: {"name": "a", "parameters": {"x": "has } and \\" and {"}} '
+    'then {"name": "b", "arguments": {"path": "C:\\\\dir\\\\", "e": "\\u00e9\\n"}} '
+    '{not json} and {"k": [1, {"nested": true}]}'
+)
+EXPECTED = [
+    {"name": "a", "parameters": {"x": 'has } and " and {'}},
+    {"name": "b", "arguments": {"path": "C:\\dir\\", "e": "é\n"}},
+    {"k": [1, {"nested": True}]},
+]
+
+
+def test_extract_json_objects_skips_prose_and_invalid_spans():
+    assert extract_json_objects(TRICKY) == EXPECTED
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 64])
+def test_scanner_results_do_not_depend_on_chunk_boundaries(size):
+    assert feed_in_pieces(TRICKY, size) == EXPECTED
+
+
+def test_scanner_split_inside_escape_sequence():
+    scanner = JSONObjectScanner()
+    assert scanner.feed('{"q": "a\\') == []
+    assert scanner.feed('"}') == []  # the escaped quote does not close the string
+    assert scanner.feed('"}') == [{"q": 'a"}'}]
+
+
+def test_scanner_keeps_only_the_pending_object():
+    scanner = JSONObjectScanner()
+    scanner.feed("x" * 1000 + '{"a": ')
+    assert scanner.buffer == '{"a": '
+    assert scanner.feed("1}") == [{"a": 1}]
+    assert scanner.buffer == ""
+
+
+def test_native_tool_calls_complete_as_their_arguments_close():
+    stream = ToolCallStream(FakeProvider())
+    assert stream.feed(tool_chunk(0, "fetch_and_summarize", '{"prefer')) == []
+    assert stream.feed(tool_chunk(0, None, 'ences": "@r1"}')) == [
+        {"type": "function", "name": "fetch_and_summarize", "parameters": {"preferences": "@r1"}}
+    ]
+    assert stream.finish() == []
+
+
+def test_native_tool_call_without_arguments_completes_when_the_next_starts():
+    stream = ToolCallStream(FakeProvider())
+    assert stream.feed(tool_chunk(0, "get_preferences", "")) == []
+    completed = stream.feed(tool_chunk(1, "upload_audio", '{"audio_file_path": "@r4"'))
+    assert [call["name"] for call in completed] == ["get_preferences"]
+    assert [call["name"] for call in stream.finish()] == []  # upload_audio's arguments never closed
+    assert [call["name"] for call in stream.tool_calls] == ["get_preferences"]
+
+
+def test_content_tool_calls_wait_for_the_end_of_the_stream():
+    stream = ToolCallStream(FakeProvider())
+    text = 'Calling {"name": "get_preferences", "parameters": {}} now'
+    assert [stream.feed(content_chunk(piece)) for piece in (text[:30], text[30:])] == [[], []]
+    assert [call["name"] for call in stream.finish()] == ["get_preferences"]
+    assert stream.text is None
+
+
+def test_content_tool_calls_are_ignored_when_native_calls_follow():
+    stream = ToolCallStream(FakeProvider())
+    stream.feed(content_chunk('{"name": "get_preferences", "parameters": {}}'))
+    stream.feed(tool_chunk(0, "fetch_and_summarize", '{"preferences": "@r1"}'))
+    stream.finish()
+    assert [call["name"] for call in stream.tool_calls] == ["fetch_and_summarize"]
+
+
+def test_streamed_call_reports_calls_through_on_tool_call():
+    provider = FakeProvider([iter([
+        tool_chunk(0, "get_preferences", "{}"),
+        tool_chunk(1, "fetch_and_summarize", '{"preferences": "@r1"}'),
+    ])])
+    seen = []
+    content, tool_calls = provider.call([], FUNCTIONS, on_tool_call=seen.append)
+    assert content is None
+    assert seen == tool_calls
+    assert [call["name"] for call in seen] == ["get_preferences", "fetch_and_summarize"]
+    assert provider.requests[0]["stream"] is True
+
+
+def test_call_parses_native_arguments_and_drops_invalid_ones():
+    tool_calls = [
+        NS(function=NS(name="get_preferences", arguments="{}")),
+        NS(function=NS(name="broken", arguments="{not json")),
+    ]
+    provider = FakeProvider([message(tool_calls=tool_calls)])
+    _, calls = provider.call([], FUNCTIONS)
+    assert calls == [{"type": "function", "name": "get_preferences", "parameters": {}}]
+
+
+def test_models_without_native_tools_get_a_json_reply_format():
+    reply = json.dumps({"content": "First the preferences",
+                        "tool_calls": [{"name": "get_preferences", "parameters": {}}]})
+    provider = FakeProvider([message(content=reply)], tools=False)
+    content, calls = provider.call([{"role": "user", "content": "go"}], FUNCTIONS)
+    assert content == "First the preferences"
+    assert calls == [{"type": "function", "name": "get_preferences", "parameters": {}}]
+    request = provider.requests[0]
+    assert "tools" not in request
+    assert request["response_format"]["type"] == "json_schema"
+
+
+def test_json_mode_reports_calls_through_on_tool_call():
+    reply = json.dumps({"tool_calls": [{"name": "get_preferences", "parameters": {}}]})
+    provider = FakeProvider([message(content=reply)], tools=False)
+    seen = []
+    _, calls = provider.call([{"role": "user", "content": "go"}], FUNCTIONS, on_tool_call=seen.append)
+    assert seen == calls and len(calls) == 1
+
+
+@pytest.fixture
+def fake_litellm(monkeypatch):
+    """A litellm module that, like the real one, answers False for models it does not know."""
+    module = types.ModuleType("litellm")
+    module.requests = []
+    module.supports_function_calling = lambda model: model == "groq/llama-3.3-70b-versatile"
+    module.supports_response_schema = lambda model: False
+    module.get_supported_openai_params = lambda model: None
+
+    def completion(**kwargs):
+        module.requests.append(kwargs)
+        return message(tool_calls=[NS(function=NS(name="get_preferences", arguments="{}"))])
+
+    module.completion = completion
+    monkeypatch.setitem(sys.modules, "litellm", module)
+    return module
+
+
+def test_default_planner_alias_gets_native_tools(fake_litellm):
+    provider = LiteLLMProvider("large")
+    assert provider.model == "mistral-large"
+    assert provider.supports_tools()
+    _, calls = provider.call([{"role": "user", "content": "go"}], FUNCTIONS)
+    assert calls == [{"type": "function", "name": "get_preferences", "parameters": {}}]
+    assert "tools" in fake_litellm.requests[0]
+    assert "response_format" not in fake_litellm.requests[0]
+
+
+def test_prefixed_models_use_litellm_capabilities(fake_litellm):
+    assert LiteLLMProvider("llama3.3").supports_tools()
+    assert not LiteLLMProvider("gemini-pro").supports_tools()
@@ -0,0 +1,55 @@
+import os
+
+from agentic_news.tts import split_script, split_sentences
+from agentic_news.tts_cache import TTSCache
+
+
+def test_split_script_keeps_short_paragraphs_whole():
+    script = "First paragraph.  It has\ntwo lines.\n\n\nSecond paragraph."
+    assert split_script(script) == ["First paragraph. It has two lines.", "Second paragraph."]
+
+
+def test_split_script_breaks_long_paragraphs_at_sentences():
+    sentence = "This sentence is exactly forty chars ok."
+    chunks = split_script(" ".join([sentence] * 5), max_chars=100)
+    assert chunks == [f"{sentence} {sentence}", f"{sentence} {sentence}", sentence]
+    assert all(len(chunk) <= 100 for chunk in chunks)
+
+
+def test_split_script_keeps_an_overlong_sentence_in_one_chunk():
+    long_sentence = "word " * 50 + "end."
+    assert split_script(f"Short one. {long_sentence}", max_chars=40) == ["Short one.", long_sentence.strip()]
+
+
+def test_split_script_ignores_blank_input():
+    assert split_script("  \n\n  ") == []
+
+
+def test_split_sentences_splits_on_sentence_ends_and_normalizes_whitespace():
+    text = "Here are your news highlights.  Rates fell!\nWill they rise? That's your update."
+    assert split_sentences(text) == [
+        "Here are your news highlights.", "Rates fell!", "Will they rise?", "That's your update.",
+    ]
+
+
+def test_split_sentences_without_sentence_ends():
+    assert split_sentences("No full stop here") == ["No full stop here"]
+    assert split_sentences("   ") == []
+
+
+def test_cache_keys_ignore_trivial_text_differences():
+    settings = {"stability": 0.5}
+    key = TTSCache.key("That’s  your\nupdate.", "voice", "model", settings, "mp3_44100_128")
+    assert key == TTSCache.key("That's your update.", "voice", "model", settings, "mp3_44100_128")
+    assert key != TTSCache.key("That's your update.", "other", "model", settings, "mp3_44100_128")
+
+
+def test_cache_evicts_least_recently_used_entries(tmp_path):
+    cache = TTSCache(str(tmp_path), max_bytes=10)
+    cache.put("old", b"12345")
+    cache.put("new", b"12345")
+    os.utime(tmp_path / "old.audio", (0, 0))
+    cache.put("newest", b"12345")
+    assert not cache.contains("old")
+    assert "new" in cache and "newest" in cache
+    assert cache.get("missing") is None and cache.misses == 1